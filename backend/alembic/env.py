@@ -0,0 +1,53 @@
+from logging.config import fileConfig
+from alembic import context
+from app.core.config import settings
+from app.core.database import Base, create_db_engine, normalize_database_url
+from app.models import models  # noqa: F401 - registers the tables on Base.metadata
+
+config = context.config
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+def _include_name(name, type_, parent_names) -> bool:
+    # The SQLite FTS5 index and its shadow tables are created with raw DDL, not on Base.metadata
+    return not (type_ == "table" and name.startswith("search_documents_fts"))
+
+def _database_url() -> str:
+    # `alembic -x db_url=...` overrides DATABASE_URL, e.g. to migrate a second database
+    return context.get_x_argument(as_dictionary=True).get("db_url") or settings.DATABASE_URL
+
+def run_migrations_offline():
+    """Emit the migration SQL without connecting"""
+    url = normalize_database_url(_database_url())
+    context.configure(
+        url=url,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        render_as_batch=url.get_backend_name() == "sqlite",
+        include_name=_include_name
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+def run_migrations_online():
+    """Run migrations against the configured database"""
+    connectable = create_db_engine(_database_url())
+    with connectable.connect() as connection:
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            # SQLite can't ALTER most things in place; batch mode copies the table instead
+            render_as_batch=connection.dialect.name == "sqlite",
+            include_name=_include_name
+        )
+        with context.begin_transaction():
+            context.run_migrations()
+    connectable.dispose()
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,73 @@
+"""Initial schema: meetings, action items and decisions
+
+Revision ID: 0001
+Revises:
+Create Date: 2024-03-20 00:00:00
+
+Databases created earlier by create_db.py already have these tables; mark
+them as migrated with `alembic stamp 0001`, then run `alembic upgrade head`.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "meetings",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("title", sa.String(), nullable=True),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("date", sa.DateTime(), nullable=True),
+        sa.Column("duration", sa.Integer(), nullable=True),
+        sa.Column("participants", sa.Text(), nullable=True),
+        sa.Column("status", sa.String(), nullable=True),
+        sa.Column("audio_file_path", sa.String(), nullable=True),
+        sa.Column("transcript", sa.Text(), nullable=True),
+        sa.Column("summary", sa.Text(), nullable=True),
+        sa.Column("calendar_event_id", sa.String(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index("ix_meetings_id", "meetings", ["id"])
+    op.create_index("ix_meetings_title", "meetings", ["title"])
+
+    op.create_table(
+        "action_items",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("meeting_id", sa.Integer(), sa.ForeignKey("meetings.id"), nullable=True),
+        sa.Column("title", sa.String(length=255), nullable=False),
+        sa.Column("description", sa.Text(), nullable=False),
+        sa.Column("assignee", sa.String(length=255), nullable=False),
+        sa.Column("due_date", sa.DateTime(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    )
+    op.create_index("ix_action_items_id", "action_items", ["id"])
+
+    op.create_table(
+        "decisions",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("meeting_id", sa.Integer(), sa.ForeignKey("meetings.id"), nullable=True),
+        sa.Column("title", sa.String(length=255), nullable=False),
+        sa.Column("description", sa.Text(), nullable=False),
+        sa.Column("decision_maker", sa.String(length=255), nullable=False),
+        sa.Column("rationale", sa.Text(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_decisions_id", "decisions", ["id"])
+
+
+def downgrade():
+    op.drop_index("ix_decisions_id", table_name="decisions")
+    op.drop_table("decisions")
+    op.drop_index("ix_action_items_id", table_name="action_items")
+    op.drop_table("action_items")
+    op.drop_index("ix_meetings_title", table_name="meetings")
+    op.drop_index("ix_meetings_id", table_name="meetings")
+    op.drop_table("meetings")
@@ -0,0 +1,85 @@
+"""Jobs table, audio checksum/duration/progress columns and upsert keys
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2024-04-15 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+from app.services.text_utils import normalize_title
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+# Rows given their normalized title per UPDATE
+BACKFILL_BATCH_SIZE = 500
+
+
+def _backfill_normalized_titles(table: str):
+    """Fill normalized_title on existing rows, so the upserts match them"""
+    connection = op.get_bind()
+    rows = connection.execute(sa.text(f"SELECT id, title FROM {table} WHERE normalized_title IS NULL")).fetchall()
+    update = sa.text(f"UPDATE {table} SET normalized_title = :normalized_title WHERE id = :id")
+    for start in range(0, len(rows), BACKFILL_BATCH_SIZE):
+        connection.execute(update, [
+            {"id": row_id, "normalized_title": normalize_title(title)}
+            for row_id, title in rows[start:start + BACKFILL_BATCH_SIZE]
+        ])
+
+
+def upgrade():
+    with op.batch_alter_table("meetings") as batch_op:
+        batch_op.add_column(sa.Column("audio_checksum", sa.String(length=64), nullable=True))
+        batch_op.add_column(sa.Column("audio_duration", sa.Float(), nullable=True))
+        batch_op.add_column(sa.Column("transcribed_until", sa.Float(), nullable=True))
+
+    with op.batch_alter_table("action_items") as batch_op:
+        batch_op.add_column(sa.Column("normalized_title", sa.String(length=255), nullable=True))
+        batch_op.create_index("ix_action_items_meeting_normalized_title", ["meeting_id", "normalized_title"])
+
+    with op.batch_alter_table("decisions") as batch_op:
+        batch_op.add_column(sa.Column("normalized_title", sa.String(length=255), nullable=True))
+        batch_op.create_index("ix_decisions_meeting_normalized_title", ["meeting_id", "normalized_title"])
+
+    _backfill_normalized_titles("action_items")
+    _backfill_normalized_titles("decisions")
+
+    op.create_table(
+        "jobs",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("meeting_id", sa.Integer(), sa.ForeignKey("meetings.id", ondelete="CASCADE"), nullable=True),
+        sa.Column("job_type", sa.String(length=50), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("progress", sa.Float(), nullable=False),
+        sa.Column("params", sa.Text(), nullable=True),
+        sa.Column("result", sa.Text(), nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("started_at", sa.DateTime(), nullable=True),
+        sa.Column("finished_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_jobs_id", "jobs", ["id"])
+    op.create_index("ix_jobs_meeting_id", "jobs", ["meeting_id"])
+    op.create_index("ix_jobs_status", "jobs", ["status"])
+
+
+def downgrade():
+    op.drop_index("ix_jobs_status", table_name="jobs")
+    op.drop_index("ix_jobs_meeting_id", table_name="jobs")
+    op.drop_index("ix_jobs_id", table_name="jobs")
+    op.drop_table("jobs")
+
+    with op.batch_alter_table("decisions") as batch_op:
+        batch_op.drop_index("ix_decisions_meeting_normalized_title")
+        batch_op.drop_column("normalized_title")
+
+    with op.batch_alter_table("action_items") as batch_op:
+        batch_op.drop_index("ix_action_items_meeting_normalized_title")
+        batch_op.drop_column("normalized_title")
+
+    with op.batch_alter_table("meetings") as batch_op:
+        batch_op.drop_column("transcribed_until")
+        batch_op.drop_column("audio_duration")
+        batch_op.drop_column("audio_checksum")
@@ -0,0 +1,26 @@
+"""Indexes for meeting, action item and decision listings
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2024-05-02 00:00:00
+"""
+from alembic import op
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index("ix_meetings_status_id", "meetings", ["status", "id"])
+    op.create_index("ix_meetings_date", "meetings", ["date"])
+    op.create_index("ix_action_items_meeting_id_id", "action_items", ["meeting_id", "id"])
+    op.create_index("ix_decisions_meeting_id_id", "decisions", ["meeting_id", "id"])
+
+
+def downgrade():
+    op.drop_index("ix_decisions_meeting_id_id", table_name="decisions")
+    op.drop_index("ix_action_items_meeting_id_id", table_name="action_items")
+    op.drop_index("ix_meetings_date", table_name="meetings")
+    op.drop_index("ix_meetings_status_id", table_name="meetings")
@@ -0,0 +1,76 @@
+"""Move meeting participants from a JSON text column to meeting_participants
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2024-05-09 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+import json
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def _normalize(name):
+    return " ".join((name or "").lower().split())
+
+
+def upgrade():
+    participants = op.create_table(
+        "meeting_participants",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("meeting_id", sa.Integer(), sa.ForeignKey("meetings.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("name", sa.String(length=255), nullable=False),
+        sa.Column("normalized_name", sa.String(length=255), nullable=False),
+    )
+    op.create_index("ix_meeting_participants_meeting_id", "meeting_participants", ["meeting_id"])
+    op.create_index(
+        "ix_meeting_participants_normalized_name_meeting_id",
+        "meeting_participants",
+        ["normalized_name", "meeting_id"]
+    )
+
+    connection = op.get_bind()
+    rows = []
+    for meeting_id, value in connection.execute(
+        sa.text("SELECT id, participants FROM meetings WHERE participants IS NOT NULL")
+    ):
+        try:
+            names = json.loads(value)
+        except ValueError:
+            names = []
+        seen = set()
+        for name in names if isinstance(names, list) else []:
+            normalized = _normalize(str(name))
+            if normalized and normalized not in seen:
+                seen.add(normalized)
+                rows.append({"meeting_id": meeting_id, "name": str(name).strip(), "normalized_name": normalized})
+    if rows:
+        op.bulk_insert(participants, rows)
+
+    with op.batch_alter_table("meetings") as batch_op:
+        batch_op.drop_column("participants")
+
+
+def downgrade():
+    with op.batch_alter_table("meetings") as batch_op:
+        batch_op.add_column(sa.Column("participants", sa.Text(), nullable=True))
+
+    connection = op.get_bind()
+    names = {}
+    for meeting_id, name in connection.execute(
+        sa.text("SELECT meeting_id, name FROM meeting_participants ORDER BY meeting_id, id")
+    ):
+        names.setdefault(meeting_id, []).append(name)
+    for meeting_id, meeting_names in names.items():
+        connection.execute(
+            sa.text("UPDATE meetings SET participants = :participants WHERE id = :id"),
+            {"participants": json.dumps(meeting_names), "id": meeting_id}
+        )
+
+    op.drop_index("ix_meeting_participants_normalized_name_meeting_id", table_name="meeting_participants")
+    op.drop_index("ix_meeting_participants_meeting_id", table_name="meeting_participants")
+    op.drop_table("meeting_participants")
@@ -0,0 +1,81 @@
+"""Full-text search documents: FTS5 on SQLite, GIN tsvector index on Postgres
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2024-05-16 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+TSVECTOR = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(body, '')), 'B')"
+)
+
+SQLITE_DDL = [
+    "CREATE VIRTUAL TABLE search_documents_fts USING fts5("
+    "title, body, content='search_documents', content_rowid='id', "
+    "tokenize='porter unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER search_documents_ai AFTER INSERT ON search_documents BEGIN "
+    "INSERT INTO search_documents_fts(rowid, title, body) VALUES (new.id, new.title, new.body); END",
+    "CREATE TRIGGER search_documents_ad AFTER DELETE ON search_documents BEGIN "
+    "INSERT INTO search_documents_fts(search_documents_fts, rowid, title, body) VALUES ('delete', old.id, old.title, old.body); END",
+    "CREATE TRIGGER search_documents_au AFTER UPDATE ON search_documents BEGIN "
+    "INSERT INTO search_documents_fts(search_documents_fts, rowid, title, body) VALUES ('delete', old.id, old.title, old.body); "
+    "INSERT INTO search_documents_fts(rowid, title, body) VALUES (new.id, new.title, new.body); END",
+]
+
+# Existing rows, indexed through the triggers above
+BACKFILL = [
+    "INSERT INTO search_documents (kind, item_id, meeting_id, title, body) "
+    "SELECT 'transcript', id, id, title, transcript FROM meetings WHERE transcript IS NOT NULL AND transcript != ''",
+    "INSERT INTO search_documents (kind, item_id, meeting_id, title, body) "
+    "SELECT 'summary', id, id, title, summary FROM meetings WHERE summary IS NOT NULL AND summary != ''",
+    "INSERT INTO search_documents (kind, item_id, meeting_id, title, body) "
+    "SELECT 'action_item', id, meeting_id, title, coalesce(description, '') || ' ' || coalesce(assignee, '') "
+    "FROM action_items WHERE meeting_id IS NOT NULL",
+    "INSERT INTO search_documents (kind, item_id, meeting_id, title, body) "
+    "SELECT 'decision', id, meeting_id, title, "
+    "coalesce(description, '') || ' ' || coalesce(decision_maker, '') || ' ' || coalesce(rationale, '') "
+    "FROM decisions WHERE meeting_id IS NOT NULL",
+]
+
+
+def upgrade():
+    op.create_table(
+        "search_documents",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("kind", sa.String(length=20), nullable=False),
+        sa.Column("item_id", sa.Integer(), nullable=False),
+        sa.Column("meeting_id", sa.Integer(), sa.ForeignKey("meetings.id"), nullable=False),
+        sa.Column("title", sa.Text(), nullable=True),
+        sa.Column("body", sa.Text(), nullable=True),
+    )
+    op.create_index("ix_search_documents_kind_item_id", "search_documents", ["kind", "item_id"], unique=True)
+    op.create_index("ix_search_documents_meeting_id", "search_documents", ["meeting_id"])
+
+    dialect = op.get_bind().dialect.name
+    if dialect == "sqlite":
+        for statement in SQLITE_DDL:
+            op.execute(statement)
+    elif dialect == "postgresql":
+        op.execute(f"CREATE INDEX ix_search_documents_tsv ON search_documents USING gin (({TSVECTOR}))")
+
+    for statement in BACKFILL:
+        op.execute(statement)
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == "sqlite":
+        op.execute("DROP TABLE IF EXISTS search_documents_fts")
+    elif dialect == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_search_documents_tsv")
+    op.drop_index("ix_search_documents_meeting_id", table_name="search_documents")
+    op.drop_index("ix_search_documents_kind_item_id", table_name="search_documents")
+    op.drop_table("search_documents")
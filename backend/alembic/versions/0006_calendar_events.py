@@ -0,0 +1,36 @@
+"""Local copy of upcoming calendar events and incremental sync state
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2024-05-23 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "calendar_events",
+        sa.Column("id", sa.String(length=255), primary_key=True),
+        sa.Column("start_time", sa.DateTime(), nullable=False),
+        sa.Column("end_time", sa.DateTime(), nullable=False),
+        sa.Column("data", sa.Text(), nullable=False),
+    )
+    op.create_index("ix_calendar_events_start_time", "calendar_events", ["start_time"])
+    op.create_table(
+        "calendar_sync_state",
+        sa.Column("calendar_id", sa.String(length=255), primary_key=True),
+        sa.Column("sync_token", sa.Text(), nullable=True),
+        sa.Column("synced_at", sa.DateTime(), nullable=True),
+    )
+
+
+def downgrade():
+    op.drop_table("calendar_sync_state")
+    op.drop_index("ix_calendar_events_start_time", table_name="calendar_events")
+    op.drop_table("calendar_events")
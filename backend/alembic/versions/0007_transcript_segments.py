@@ -0,0 +1,23 @@
+"""Timestamped, speaker-labelled transcript segments
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2024-05-27 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("meetings") as batch_op:
+        batch_op.add_column(sa.Column("transcript_segments", sa.Text(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table("meetings") as batch_op:
+        batch_op.drop_column("transcript_segments")
@@ -0,0 +1,73 @@
+"""Move transcript segments from a JSON text column to transcript_segments
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2024-06-03 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+import json
+
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    segments = op.create_table(
+        "transcript_segments",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("meeting_id", sa.Integer(), sa.ForeignKey("meetings.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("position", sa.Integer(), nullable=False),
+        sa.Column("start_time", sa.Float(), nullable=False),
+        sa.Column("end_time", sa.Float(), nullable=False),
+        sa.Column("speaker", sa.Integer(), nullable=True),
+        sa.Column("text", sa.Text(), nullable=False),
+    )
+    op.create_index(
+        "ix_transcript_segments_meeting_id_position",
+        "transcript_segments",
+        ["meeting_id", "position"],
+        unique=True
+    )
+    op.create_index("ix_transcript_segments_meeting_id_start_time", "transcript_segments", ["meeting_id", "start_time"])
+
+    connection = op.get_bind()
+    for meeting_id, value in connection.execute(
+        sa.text("SELECT id, transcript_segments FROM meetings WHERE transcript_segments IS NOT NULL")
+    ):
+        try:
+            packed = json.loads(value)
+        except ValueError:
+            packed = []
+        rows = [
+            {"meeting_id": meeting_id, "position": position, "start_time": start, "end_time": end, "speaker": speaker, "text": text}
+            for position, (start, end, speaker, text) in enumerate(packed)
+        ]
+        if rows:
+            op.bulk_insert(segments, rows)
+
+    with op.batch_alter_table("meetings") as batch_op:
+        batch_op.drop_column("transcript_segments")
+
+
+def downgrade():
+    with op.batch_alter_table("meetings") as batch_op:
+        batch_op.add_column(sa.Column("transcript_segments", sa.Text(), nullable=True))
+
+    connection = op.get_bind()
+    packed = {}
+    for meeting_id, start, end, speaker, text in connection.execute(sa.text(
+        "SELECT meeting_id, start_time, end_time, speaker, text FROM transcript_segments ORDER BY meeting_id, position"
+    )):
+        packed.setdefault(meeting_id, []).append([start, end, speaker, text])
+    for meeting_id, rows in packed.items():
+        connection.execute(
+            sa.text("UPDATE meetings SET transcript_segments = :segments WHERE id = :id"),
+            {"segments": json.dumps(rows, separators=(",", ":")), "id": meeting_id}
+        )
+
+    op.drop_index("ix_transcript_segments_meeting_id_start_time", table_name="transcript_segments")
+    op.drop_index("ix_transcript_segments_meeting_id_position", table_name="transcript_segments")
+    op.drop_table("transcript_segments")
@@ -0,0 +1,52 @@
+"""Unique (meeting_id, normalized_title) upsert keys for action items and decisions
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2024-06-10 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+from app.services.text_utils import normalize_title
+
+revision = "0009"
+down_revision = "0008"
+branch_labels = None
+depends_on = None
+
+# Table, index and search document kind of each upsert key
+UPSERT_KEYS = [
+    ("action_items", "ix_action_items_meeting_normalized_title", "action_item"),
+    ("decisions", "ix_decisions_meeting_normalized_title", "decision"),
+]
+
+
+def _dedupe(table: str, kind: str):
+    """Keep the oldest row of every (meeting_id, normalized_title) and delete the rest"""
+    connection = op.get_bind()
+    # Rows written without a key never match an upsert, so give them one first
+    missing = connection.execute(sa.text(f"SELECT id, title FROM {table} WHERE normalized_title IS NULL")).fetchall()
+    if missing:
+        connection.execute(
+            sa.text(f"UPDATE {table} SET normalized_title = :normalized_title WHERE id = :id"),
+            [{"id": row_id, "normalized_title": normalize_title(title)} for row_id, title in missing]
+        )
+    duplicates = (
+        f"SELECT id FROM {table} WHERE EXISTS ("
+        f"SELECT 1 FROM {table} AS kept WHERE kept.meeting_id = {table}.meeting_id "
+        f"AND kept.normalized_title = {table}.normalized_title AND kept.id < {table}.id)"
+    )
+    connection.execute(sa.text(f"DELETE FROM search_documents WHERE kind = :kind AND item_id IN ({duplicates})"), {"kind": kind})
+    connection.execute(sa.text(f"DELETE FROM {table} WHERE id IN ({duplicates})"))
+
+
+def upgrade():
+    for table, index, kind in UPSERT_KEYS:
+        _dedupe(table, kind)
+        op.drop_index(index, table_name=table)
+        op.create_index(index, table, ["meeting_id", "normalized_title"], unique=True)
+
+
+def downgrade():
+    for table, index, _ in UPSERT_KEYS:
+        op.drop_index(index, table_name=table)
+        op.create_index(index, table, ["meeting_id", "normalized_title"])
@@ -0,0 +1,75 @@
+"""Speaker and time columns on search documents; diarized transcripts indexed per turn
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2024-06-17 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+from app.services.diarization import has_speakers, turn_spans
+
+revision = "0010"
+down_revision = "0009"
+branch_labels = None
+depends_on = None
+
+# SEARCH_TURN_WORDS when this migration was written
+TURN_WORDS = 160
+
+
+def upgrade():
+    # Plain ALTER TABLE ADD COLUMN: a batch copy would drop the FTS triggers on SQLite
+    op.add_column("search_documents", sa.Column("speaker", sa.Integer(), nullable=True))
+    op.add_column("search_documents", sa.Column("start_time", sa.Float(), nullable=True))
+    op.add_column("search_documents", sa.Column("end_time", sa.Float(), nullable=True))
+
+    connection = op.get_bind()
+    diarized = connection.execute(sa.text(
+        "SELECT m.id, m.title FROM meetings m WHERE EXISTS "
+        "(SELECT 1 FROM transcript_segments s WHERE s.meeting_id = m.id AND s.speaker IS NOT NULL)"
+    )).fetchall()
+    for meeting_id, title in diarized:
+        segments = [
+            {"id": row_id, "start": start, "end": end, "speaker": speaker, "text": text}
+            for row_id, start, end, speaker, text in connection.execute(sa.text(
+                "SELECT id, start_time, end_time, speaker, text FROM transcript_segments "
+                "WHERE meeting_id = :meeting_id ORDER BY position"
+            ), {"meeting_id": meeting_id})
+        ]
+        if not has_speakers(segments):
+            continue
+        connection.execute(
+            sa.text("DELETE FROM search_documents WHERE kind = 'transcript' AND item_id = :meeting_id"),
+            {"meeting_id": meeting_id}
+        )
+        connection.execute(
+            sa.text(
+                "INSERT INTO search_documents (kind, item_id, meeting_id, title, body, speaker, start_time, end_time) "
+                "VALUES ('turn', :item_id, :meeting_id, :title, :body, :speaker, :start_time, :end_time)"
+            ),
+            [
+                {
+                    "item_id": segments[first]["id"],
+                    "meeting_id": meeting_id,
+                    "title": title,
+                    "body": " ".join(segment["text"] for segment in segments[first:last]),
+                    "speaker": segments[first]["speaker"],
+                    "start_time": segments[first]["start"],
+                    "end_time": segments[last - 1]["end"]
+                }
+                for first, last in turn_spans(segments, TURN_WORDS)
+            ]
+        )
+
+
+def downgrade():
+    op.execute("DELETE FROM search_documents WHERE kind = 'turn'")
+    op.execute(
+        "INSERT INTO search_documents (kind, item_id, meeting_id, title, body) "
+        "SELECT 'transcript', id, id, title, transcript FROM meetings m "
+        "WHERE transcript IS NOT NULL AND transcript != '' AND NOT EXISTS "
+        "(SELECT 1 FROM search_documents d WHERE d.kind = 'transcript' AND d.item_id = m.id)"
+    )
+    op.drop_column("search_documents", "end_time")
+    op.drop_column("search_documents", "start_time")
+    op.drop_column("search_documents", "speaker")
@@ -1,32 +1,66 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
-from typing import List
-from app.core.database import get_db
-from app.schemas.schemas import ActionItem as ActionItemSchema, ActionItemCreate, ActionItemUpdate
+from typing import List, Optional
+from app.core.database import get_db, run_write
+from app.schemas.schemas import ActionItem as ActionItemSchema, ActionItemCreate, ActionItemUpdate, ActionItemBulkUpdate, BulkDelete
 from app.services.action_item_service import ActionItemService
+from app.services.pagination import decode_cursor, set_next_cursor
 
 router = APIRouter()
 
 @router.post("/", response_model=ActionItemSchema)
-async def create_action_item(
+def create_action_item(
     action_item: ActionItemCreate,
     db: Session = Depends(get_db)
 ):
     """Create a new action item"""
-    return ActionItemService.create_action_item(db, action_item)
+    return run_write(db, ActionItemService.create_action_item, action_item)
 
 @router.get("/", response_model=List[ActionItemSchema])
-async def get_action_items(
+def get_action_items(
+    response: Response,
     meeting_id: int = None,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
-    """Get action items, optionally filtered by meeting"""
-    return ActionItemService.get_action_items(db, meeting_id=meeting_id, skip=skip, limit=limit)
+    """
+    Get action items, optionally filtered by meeting. Full pages carry an
+    X-Next-Cursor header; pass it back as `cursor` for the next page.
+    """
+    after_id = decode_cursor(cursor) if cursor else None
+    action_items = ActionItemService.get_action_items(db, meeting_id=meeting_id, skip=skip, limit=limit, after_id=after_id)
+    set_next_cursor(response, action_items, limit)
+    return action_items
+
+@router.post("/bulk", response_model=List[ActionItemSchema])
+def bulk_create_action_items(
+    action_items: List[ActionItemCreate],
+    db: Session = Depends(get_db)
+):
+    """Create many action items in one transaction; items matching an existing title in the same meeting are updated"""
+    return run_write(db, ActionItemService.bulk_upsert_action_items, action_items)
+
+@router.put("/bulk", response_model=List[ActionItemSchema])
+def bulk_update_action_items(
+    updates: List[ActionItemBulkUpdate],
+    db: Session = Depends(get_db)
+):
+    """Update many action items in one transaction"""
+    return run_write(db, ActionItemService.bulk_update_action_items, updates)
+
+@router.delete("/bulk")
+def bulk_delete_action_items(
+    bulk_delete: BulkDelete,
+    db: Session = Depends(get_db)
+):
+    """Delete many action items by ID"""
+    deleted = run_write(db, ActionItemService.bulk_delete_action_items, bulk_delete.ids)
+    return {"message": f"Deleted {deleted} action items", "deleted": deleted}
 
 @router.get("/{action_item_id}", response_model=ActionItemSchema)
-async def get_action_item(
+def get_action_item(
     action_item_id: int,
     db: Session = Depends(get_db)
 ):
@@ -37,24 +71,24 @@ async def get_action_item(
     return action_item
 
 @router.put("/{action_item_id}", response_model=ActionItemSchema)
-async def update_action_item(
+def update_action_item(
     action_item_id: int,
     action_item_update: ActionItemUpdate,
     db: Session = Depends(get_db)
 ):
     """Update an action item"""
-    action_item = ActionItemService.update_action_item(db, action_item_id, action_item_update)
+    action_item = run_write(db, ActionItemService.update_action_item, action_item_id, action_item_update)
     if not action_item:
         raise HTTPException(status_code=404, detail="Action item not found")
     return action_item
 
 @router.delete("/{action_item_id}")
-async def delete_action_item(
+def delete_action_item(
     action_item_id: int,
     db: Session = Depends(get_db)
 ):
     """Delete an action item"""
-    success = ActionItemService.delete_action_item(db, action_item_id)
+    success = run_write(db, ActionItemService.delete_action_item, action_item_id)
     if not success:
         raise HTTPException(status_code=404, detail="Action item not found")
     return {"message": "Action item deleted successfully"} 
\ No newline at end of file
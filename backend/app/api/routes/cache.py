@@ -0,0 +1,25 @@
+from fastapi import APIRouter, HTTPException
+from typing import Optional
+from app.services.cache_service import ResultCache
+import re
+
+router = APIRouter()
+
+@router.get("/stats")
+async def get_cache_stats():
+    """Get result cache size and hit/miss counters"""
+    return ResultCache.get_stats()
+
+@router.delete("/")
+async def invalidate_cache(
+    namespace: Optional[str] = None,
+    key: Optional[str] = None
+):
+    """Invalidate one entry, a namespace (transcription, summary, action_items, decisions, extraction) or the whole cache"""
+    # Both values end up in file paths, so only accept plain names and hex keys
+    if namespace is not None and not re.fullmatch(r"[a-z_]+", namespace):
+        raise HTTPException(status_code=400, detail="Invalid cache namespace")
+    if key is not None and not re.fullmatch(r"[0-9a-f]{64}", key):
+        raise HTTPException(status_code=400, detail="Invalid cache key")
+    removed = ResultCache.invalidate(namespace=namespace, key=key)
+    return {"message": "Cache invalidated", "removed": removed}
\ No newline at end of file
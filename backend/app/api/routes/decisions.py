@@ -1,32 +1,66 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
-from typing import List
-from app.core.database import get_db
-from app.schemas.schemas import Decision as DecisionSchema, DecisionCreate, DecisionUpdate
+from typing import List, Optional
+from app.core.database import get_db, run_write
+from app.schemas.schemas import Decision as DecisionSchema, DecisionCreate, DecisionUpdate, DecisionBulkUpdate, BulkDelete
 from app.services.decision_service import DecisionService
+from app.services.pagination import decode_cursor, set_next_cursor
 
 router = APIRouter()
 
 @router.post("/", response_model=DecisionSchema)
-async def create_decision(
+def create_decision(
     decision: DecisionCreate,
     db: Session = Depends(get_db)
 ):
     """Create a new decision"""
-    return DecisionService.create_decision(db, decision)
+    return run_write(db, DecisionService.create_decision, decision)
 
 @router.get("/", response_model=List[DecisionSchema])
-async def get_decisions(
+def get_decisions(
+    response: Response,
     meeting_id: int = None,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
-    """Get decisions, optionally filtered by meeting"""
-    return DecisionService.get_decisions(db, meeting_id=meeting_id, skip=skip, limit=limit)
+    """
+    Get decisions, optionally filtered by meeting. Full pages carry an
+    X-Next-Cursor header; pass it back as `cursor` for the next page.
+    """
+    after_id = decode_cursor(cursor) if cursor else None
+    decisions = DecisionService.get_decisions(db, meeting_id=meeting_id, skip=skip, limit=limit, after_id=after_id)
+    set_next_cursor(response, decisions, limit)
+    return decisions
+
+@router.post("/bulk", response_model=List[DecisionSchema])
+def bulk_create_decisions(
+    decisions: List[DecisionCreate],
+    db: Session = Depends(get_db)
+):
+    """Create many decisions in one transaction; items matching an existing title in the same meeting are updated"""
+    return run_write(db, DecisionService.bulk_upsert_decisions, decisions)
+
+@router.put("/bulk", response_model=List[DecisionSchema])
+def bulk_update_decisions(
+    updates: List[DecisionBulkUpdate],
+    db: Session = Depends(get_db)
+):
+    """Update many decisions in one transaction"""
+    return run_write(db, DecisionService.bulk_update_decisions, updates)
+
+@router.delete("/bulk")
+def bulk_delete_decisions(
+    bulk_delete: BulkDelete,
+    db: Session = Depends(get_db)
+):
+    """Delete many decisions by ID"""
+    deleted = run_write(db, DecisionService.bulk_delete_decisions, bulk_delete.ids)
+    return {"message": f"Deleted {deleted} decisions", "deleted": deleted}
 
 @router.get("/{decision_id}", response_model=DecisionSchema)
-async def get_decision(
+def get_decision(
     decision_id: int,
     db: Session = Depends(get_db)
 ):
@@ -37,24 +71,24 @@ async def get_decision(
     return decision
 
 @router.put("/{decision_id}", response_model=DecisionSchema)
-async def update_decision(
+def update_decision(
     decision_id: int,
     decision_update: DecisionUpdate,
     db: Session = Depends(get_db)
 ):
     """Update a decision"""
-    decision = DecisionService.update_decision(db, decision_id, decision_update)
+    decision = run_write(db, DecisionService.update_decision, decision_id, decision_update)
     if not decision:
         raise HTTPException(status_code=404, detail="Decision not found")
     return decision
 
 @router.delete("/{decision_id}")
-async def delete_decision(
+def delete_decision(
     decision_id: int,
     db: Session = Depends(get_db)
 ):
     """Delete a decision"""
-    success = DecisionService.delete_decision(db, decision_id)
+    success = run_write(db, DecisionService.delete_decision, decision_id)
     if not success:
         raise HTTPException(status_code=404, detail="Decision not found")
     return {"message": "Decision deleted successfully"} 
\ No newline at end of file
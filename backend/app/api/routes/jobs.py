@@ -0,0 +1,30 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from app.core.database import get_async_db
+from app.schemas.schemas import Job as JobSchema
+from app.services.job_service import JobService
+
+router = APIRouter()
+
+@router.get("/", response_model=List[JobSchema])
+async def get_jobs(
+    meeting_id: Optional[int] = None,
+    status: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 100,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get jobs, optionally filtered by meeting and status"""
+    return await JobService.get_jobs_async(db, meeting_id=meeting_id, status=status, skip=skip, limit=limit)
+
+@router.get("/{job_id}", response_model=JobSchema)
+async def get_job(
+    job_id: int,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get status, progress and result of a job"""
+    job = await JobService.get_job_async(db, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
\ No newline at end of file
@@ -1,19 +1,32 @@
-from fastapi import APIRouter, Depends, HTTPException, File, UploadFile, Form, Body
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, File, UploadFile, Form, Body, Response, Request, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from typing import List, Optional, Dict
-from app.core.database import get_db
+from app.core.database import get_db, run_write, run_write_async
 from app.models.models import Meeting
-from app.schemas.schemas import Meeting as MeetingSchema, MeetingCreate, MeetingUpdate
+from app.schemas.schemas import (
+    Meeting as MeetingSchema, MeetingListItem, MeetingCreate, MeetingUpdate, Job as JobSchema, RelatedMeeting,
+    BulkDelete, CalendarScheduleItem, CalendarEventBulkUpdate, CalendarBatchResult
+)
 from app.services.meeting_service import MeetingService
-from app.services.transcription_service import TranscriptionService
-from app.services.summarization_service import SummarizationService
 from app.services.calendar_service import CalendarService
 from app.services.action_item_service import ActionItemService
 from app.services.decision_service import DecisionService
+from app.services.job_service import JobService
+from app.services.transcription_service import TranscriptionService
+from app.services.transcription_providers import provider_names, resolve_provider
+from app.services.summarization_service import SUMMARY_PRESETS, SummarizationService
+from app.services.cache_service import ResultCache
+from app.services.audio_service import AudioService
+from app.services.embedding_service import EmbeddingService
+from app.services.pagination import decode_cursor, set_next_cursor
+from app.services.diarization import has_speakers, labelled_transcript, speaker_label
+from app.core.config import settings
 import json
 import os
-import shutil
 from datetime import datetime, timedelta
+import hashlib
 
 # Create uploads directory if it doesn't exist
 os.makedirs("uploads", exist_ok=True)
@@ -21,34 +34,45 @@ os.makedirs("uploads", exist_ok=True)
 router = APIRouter()
 
 @router.post("/", response_model=MeetingSchema)
-async def create_meeting(
+def create_meeting(
     meeting: MeetingCreate,
     db: Session = Depends(get_db)
 ):
     """Create a new meeting with all available fields"""
-    return MeetingService.create_meeting(db, meeting)
+    return run_write(db, MeetingService.create_meeting, meeting)
 
-@router.get("/", response_model=List[MeetingSchema])
-async def get_meetings(
+@router.get("/", response_model=List[MeetingListItem])
+def get_meetings(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     status: Optional[str] = None,
     date_from: Optional[datetime] = None,
     date_to: Optional[datetime] = None,
+    participant: Optional[str] = None,
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
-    """Get all meetings with optional filtering"""
-    return MeetingService.get_meetings(
+    """
+    Get all meetings with optional filtering, newest first. `participant`
+    matches a participant name or email, ignoring case. Full pages carry an
+    X-Next-Cursor header; pass it back as `cursor` for the next page.
+    """
+    meetings = MeetingService.get_meetings(
         db, 
         skip=skip, 
         limit=limit,
         status=status,
         date_from=date_from,
-        date_to=date_to
+        date_to=date_to,
+        participant=participant,
+        before_id=decode_cursor(cursor) if cursor else None
     )
+    set_next_cursor(response, meetings, limit)
+    return meetings
 
 @router.get("/{meeting_id}", response_model=MeetingSchema)
-async def get_meeting(
+def get_meeting(
     meeting_id: int,
     db: Session = Depends(get_db)
 ):
@@ -59,20 +83,28 @@ async def get_meeting(
     return meeting
 
 @router.put("/{meeting_id}", response_model=MeetingSchema)
-async def update_meeting(
+def update_meeting(
     meeting_id: int,
     meeting_update: MeetingUpdate,
     db: Session = Depends(get_db)
 ):
     """Update a meeting"""
-    meeting = MeetingService.update_meeting(db, meeting_id, meeting_update)
+    meeting = run_write(db, MeetingService.update_meeting, meeting_id, meeting_update)
     if not meeting:
         raise HTTPException(status_code=404, detail="Meeting not found")
     return meeting
 
+def _delete_calendar_event(meeting_id: int, event_id: str):
+    try:
+        print(f"Deleting calendar event {event_id} of meeting {meeting_id}")
+        CalendarService.delete_meeting_event(event_id)
+    except Exception as calendar_error:
+        print(f"Error deleting calendar event: {str(calendar_error)}")
+
 @router.delete("/{meeting_id}")
-async def delete_meeting(
+def delete_meeting(
     meeting_id: int,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
     """Delete a meeting and its associated calendar event"""
@@ -81,31 +113,27 @@ async def delete_meeting(
         meeting = MeetingService.get_meeting(db, meeting_id)
         if not meeting:
             raise HTTPException(status_code=404, detail="Meeting not found")
-        
-        # Try to delete from calendar if it exists
-        try:
-            print(f"Attempting to delete calendar event for meeting {meeting_id}")
-            print(f"Calendar event ID: {meeting.calendar_event_id}")
-            
-            if meeting.calendar_event_id:
-                print(f"Deleting calendar event with ID: {meeting.calendar_event_id}")
-                CalendarService.delete_meeting_event(meeting.calendar_event_id)
-                print("Calendar event deleted successfully")
-            else:
-                print("No calendar event ID found for this meeting")
-        except Exception as calendar_error:
-            print(f"Error deleting calendar event: {str(calendar_error)}")
-            # Continue with database deletion even if calendar deletion fails
+        calendar_event_id = meeting.calendar_event_id
         
         # Delete the meeting from database
-        success = MeetingService.delete_meeting(db, meeting_id)
+        success = run_write(db, MeetingService.delete_meeting, meeting_id)
         if not success:
             raise HTTPException(status_code=500, detail="Failed to delete meeting")
         
+        try:
+            EmbeddingService.remove_meeting(meeting_id)
+        except Exception as embedding_error:
+            print(f"Error removing meeting embeddings: {str(embedding_error)}")
+        
+        # The calendar event is deleted after the response is sent, so the
+        # request doesn't wait on Google
+        if calendar_event_id:
+            background_tasks.add_task(_delete_calendar_event, meeting_id, calendar_event_id)
+        
         return {
             "message": "Meeting and associated calendar event deleted successfully",
             "meeting_id": meeting_id,
-            "calendar_event_id": meeting.calendar_event_id if hasattr(meeting, 'calendar_event_id') else None
+            "calendar_event_id": calendar_event_id
         }
     except HTTPException as e:
         raise e
@@ -124,38 +152,75 @@ async def upload_audio(
     if not meeting:
         raise HTTPException(status_code=404, detail="Meeting not found")
     
-    # Create meeting directory if it doesn't exist
+    # Stream the file to disk, hashing it on the way so transcription results can be cached by content
     meeting_dir = f"uploads/meeting_{meeting_id}"
-    os.makedirs(meeting_dir, exist_ok=True)
+    upload = await AudioService.save_upload(file, meeting_dir)
     
-    # Save file
-    file_path = f"{meeting_dir}/{file.filename}"
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
-    
-    # Update meeting with audio file path
-    meeting_update = MeetingUpdate(audio_file_path=file_path)
-    updated_meeting = MeetingService.update_meeting(db, meeting_id, meeting_update)
+    await run_write_async(
+        db, MeetingService.save_audio, meeting_id, upload["file_path"], upload["checksum"], upload["duration"]
+    )
+    # Decoded samples of the audio this upload replaced
+    AudioService.remove_pcm_cache(meeting_dir, keep=upload["checksum"])
     
-    return {"message": f"Audio file {file.filename} uploaded for meeting {meeting_id}", "file_path": file_path}
+    return {
+        "message": f"Audio file {os.path.basename(upload['file_path'])} uploaded for meeting {meeting_id}",
+        "file_path": upload["file_path"],
+        "checksum": upload["checksum"],
+        "size": upload["size"],
+        "duration": upload["duration"]
+    }
+
+def _transcript_etag(meeting_id: int, info: Dict) -> str:
+    """Weak ETag for a transcript version; every transcript write also bumps updated_at"""
+    version = f"{meeting_id}:{info['total_length']}:{info['updated_at'].isoformat() if info['updated_at'] else ''}"
+    return f'W/"{hashlib.sha1(version.encode()).hexdigest()[:20]}"'
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag"""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or any(tag.removeprefix("W/") == etag.removeprefix("W/") for tag in candidates)
 
 @router.get("/{meeting_id}/transcript")
-async def get_transcript(
+def get_transcript(
     meeting_id: int,
+    request: Request,
+    response: Response,
+    offset: int = Query(0, ge=0),
+    limit: Optional[int] = Query(None, ge=1),
     db: Session = Depends(get_db)
 ):
-    """Get transcript for a meeting"""
-    meeting = MeetingService.get_meeting(db, meeting_id)
-    if not meeting:
+    """
+    Get transcript for a meeting. `offset` and `limit` (in characters) read it
+    a page at a time; `next_offset` is null on the last page. Responses carry
+    an ETag, and a request whose If-None-Match matches it gets 304 Not Modified
+    without the text being read.
+    """
+    info = MeetingService.get_transcript_info(db, meeting_id)
+    if info is None:
         raise HTTPException(status_code=404, detail="Meeting not found")
     
-    if not meeting.transcript:
+    if not info["total_length"]:
         raise HTTPException(status_code=400, detail="No transcript available for this meeting")
     
-    return {"transcript": meeting.transcript}
+    headers = {"ETag": _transcript_etag(meeting_id, info), "Cache-Control": "no-cache"}
+    if _etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    
+    text = MeetingService.get_transcript_range(db, meeting_id, offset, limit)
+    response.headers.update(headers)
+    end = offset + len(text)
+    return {
+        "transcript": text,
+        "offset": offset,
+        "total_length": info["total_length"],
+        "next_offset": end if end < info["total_length"] else None,
+        "transcribed_until": info["transcribed_until"]
+    }
 
 @router.get("/{meeting_id}/action-items")
-async def get_meeting_action_items(
+def get_meeting_action_items(
     meeting_id: int,
     db: Session = Depends(get_db)
 ):
@@ -168,7 +233,7 @@ async def get_meeting_action_items(
     return action_items
 
 @router.get("/{meeting_id}/decisions")
-async def get_meeting_decisions(
+def get_meeting_decisions(
     meeting_id: int,
     db: Session = Depends(get_db)
 ):
@@ -180,13 +245,23 @@ async def get_meeting_decisions(
     decisions = DecisionService.get_meeting_decisions(db, meeting_id)
     return decisions
 
-@router.post("/{meeting_id}/transcribe")
-async def transcribe_meeting(
+@router.post("/{meeting_id}/transcribe", status_code=202)
+def transcribe_meeting(
     meeting_id: int,
-    provider: str = "huggingface",
+    provider: Optional[str] = None,
+    quality: Optional[str] = None,
+    mode: Optional[str] = None,
+    num_speakers: Optional[int] = Query(None, ge=1),
     db: Session = Depends(get_db)
 ):
-    """Transcribe audio for a meeting"""
+    """
+    Queue transcription of a meeting's audio; poll /api/jobs/{job_id} for the
+    result. `provider` picks the backend ("whisper", "whisper-<size>" or
+    "vosk"); without it, `quality` picks TRANSCRIPTION_PROVIDER ("accurate",
+    the default) or TRANSCRIPTION_FAST_PROVIDER ("fast"). Segments are
+    labelled with speakers when DIARIZATION_ENABLED; num_speakers fixes
+    their number if it is known.
+    """
     meeting = MeetingService.get_meeting(db, meeting_id)
     if not meeting:
         raise HTTPException(status_code=404, detail="Meeting not found")
@@ -198,40 +273,97 @@ async def transcribe_meeting(
     if not os.path.exists(meeting.audio_file_path):
         raise HTTPException(status_code=404, detail="Audio file not found")
     
-    try:
-        # Create UploadFile from file path for transcription
-        with open(meeting.audio_file_path, "rb") as audio_file:
-            file_content = audio_file.read()
-        
-        upload_file = UploadFile(
-            filename=os.path.basename(meeting.audio_file_path),
-            file=None
-        )
-        upload_file.file = open(meeting.audio_file_path, "rb")
-        
-        # Transcribe audio with selected provider
-        transcript = await TranscriptionService.transcribe_audio(upload_file, provider)
-        
-        # Update meeting with transcript
-        meeting_update = MeetingUpdate(transcript=transcript)
-        updated_meeting = MeetingService.update_meeting(db, meeting_id, meeting_update)
-        
-        return {
-            "message": f"Transcription completed for meeting {meeting_id}",
-            "transcript": transcript
-        }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Transcription error: {str(e)}")
-    finally:
-        if upload_file and upload_file.file:
-            upload_file.file.close()
+    if mode is not None and mode not in ("single", "segmented"):
+        raise HTTPException(status_code=400, detail=f"Unknown transcription mode: {mode}")
+    
+    job = JobService.submit_job(
+        meeting_id,
+        "transcribe",
+        {"provider": resolve_provider(provider, quality), "mode": mode, "num_speakers": num_speakers}
+    )
+    return {
+        "message": f"Transcription queued for meeting {meeting_id}",
+        "job_id": job.id,
+        "status": job.status
+    }
 
-@router.post("/{meeting_id}/summarize")
-async def summarize_meeting(
+@router.post("/{meeting_id}/diarize", status_code=202)
+def diarize_meeting(
     meeting_id: int,
+    num_speakers: Optional[int] = Query(None, ge=1),
     db: Session = Depends(get_db)
 ):
-    """Generate summary, extract action items and decisions for a meeting"""
+    """Queue (re)labelling the transcript segments with speakers; poll /api/jobs/{job_id} for the result"""
+    meeting = MeetingService.get_meeting(db, meeting_id)
+    if not meeting:
+        raise HTTPException(status_code=404, detail="Meeting not found")
+    
+    if not meeting.audio_file_path or not os.path.exists(meeting.audio_file_path):
+        raise HTTPException(status_code=404, detail="Audio file not found")
+    
+    job = JobService.submit_job(meeting_id, "diarize", {"num_speakers": num_speakers})
+    return {
+        "message": f"Diarization queued for meeting {meeting_id}",
+        "job_id": job.id,
+        "status": job.status
+    }
+
+@router.get("/{meeting_id}/segments")
+def get_transcript_segments(
+    meeting_id: int,
+    start_time: Optional[float] = Query(None, ge=0),
+    end_time: Optional[float] = Query(None, ge=0),
+    from_segment: Optional[int] = Query(None, ge=0),
+    to_segment: Optional[int] = Query(None, ge=0),
+    speaker: Optional[int] = Query(None, ge=0),
+    limit: int = Query(500, ge=1, le=5000),
+    db: Session = Depends(get_db)
+):
+    """
+    Timestamped transcript segments, each with its ID, speaker (null before
+    diarization) and label. `start_time`/`end_time` (seconds) keep segments
+    overlapping that span, `from_segment`/`to_segment` an inclusive range of
+    IDs, and `speaker` one speaker's segments. Only the requested rows are
+    read; `next_segment` continues a page cut short by `limit`.
+    """
+    if MeetingService.get_transcript_info(db, meeting_id) is None:
+        raise HTTPException(status_code=404, detail="Meeting not found")
+    
+    segments = MeetingService.get_segment_range(
+        db,
+        meeting_id,
+        start_time=start_time,
+        end_time=end_time,
+        first=from_segment,
+        last=to_segment,
+        speaker=speaker,
+        limit=limit
+    )
+    return {
+        "segments": [
+            dict(segment, speaker_label=speaker_label(segment["speaker"]) if segment["speaker"] is not None else None)
+            for segment in segments
+        ],
+        "speakers": [
+            {"speaker": index, "label": speaker_label(index)}
+            for index in MeetingService.get_segment_speakers(db, meeting_id)
+        ],
+        "next_segment": segments[-1]["id"] + 1 if len(segments) == limit else None
+    }
+
+@router.post("/{meeting_id}/summarize", status_code=202)
+def summarize_meeting(
+    meeting_id: int,
+    preset: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Queue summary, action item and decision extraction; poll /api/jobs/{job_id}
+    for the result. `preset` is "quality" (beam search) or "fast" (greedy
+    decoding); without it, SUMMARY_PRESET.
+    """
+    preset = preset or settings.SUMMARY_PRESET
+    SummarizationService.generation_params(preset)
     meeting = MeetingService.get_meeting(db, meeting_id)
     if not meeting:
         raise HTTPException(status_code=404, detail="Meeting not found")
@@ -239,73 +371,234 @@ async def summarize_meeting(
     if not meeting.transcript:
         raise HTTPException(status_code=400, detail="No transcript available for this meeting. Please transcribe first.")
     
+    job = JobService.submit_job(meeting_id, "summarize", {"preset": preset})
+    return {
+        "message": f"Summarization queued for meeting {meeting_id}",
+        "job_id": job.id,
+        "status": job.status
+    }
+
+@router.post("/{meeting_id}/embed", status_code=202)
+def embed_meeting(
+    meeting_id: int,
+    db: Session = Depends(get_db)
+):
+    """Queue (re)building the meeting's semantic search vectors; summarizing does this automatically"""
+    meeting = MeetingService.get_meeting(db, meeting_id)
+    if not meeting:
+        raise HTTPException(status_code=404, detail="Meeting not found")
+    
+    job = JobService.submit_job(meeting_id, "embed")
+    return {
+        "message": f"Embedding queued for meeting {meeting_id}",
+        "job_id": job.id,
+        "status": job.status
+    }
+
+@router.get("/{meeting_id}/related", response_model=List[RelatedMeeting])
+def get_related_meetings(
+    meeting_id: int,
+    limit: int = Query(5, ge=1, le=50),
+    db: Session = Depends(get_db)
+):
+    """Meetings most similar in content to this one, best first"""
+    meeting = MeetingService.get_meeting(db, meeting_id)
+    if not meeting:
+        raise HTTPException(status_code=404, detail="Meeting not found")
+    
+    return EmbeddingService.related_meetings(db, meeting_id, limit=limit)
+
+def _sse_event(event: str, data: Dict) -> str:
+    """Format one server-sent event"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+def _save_transcript_progress(
+    meeting_id: int,
+    transcript: str,
+    transcribed_until: float,
+    segments: Optional[List[Dict]] = None,
+    append: bool = False
+):
+    # Runs in a worker thread with its own session, outside the request's session
+    run_write(None, MeetingService.save_transcript_progress, meeting_id, transcript, transcribed_until, segments, append)
+
+async def _transcription_events(
+    meeting_id: int,
+    audio_path: str,
+    audio_checksum: Optional[str],
+    transcript: str,
+    resume_from: float,
+    audio_duration: Optional[float],
+    provider: str
+):
+    """
+    Transcribe window by window, saving and emitting each window as it
+    finishes. Speakers are assigned afterwards by a "diarize" job, which
+    needs the whole recording.
+    """
+    yield _sse_event("start", {"meeting_id": meeting_id, "resume_from": resume_from})
+    transcribed_until = resume_from
+    # Each window's segments are appended to the stored ones, except that a
+    # fresh start first clears any left from an earlier transcript
+    append = resume_from > 0
     try:
-        # Generate summary
-        summary = SummarizationService.summarize_text(meeting.transcript)
-        
-        # Extract action items and decisions
-        action_items = SummarizationService.extract_action_items(meeting.transcript)
-        decisions = SummarizationService.extract_decisions(meeting.transcript)
-        
-        # Ensure action_items and decisions are lists
-        if action_items is None:
-            action_items = []
-        if decisions is None:
-            decisions = []
-            
-        # Update meeting with summary
-        meeting_update = MeetingUpdate(summary=summary)
-        updated_meeting = MeetingService.update_meeting(db, meeting_id, meeting_update)
-        
-        # Save action items
-        saved_action_items = []
-        for item in action_items:
-            if not item.get('title'):
-                continue
+        if audio_duration is None or resume_from < audio_duration:
+            windows = TranscriptionService.iter_transcription(audio_path, resume_from, audio_checksum, provider)
+            while True:
+                window = await run_in_threadpool(next, windows, None)
+                if window is None:
+                    break
                 
-            action_item = ActionItemCreate(
-                meeting_id=meeting_id,
-                title=item.get('title', ''),
-                description=item.get('description', ''),
-                assignee=item.get('assignee', ''),
-                due_date=item.get('due_date')
-            )
-            saved_item = ActionItemService.create_action_item(db, action_item)
-            saved_action_items.append(saved_item)
-        
-        # Save decisions
-        saved_decisions = []
-        for decision in decisions:
-            if not decision.get('title'):
-                continue
+                segments = [segment for segment in window["segments"] if segment["text"]]
+                if segments:
+                    transcript = f"{transcript} {' '.join(segment['text'] for segment in segments)}".strip()
+                transcribed_until = window["window_end"]
+                await run_in_threadpool(
+                    _save_transcript_progress, meeting_id, transcript, transcribed_until, segments, append
+                )
+                append = True
                 
-            decision_item = DecisionCreate(
-                meeting_id=meeting_id,
-                title=decision.get('title', ''),
-                description=decision.get('description', ''),
-                decision_maker=decision.get('decision_maker', ''),
-                rationale=decision.get('rationale', '')
-            )
-            saved_decision = DecisionService.create_decision(db, decision_item)
-            saved_decisions.append(saved_decision)
+                yield _sse_event("segment", {
+                    "window_start": window["window_start"],
+                    "window_end": window["window_end"],
+                    "segments": window["segments"],
+                    "transcribed_until": transcribed_until
+                })
         
-        return {
-            "message": f"Summarization completed for meeting {meeting_id}",
-            "summary": summary,
-            "action_items": saved_action_items if saved_action_items else [],
-            "decisions": saved_decisions if saved_decisions else []
-        }
+        # Mark the whole recording as covered so later requests don't redo the tail
+        transcribed_until = max(transcribed_until, audio_duration or 0.0)
+        await run_in_threadpool(
+            _save_transcript_progress, meeting_id, transcript, transcribed_until, None if append else []
+        )
+        done = {"transcript": transcript, "transcribed_until": transcribed_until}
+        if settings.DIARIZATION_ENABLED and transcript:
+            try:
+                job = await run_in_threadpool(JobService.submit_job, meeting_id, "diarize")
+                done["diarization_job_id"] = job.id
+            except HTTPException as e:
+                # The transcript is saved; POST /diarize can label it later
+                print(f"Error queueing diarization for meeting {meeting_id}: {e.detail}")
+        yield _sse_event("done", done)
+    except HTTPException as e:
+        yield _sse_event("error", {"detail": e.detail})
     except Exception as e:
-        print(f"Error during summarization: {str(e)}")
-        return {
-            "message": f"Summarization completed for meeting {meeting_id}",
-            "summary": summary if 'summary' in locals() else "",
-            "action_items": [],
-            "decisions": []
-        }
+        print(f"Error streaming transcription: {str(e)}")
+        yield _sse_event("error", {"detail": f"Transcription error: {str(e)}"})
+
+@router.get("/{meeting_id}/transcribe/stream")
+def stream_transcription(
+    meeting_id: int,
+    restart: bool = False,
+    provider: Optional[str] = None,
+    quality: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Transcribe audio for a meeting as a server-sent event stream.
+    `provider` and `quality` choose the backend as for POST /transcribe.
+
+    Emits a "segment" event with timestamped text for each speech window as it
+    is transcribed, then "done" with the full transcript (and the ID of the
+    job that labels segments with speakers). Progress is saved to
+    the meeting after every window, so reconnecting resumes from the last
+    finished window unless restart=true.
+    """
+    meeting = MeetingService.get_meeting(db, meeting_id)
+    if not meeting:
+        raise HTTPException(status_code=404, detail="Meeting not found")
+    
+    if not meeting.audio_file_path:
+        raise HTTPException(status_code=400, detail="No audio file has been uploaded for this meeting")
+    
+    if not os.path.exists(meeting.audio_file_path):
+        raise HTTPException(status_code=404, detail="Audio file not found")
+    
+    provider = resolve_provider(provider, quality)
+    if restart or meeting.transcribed_until is None or not meeting.transcript:
+        transcript, resume_from = "", 0.0
+    else:
+        transcript, resume_from = meeting.transcript, meeting.transcribed_until
+    
+    return StreamingResponse(
+        _transcription_events(
+            meeting_id,
+            meeting.audio_file_path,
+            meeting.audio_checksum,
+            transcript,
+            resume_from,
+            meeting.audio_duration,
+            provider
+        ),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.get("/{meeting_id}/jobs", response_model=List[JobSchema])
+def get_meeting_jobs(
+    meeting_id: int,
+    db: Session = Depends(get_db)
+):
+    """Get transcription and summarization jobs for a meeting"""
+    meeting = MeetingService.get_meeting(db, meeting_id)
+    if not meeting:
+        raise HTTPException(status_code=404, detail="Meeting not found")
+    
+    return JobService.get_jobs(db, meeting_id=meeting_id)
+
+@router.delete("/{meeting_id}/cache")
+def invalidate_meeting_cache(
+    meeting_id: int,
+    db: Session = Depends(get_db)
+):
+    """
+    Drop cached transcription and summarization results for a meeting's
+    current audio and transcript, and its decoded audio
+    """
+    meeting = MeetingService.get_meeting(db, meeting_id)
+    if not meeting:
+        raise HTTPException(status_code=404, detail="Meeting not found")
+    
+    removed = 0
+    if meeting.audio_file_path and os.path.exists(meeting.audio_file_path):
+        for provider in provider_names():
+            for mode in ("single", "segmented"):
+                key = TranscriptionService.cache_key(meeting.audio_file_path, meeting.audio_checksum, mode, provider)
+                removed += ResultCache.invalidate("transcription", key)
+                removed += ResultCache.invalidate("diarization", TranscriptionService.diarization_cache_key(key))
+        removed += AudioService.remove_pcm_cache(os.path.dirname(meeting.audio_file_path))
+    if meeting.transcript:
+        segments = MeetingService.get_segments(db, meeting_id)
+        texts = [meeting.transcript]
+        if has_speakers(segments):
+            texts.append(labelled_transcript(segments))
+        for by_segments in (False, True):
+            for preset in SUMMARY_PRESETS:
+                removed += ResultCache.invalidate(
+                    "summary",
+                    SummarizationService.summary_cache_key(meeting.transcript, by_segments=by_segments, preset=preset)
+                )
+            for text in texts:
+                removed += ResultCache.invalidate(
+                    "extraction", SummarizationService.combined_extraction_cache_key(text, by_segments)
+                )
+        for text in texts:
+            extraction_key = SummarizationService.extraction_cache_key(text)
+            removed += ResultCache.invalidate("action_items", extraction_key)
+            removed += ResultCache.invalidate("decisions", extraction_key)
+    
+    return {"message": f"Cache cleared for meeting {meeting_id}", "removed": removed}
+
+def _event_description(meeting) -> str:
+    """Calendar event description for a meeting"""
+    description = f"Meeting Title: {meeting.title}\n\n"
+    if meeting.description:
+        description += f"Description: {meeting.description}\n\n"
+    if meeting.summary:
+        description += f"Summary: {meeting.summary}\n\n"
+    return description
 
 @router.post("/{meeting_id}/schedule")
-async def schedule_meeting(
+def schedule_meeting(
     meeting_id: int,
     start_time: datetime = Body(...),
     end_time: datetime = Body(...),
@@ -318,17 +611,10 @@ async def schedule_meeting(
         raise HTTPException(status_code=404, detail="Meeting not found")
     
     try:
-        # Format meeting description
-        description = f"Meeting Title: {meeting.title}\n\n"
-        if meeting.description:
-            description += f"Description: {meeting.description}\n\n"
-        if meeting.summary:
-            description += f"Summary: {meeting.summary}\n\n"
-        
         # Schedule in calendar
         event = CalendarService.create_meeting_event(
             summary=meeting.title,
-            description=description,
+            description=_event_description(meeting),
             start_time=start_time,
             end_time=end_time,
             attendees=attendees
@@ -336,7 +622,7 @@ async def schedule_meeting(
         
         # Update meeting with calendar event ID
         meeting_update = MeetingUpdate(calendar_event_id=event.get("event_id"))
-        MeetingService.update_meeting(db, meeting_id, meeting_update)
+        run_write(db, MeetingService.update_meeting, meeting_id, meeting_update)
         
         return {
             "message": f"Meeting scheduled successfully",
@@ -352,17 +638,109 @@ async def schedule_meeting(
         raise HTTPException(status_code=500, detail=f"Error scheduling meeting: {str(e)}")
 
 @router.get("/calendar/upcoming")
-async def get_upcoming_meetings(
-    max_results: int = 10,
+def get_upcoming_meetings(
+    max_results: int = Query(10, ge=1, le=250),
+    refresh: bool = False,
     db: Session = Depends(get_db)
 ):
-    """Get upcoming calendar events"""
-    try:
-        events = CalendarService.get_upcoming_meetings(max_results=max_results)
-        return {"events": events}
-    except HTTPException as e:
-        # Re-raise HTTPExceptions from the service
-        raise e
-    except Exception as e:
-        print(f"Error retrieving calendar events: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Error retrieving calendar events: {str(e)}") 
\ No newline at end of file
+    """Get upcoming calendar events from the local copy, kept current by incremental sync"""
+    return CalendarService.get_synced_upcoming_meetings(db, max_results=max_results, refresh=refresh)
+
+def _calendar_meetings(db: Session, meeting_ids: List[int]) -> Dict:
+    rows = db.query(
+        Meeting.id, Meeting.title, Meeting.description, Meeting.summary, Meeting.calendar_event_id
+    ).filter(Meeting.id.in_(meeting_ids)).all()
+    return {row.id: row for row in rows}
+
+def _batch_results(meeting_ids: List[int], outcomes: Dict[int, Dict]) -> List[Dict]:
+    results = []
+    for meeting_id in meeting_ids:
+        outcome = outcomes[meeting_id]
+        results.append({
+            "meeting_id": meeting_id,
+            "event_id": outcome.get("event_id"),
+            "calendar_link": outcome.get("html_link"),
+            "meet_link": outcome.get("meet_link"),
+            "error": outcome.get("error")
+        })
+    return results
+
+@router.post("/calendar/bulk", response_model=List[CalendarBatchResult])
+def bulk_schedule_meetings(
+    items: List[CalendarScheduleItem],
+    db: Session = Depends(get_db)
+):
+    """Schedule many meetings in the calendar with batched API calls; failures are reported per meeting"""
+    meetings = _calendar_meetings(db, [item.meeting_id for item in items])
+    outcomes = {item.meeting_id: {"error": "Meeting not found"} for item in items if item.meeting_id not in meetings}
+    to_create = [item for item in items if item.meeting_id in meetings]
+    
+    created = CalendarService.batch_create_events([
+        {
+            "summary": meetings[item.meeting_id].title,
+            "description": _event_description(meetings[item.meeting_id]),
+            "start_time": item.start_time,
+            "end_time": item.end_time,
+            "attendees": item.attendees
+        }
+        for item in to_create
+    ]) if to_create else []
+    outcomes.update({item.meeting_id: result for item, result in zip(to_create, created)})
+    
+    event_ids = {meeting_id: outcome["event_id"] for meeting_id, outcome in outcomes.items() if outcome.get("event_id")}
+    if event_ids:
+        run_write(db, MeetingService.set_calendar_event_ids, event_ids)
+    return _batch_results([item.meeting_id for item in items], outcomes)
+
+@router.put("/calendar/bulk", response_model=List[CalendarBatchResult])
+def bulk_update_meeting_events(
+    updates: List[CalendarEventBulkUpdate],
+    db: Session = Depends(get_db)
+):
+    """Update many meetings' calendar events with batched API calls; only the given fields change"""
+    meetings = _calendar_meetings(db, [update.meeting_id for update in updates])
+    outcomes = {}
+    to_update = []
+    for update in updates:
+        meeting = meetings.get(update.meeting_id)
+        if meeting is None:
+            outcomes[update.meeting_id] = {"error": "Meeting not found"}
+        elif not meeting.calendar_event_id:
+            outcomes[update.meeting_id] = {"error": "Meeting has no calendar event"}
+        else:
+            to_update.append(update)
+    
+    updated = CalendarService.batch_update_events([
+        dict(update.dict(exclude={"meeting_id"}), event_id=meetings[update.meeting_id].calendar_event_id)
+        for update in to_update
+    ]) if to_update else []
+    outcomes.update({update.meeting_id: result for update, result in zip(to_update, updated)})
+    return _batch_results([update.meeting_id for update in updates], outcomes)
+
+@router.delete("/calendar/bulk", response_model=List[CalendarBatchResult])
+def bulk_delete_meeting_events(
+    bulk_delete: BulkDelete,
+    db: Session = Depends(get_db)
+):
+    """Delete many meetings' calendar events with batched API calls and unlink them; the meetings are kept"""
+    meetings = _calendar_meetings(db, bulk_delete.ids)
+    outcomes = {}
+    to_delete = []
+    for meeting_id in bulk_delete.ids:
+        meeting = meetings.get(meeting_id)
+        if meeting is None:
+            outcomes[meeting_id] = {"error": "Meeting not found"}
+        elif not meeting.calendar_event_id:
+            outcomes[meeting_id] = {"error": "Meeting has no calendar event"}
+        else:
+            to_delete.append(meeting_id)
+    
+    deleted = CalendarService.batch_delete_events([
+        meetings[meeting_id].calendar_event_id for meeting_id in to_delete
+    ]) if to_delete else []
+    outcomes.update(dict(zip(to_delete, deleted)))
+    
+    unlinked = {meeting_id: None for meeting_id, outcome in zip(to_delete, deleted) if not outcome.get("error")}
+    if unlinked:
+        run_write(db, MeetingService.set_calendar_event_ids, unlinked)
+    return _batch_results(bulk_delete.ids, outcomes)
@@ -0,0 +1,53 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from datetime import datetime
+from app.core.database import get_db
+from app.schemas.schemas import SearchResult, SemanticSearchResult
+from app.services.search_service import SearchService
+from app.services.embedding_service import EmbeddingService
+
+router = APIRouter()
+
+@router.get("/", response_model=List[SearchResult])
+def search(
+    q: str = Query(..., min_length=1, max_length=500),
+    kind: Optional[List[str]] = Query(None),
+    meeting_id: Optional[int] = None,
+    status: Optional[str] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db)
+):
+    """
+    Search transcripts, summaries, action items and decisions. Results are
+    ranked best first, with the matched terms highlighted in `snippet`.
+    Filter by `kind` (repeatable), meeting, meeting status or meeting date.
+    """
+    return SearchService.search(
+        db,
+        q,
+        kinds=kind,
+        meeting_id=meeting_id,
+        status=status,
+        date_from=date_from,
+        date_to=date_to,
+        skip=skip,
+        limit=limit
+    )
+
+@router.get("/semantic", response_model=List[SemanticSearchResult])
+def semantic_search(
+    q: str = Query(..., min_length=1, max_length=500),
+    kind: Optional[List[str]] = Query(None),
+    limit: int = Query(10, ge=1, le=100),
+    db: Session = Depends(get_db)
+):
+    """
+    Find transcript passages, summaries and decisions by meaning rather than
+    exact words, using the local embedding model. Only meetings that have been
+    summarized (or embedded) are searched.
+    """
+    return EmbeddingService.search(db, q, kinds=kind, limit=limit)
@@ -7,14 +7,52 @@ class Settings(BaseSettings):
     # Database settings
     DATABASE_URL: str = "sqlite:///./app.db"
     TEST_DATABASE_URL: str = "sqlite:///./test.db"
+    ASYNC_DATABASE_URL: Optional[str] = None  # Derived from DATABASE_URL (aiosqlite / asyncpg) when unset
+    DB_POOL_SIZE: int = 5  # Connections kept open per process (server databases only)
+    DB_MAX_OVERFLOW: int = 10  # Extra connections opened under load, closed when returned
+    DB_POOL_TIMEOUT: int = 30  # Seconds to wait for a free connection before failing
+    DB_POOL_RECYCLE: int = 1800  # Replace connections older than this, before the server drops them
+    DB_POOL_PRE_PING: bool = True  # Test connections on checkout so stale ones are replaced
+    DB_ECHO: bool = False  # Log every SQL statement
+    # SQLite performance mode: WAL journaling plus the pragmas below
+    SQLITE_PERFORMANCE_MODE: bool = True
+    SQLITE_WRITE_QUEUE: bool = False  # Run writes one at a time per process; protects reads, costs write throughput
+    SQLITE_SYNCHRONOUS: str = "NORMAL"  # Safe with WAL; only the last commits can be lost on power failure
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024  # Bytes of the database file read through mmap
+    SQLITE_CACHE_SIZE_KB: int = 64 * 1024  # Page cache per connection
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000  # Wait this long for another process's write lock
     
     # Hugging Face settings
     HUGGINGFACE_CACHE_DIR: str = str(Path.home() / ".cache" / "huggingface")
+    HUGGINGFACE_OFFLINE: bool = False  # Only load models already in HUGGINGFACE_CACHE_DIR (or local paths)
+    
+    # Model settings
+    WHISPER_MODEL_SIZE: str = "base"
+    SUMMARIZATION_MODEL: str = "facebook/bart-large-cnn"
+    GENERATION_MODEL: str = "google/flan-t5-large"
+    # "lazy" loads each model on first use, "eager" loads them when the app is imported
+    # (before a pre-forking server forks), "background" loads them on a thread at startup
+    MODEL_LOADING: str = "lazy"
+    PRELOAD_MODELS: str = "whisper,summarizer,generator"  # Models loaded by "eager" and "background"
+    
+    # CPU inference settings
+    WHISPER_PRECISION: str = "fp32"  # "fp32" or "int8" (dynamic quantization of Linear layers, CPU only)
+    SUMMARIZER_PRECISION: str = "fp32"
+    GENERATOR_PRECISION: str = "fp32"
+    TORCH_INTRA_OP_THREADS: int = 0  # Threads per operator in each worker process; 0 keeps torch's default
+    TORCH_INTER_OP_THREADS: int = 0  # Threads running independent operators; 0 keeps torch's default
+    TORCH_INFERENCE_MODE: bool = True  # Run model calls under torch.inference_mode()
     
     # Google Calendar settings
     GOOGLE_CLIENT_ID: Optional[str] = None
     GOOGLE_CLIENT_SECRET: Optional[str] = None
     GOOGLE_REDIRECT_URI: str = "http://localhost:8000/auth/callback"
+    CALENDAR_TOKEN_REFRESH_MARGIN: int = 300  # Refresh the access token in the background this many seconds before it expires
+    CALENDAR_HTTP_TIMEOUT: int = 30  # Seconds before a Calendar API request times out
+    CALENDAR_API_ENDPOINT: Optional[str] = None  # Replaces https://www.googleapis.com/calendar/v3/ (e.g. a local fake server)
+    CALENDAR_BATCH_ENDPOINT: Optional[str] = None  # Replaces https://www.googleapis.com/batch/calendar/v3
+    CALENDAR_BATCH_SIZE: int = 50  # Requests per batch call (the API allows at most 50)
+    CALENDAR_SYNC_INTERVAL: int = 60  # Seconds before the local copy of upcoming events is synced again
     
     # OpenAI settings
     OPENAI_API_KEY: Optional[str] = None
@@ -23,7 +61,50 @@ class Settings(BaseSettings):
     SECRET_KEY: str = "your-secret-key-here"
     
     # Transcription settings
-    TRANSCRIPTION_PROVIDER: str = "huggingface"  # Default to huggingface
+    # "whisper" (WHISPER_MODEL_SIZE), "whisper-<size>" (e.g. "whisper-small") or "vosk"
+    TRANSCRIPTION_PROVIDER: str = "whisper"  # Used by default and for quality=accurate
+    TRANSCRIPTION_FAST_PROVIDER: str = "whisper-tiny"  # Used for quality=fast
+    VOSK_MODEL: str = "vosk-model-small-en-us-0.15"  # Model name (downloaded on first use) or path to an unpacked model
+    MAX_UPLOAD_BYTES: int = 1024 * 1024 * 1024  # Reject audio uploads larger than 1 GB
+    AUDIO_DECODE_CHUNK_SECONDS: float = 30.0  # Audio decoded per read from ffmpeg
+    TRANSCRIPTION_MODE: str = "single"  # "single" pass or "segmented" (VAD split, parallel decoding)
+    TRANSCRIPTION_WORKERS: int = 2  # Processes decoding segments in segmented mode
+    VAD_MIN_SILENCE_MS: int = 500  # Pauses shorter than this don't split speech
+    VAD_MAX_SEGMENT_SECONDS: float = 60.0  # Target upper bound for a segment
+    DIARIZATION_ENABLED: bool = True  # Label transcript segments with speakers after transcription
+    DIARIZATION_THRESHOLD: float = 0.4  # Voice distance above which clusters count as different speakers
+    DIARIZATION_MAX_SPEAKERS: int = 8
+    DIARIZATION_WINDOW_SECONDS: float = 3.0  # Audio per speaker embedding
+    
+    # Summarization settings
+    SUMMARIZATION_BATCH_SIZE: int = 4  # Chunks per BART forward pass
+    SUMMARY_PRESET: str = "quality"  # "quality" (beam search) or "fast" (greedy decoding)
+    SUMMARY_NUM_BEAMS: int = 4  # Beams for the "quality" preset
+    SUMMARY_NO_REPEAT_NGRAM_SIZE: int = 3  # Never repeat an n-gram this long in a summary; 0 allows repeats
+    SUMMARY_RATIO: float = 0.15  # Summary length budget per chunk, as a share of the chunk's tokens
+    SUMMARY_MAX_TOKENS: int = 160  # Upper bound on each chunk's summary
+    CHUNK_OVERLAP_TOKENS: int = 0  # Tokens shared between consecutive transcript chunks
+    EXTRACTION_MODE: str = "combined"  # "combined" (one pass per chunk for both lists) or "separate"
+    EXTRACTION_MAX_INPUT_TOKENS: int = 1024  # Prompt plus transcript chunk for combined extraction
+    
+    # Semantic search settings
+    EMBEDDINGS_ENABLED: bool = True  # Embed transcripts, summaries and decisions after summarization
+    EMBEDDING_MODEL: str = "sentence-transformers/all-MiniLM-L6-v2"  # Local sentence-embedding model (name or path)
+    EMBEDDING_INDEX_DIR: str = "./.cache/embeddings"
+    EMBEDDING_BATCH_SIZE: int = 32  # Texts per forward pass
+    EMBEDDING_MAX_TOKENS: int = 256  # Longer texts are truncated
+    EMBEDDING_CHUNK_WORDS: int = 160  # Transcript and summary chunk size
+    EMBEDDING_CHUNK_OVERLAP_WORDS: int = 32  # Words shared between consecutive chunks
+    SEARCH_TURN_WORDS: int = 160  # Full-text search indexes a diarized transcript in speaker turns of up to this many words
+    
+    # Result cache settings
+    RESULT_CACHE_ENABLED: bool = True
+    RESULT_CACHE_DIR: str = "./.cache/results"
+    RESULT_CACHE_MAX_BYTES: int = 512 * 1024 * 1024
+    
+    # Background job settings
+    JOB_WORKERS: int = 1  # Number of inference jobs run concurrently
+    JOB_MAX_PENDING: int = 32  # Reject new jobs once this many are queued or running
     
     class Config:
         env_file = ".env"
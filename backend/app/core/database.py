@@ -1,17 +1,242 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url, URL
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.pool import StaticPool
 from app.core.config import settings
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Optional
+import asyncio
+import queue
+import threading
+
+# Async drivers used when ASYNC_DATABASE_URL isn't set explicitly
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+def normalize_database_url(url: str) -> URL:
+    """Parse a database URL, accepting the "postgres://" scheme some hosts hand out"""
+    if url.startswith("postgres://"):
+        url = "postgresql://" + url[len("postgres://"):]
+    return make_url(url)
+
+def engine_options(url: URL) -> Dict[str, Any]:
+    """
+    Connection pool options for a database backend. SQLite connections are
+    cheap local file handles, so it keeps SQLAlchemy's defaults and only allows
+    sessions to cross threads; server databases get a sized, pre-pinged,
+    recycled pool.
+    """
+    options: Dict[str, Any] = {"echo": settings.DB_ECHO}
+    if url.get_backend_name() == "sqlite":
+        options["connect_args"] = {"check_same_thread": False}
+        if url.database in (None, "", ":memory:"):
+            # Every new connection would get its own empty in-memory database
+            options["poolclass"] = StaticPool
+        return options
+
+    options.update(
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+    )
+    return options
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Tune every new SQLite connection; journal_mode=WAL persists in the file itself"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+    if settings.SQLITE_PERFORMANCE_MODE:
+        # WAL lets readers keep reading while a write is in progress
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+        cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}")
+        # A negative cache_size is in KiB rather than pages
+        cursor.execute(f"PRAGMA cache_size=-{int(settings.SQLITE_CACHE_SIZE_KB)}")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
+def create_db_engine(url: Optional[str] = None, **overrides) -> Engine:
+    """Create a synchronous engine for DATABASE_URL (or the given URL), pooled for its backend"""
+    database_url = normalize_database_url(url or settings.DATABASE_URL)
+    options = engine_options(database_url)
+    options.update(overrides)
+    db_engine = create_engine(database_url, **options)
+    if database_url.get_backend_name() == "sqlite":
+        event.listen(db_engine, "connect", _set_sqlite_pragmas)
+    return db_engine
+
+def async_database_url(url: Optional[str] = None) -> URL:
+    """The async-driver URL for a database: ASYNC_DATABASE_URL, or DATABASE_URL with its driver swapped"""
+    if url is None and settings.ASYNC_DATABASE_URL:
+        return normalize_database_url(settings.ASYNC_DATABASE_URL)
+    database_url = normalize_database_url(url or settings.DATABASE_URL)
+    backend = database_url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for database backend: {backend}")
+    return database_url.set(drivername=ASYNC_DRIVERS[backend])
+
+def create_async_db_engine(url: Optional[str] = None, **overrides):
+    """Create an AsyncEngine with the same pool configuration as the sync engine"""
+    from sqlalchemy.ext.asyncio import create_async_engine
+    database_url = async_database_url(url)
+    options = engine_options(database_url)
+    if database_url.get_backend_name() == "sqlite":
+        # aiosqlite runs each connection on its own thread already
+        options.pop("connect_args", None)
+    options.update(overrides)
+    async_engine = create_async_engine(database_url, **options)
+    if database_url.get_backend_name() == "sqlite":
+        event.listen(async_engine.sync_engine, "connect", _set_sqlite_pragmas)
+    return async_engine
 
 SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
-)
+engine = create_db_engine(SQLALCHEMY_DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
 
+class SQLiteWriteQueue:
+    """
+    Runs database writes one at a time.
+
+    SQLite has a single write lock per file. When request handlers and job
+    workers write on their own connections at once, all but one spin in
+    SQLite's busy handler, sleeping in growing steps, and give up with
+    "database is locked" after the busy timeout. Here writers wait on a
+    Python lock instead, so each one starts as soon as the previous one
+    commits, and WAL keeps readers off the write lock entirely.
+
+    Writes from threads run on the calling thread while holding the lock.
+    Writes from the event loop are queued to a dedicated writer thread so the
+    loop never blocks. Every write gets a fresh session that is closed
+    afterwards, so returned objects are detached with their loaded
+    attributes intact.
+    """
+    def __init__(self, session_factory: Callable[[], Session]):
+        self._session_factory = session_factory
+        self._write_lock = threading.RLock()
+        self._queue: "queue.Queue" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._thread_lock = threading.Lock()
+        self._local = threading.local()
+
+    def _execute(self, fn: Callable[..., Any], args, kwargs) -> Any:
+        with self._write_lock:
+            db = getattr(self._local, "db", None)
+            if db is not None:
+                # A write that issues another write: reuse the current session
+                return fn(db, *args, **kwargs)
+            db = self._session_factory()
+            self._local.db = db
+            try:
+                return fn(db, *args, **kwargs)
+            except BaseException:
+                db.rollback()
+                raise
+            finally:
+                self._local.db = None
+                db.close()
+
+    def _worker(self):
+        while True:
+            task = self._queue.get()
+            if task is None:
+                return
+            future, fn, args, kwargs = task
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(self._execute(fn, args, kwargs))
+            except BaseException as e:
+                future.set_exception(e)
+
+    def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run fn(session, *args, **kwargs) on this thread once no other write is running"""
+        return self._execute(fn, args, kwargs)
+
+    def submit(self, fn: Callable[..., Any], *args, **kwargs) -> Future:
+        """Queue fn(session, *args, **kwargs) for the writer thread and return a future for its result"""
+        with self._thread_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._worker, name="sqlite-writer", daemon=True)
+                self._thread.start()
+        future: Future = Future()
+        self._queue.put((future, fn, args, kwargs))
+        return future
+
+    def stop(self, timeout: float = 10.0):
+        """Finish queued writes and stop the writer thread"""
+        with self._thread_lock:
+            thread, self._thread = self._thread, None
+        if thread is not None and thread.is_alive():
+            self._queue.put(None)
+            thread.join(timeout)
+
+# Created on first use, so the async driver is only needed by routes that use it
+_async_engine = None
+_async_session_factory = None
+
+def get_async_session_factory():
+    """Return the AsyncSession factory, creating the async engine on first use"""
+    global _async_engine, _async_session_factory
+    if _async_session_factory is None:
+        from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
+        _async_engine = create_async_db_engine()
+        _async_session_factory = async_sessionmaker(
+            _async_engine,
+            class_=AsyncSession,
+            autoflush=False,
+            expire_on_commit=False
+        )
+    return _async_session_factory
+
+write_queue = SQLiteWriteQueue(SessionLocal)
+
+def use_write_queue() -> bool:
+    return settings.SQLITE_WRITE_QUEUE and engine.dialect.name == "sqlite"
+
+def run_write(db: Optional[Session], fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """
+    Run a write, fn(session, *args, **kwargs), which is expected to commit.
+    With the SQLite write queue it runs in a session of its own and db is
+    not used: changes pending on db are neither flushed nor visible to fn,
+    and the objects fn returns are detached. Otherwise it runs here on db
+    (or a temporary session if db is None). Callers should pass everything
+    fn needs as arguments and re-query afterwards rather than rely on db.
+    """
+    if use_write_queue():
+        return write_queue.run(fn, *args, **kwargs)
+    if db is not None:
+        return fn(db, *args, **kwargs)
+    db = SessionLocal()
+    try:
+        return fn(db, *args, **kwargs)
+    finally:
+        db.close()
+
+async def run_write_async(db: Optional[Session], fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """run_write for async routes: waits for the writer thread without blocking the event loop"""
+    if use_write_queue():
+        return await asyncio.wrap_future(write_queue.submit(fn, *args, **kwargs))
+    return run_write(db, fn, *args, **kwargs)
+
+def upsert_insert(db: Session, table):
+    """An INSERT for table that supports ON CONFLICT on the session's database (SQLite or PostgreSQL)"""
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    elif dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        raise NotImplementedError(f"Upserts are not supported on {dialect} databases")
+    return insert(table)
+
 def get_db():
     db = SessionLocal()
     try:
@@ -19,7 +244,19 @@ def get_db():
     finally:
         db.close()
 
+async def get_async_db():
+    """Dependency for routes that query without blocking the event loop"""
+    async with get_async_session_factory()() as db:
+        yield db
+
+async def dispose_engines():
+    """Flush queued writes and close pooled connections on shutdown"""
+    write_queue.stop()
+    if _async_engine is not None:
+        await _async_engine.dispose()
+    engine.dispose()
+
 def recreate_tables():
     """Drop and recreate all tables"""
     Base.metadata.drop_all(bind=engine)
-    Base.metadata.create_all(bind=engine) 
\ No newline at end of file
+    Base.metadata.create_all(bind=engine)
\ No newline at end of file
@@ -1,7 +1,12 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
-from app.api.routes import meetings, action_items, decisions
+from app.api.routes import meetings, action_items, decisions, jobs, cache, search
 from app.core.config import settings
+from app.core.database import dispose_engines
+from app.services.pagination import NEXT_CURSOR_HEADER
+from app.services.job_service import JobService
+from app.services.calendar_service import CalendarService
+from app.services.model_registry import ModelRegistry
 import os
 
 app = FastAPI(
@@ -10,6 +15,11 @@ app = FastAPI(
     version="1.0.0"
 )
 
+if settings.MODEL_LOADING == "eager":
+    # Load at import time so a pre-forking server (gunicorn --preload) loads the
+    # weights once and its workers share them copy-on-write
+    ModelRegistry.preload()
+
 # Get allowed origins from environment variable or use default
 ALLOWED_ORIGINS = os.getenv("ALLOWED_ORIGINS", "*").split(",")
 
@@ -20,17 +30,53 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Let browser clients read the pagination cursor and transcript ETags
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag"],
 )
 
 # Include routers
 app.include_router(meetings.router, prefix="/api/meetings", tags=["meetings"])
 app.include_router(action_items.router, prefix="/api/action-items", tags=["action-items"])
 app.include_router(decisions.router, prefix="/api/decisions", tags=["decisions"])
+app.include_router(jobs.router, prefix="/api/jobs", tags=["jobs"])
+app.include_router(cache.router, prefix="/api/cache", tags=["cache"])
+app.include_router(search.router, prefix="/api/search", tags=["search"])
+
+@app.on_event("startup")
+async def warm_up_models():
+    if settings.MODEL_LOADING == "background":
+        ModelRegistry.preload_in_background()
+
+@app.on_event("startup")
+async def resume_jobs():
+    # Pick up jobs that were queued or running when the server last stopped
+    try:
+        JobService.recover_jobs()
+    except Exception as e:
+        print(f"Error recovering jobs: {str(e)}")
+
+@app.on_event("shutdown")
+async def stop_jobs():
+    JobService.shutdown()
+
+@app.on_event("shutdown")
+async def stop_calendar_refresh():
+    CalendarService.reset()
+
+@app.on_event("shutdown")
+async def close_database():
+    await dispose_engines()
 
 @app.get("/")
 async def root():
     return {"message": "AI Meeting Summarizer API", "status": "running"}
 
 @app.get("/health")
-async def health_check():
-    return {"status": "healthy"} 
\ No newline at end of file
+async def health_check(response: Response):
+    models = ModelRegistry.get_status()
+    if not models["ready"]:
+        # Still warming up: report not ready so load balancers hold traffic
+        response.status_code = 503
+        return {"status": "starting", "models": models}
+    # A preload that failed won't finish by waiting; say which one and why
+    return {"status": "degraded" if models["failed"] else "healthy", "models": models}
\ No newline at end of file
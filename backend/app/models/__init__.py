@@ -1,3 +1,3 @@
-from .models import Meeting, ActionItem, Decision
+from .models import Meeting, MeetingParticipant, ActionItem, Decision, Job, CalendarEvent, CalendarSyncState, SearchDocument
 
-__all__ = ['Meeting', 'ActionItem', 'Decision'] 
\ No newline at end of file
+__all__ = ['Meeting', 'MeetingParticipant', 'ActionItem', 'Decision', 'Job', 'CalendarEvent', 'CalendarSyncState', 'SearchDocument']
\ No newline at end of file
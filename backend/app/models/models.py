@@ -1,8 +1,10 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean, ARRAY
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean, Float, ARRAY, Index, DDL, event
+from sqlalchemy.orm import relationship, column_property
 from sqlalchemy.sql import func
 from app.core.database import Base
+from app.services.text_utils import normalize_participant
 from datetime import datetime
+from typing import List, Optional
 
 class Meeting(Base):
     __tablename__ = "meetings"
@@ -12,17 +14,92 @@ class Meeting(Base):
     description = Column(Text)
     date = Column(DateTime, nullable=True)
     duration = Column(Integer, nullable=True)
-    participants = Column(Text, nullable=True)  # Store as JSON string
     status = Column(String, nullable=True)
     audio_file_path = Column(String)
+    audio_checksum = Column(String(64), nullable=True)  # SHA-256 of the uploaded audio
+    audio_duration = Column(Float, nullable=True)  # Length of the uploaded audio in seconds
     transcript = Column(Text)
+    transcribed_until = Column(Float, nullable=True)  # Seconds of audio covered by the transcript so far
     summary = Column(Text)
     calendar_event_id = Column(String, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
+    # Cheap flags for list views that defer the text columns themselves
+    has_transcript = column_property(transcript.isnot(None))
+    has_summary = column_property(summary.isnot(None))
+    
+    # Loaded with every meeting query in one extra SELECT ... IN, so meetings
+    # handed back detached from the write queue still carry their participants
+    participant_links = relationship(
+        "MeetingParticipant",
+        back_populates="meeting",
+        cascade="all, delete-orphan",
+        order_by="MeetingParticipant.id",
+        lazy="selectin"
+    )
     action_items = relationship("ActionItem", back_populates="meeting")
     decisions = relationship("Decision", back_populates="meeting")
+    jobs = relationship("Job", back_populates="meeting", cascade="all, delete-orphan")
+    
+    # Match GET /api/meetings filters, which list newest (highest ID) first
+    __table_args__ = (
+        Index("ix_meetings_status_id", "status", "id"),
+        Index("ix_meetings_date", "date"),
+    )
+    
+    @property
+    def participants(self) -> List[str]:
+        """Participant names or emails, in the order they were given"""
+        return [link.name for link in self.participant_links]
+    
+    @participants.setter
+    def participants(self, names: Optional[List[str]]):
+        links, seen = [], set()
+        for name in names or []:
+            normalized = normalize_participant(name)
+            if normalized and normalized not in seen:
+                seen.add(normalized)
+                links.append(MeetingParticipant(name=name.strip(), normalized_name=normalized))
+        self.participant_links = links
+
+class MeetingParticipant(Base):
+    __tablename__ = "meeting_participants"
+    
+    id = Column(Integer, primary_key=True)
+    meeting_id = Column(Integer, ForeignKey("meetings.id", ondelete="CASCADE"), nullable=False)
+    name = Column(String(255), nullable=False)
+    normalized_name = Column(String(255), nullable=False)  # Lookup key for the participant filter
+    
+    meeting = relationship("Meeting", back_populates="participant_links")
+    
+    __table_args__ = (
+        Index("ix_meeting_participants_meeting_id", "meeting_id"),
+        # "Meetings attended by X", newest first
+        Index("ix_meeting_participants_normalized_name_meeting_id", "normalized_name", "meeting_id"),
+    )
+
+class TranscriptSegment(Base):
+    """
+    One timestamped stretch of a meeting's transcript, as Whisper segmented
+    it. Meeting.transcript stays the joined text; these rows let time and
+    segment ranges be read without loading it.
+    """
+    __tablename__ = "transcript_segments"
+    
+    id = Column(Integer, primary_key=True)
+    meeting_id = Column(Integer, ForeignKey("meetings.id", ondelete="CASCADE"), nullable=False)
+    position = Column(Integer, nullable=False)  # Order within the meeting, from 0; the segment ID in the API
+    start_time = Column(Float, nullable=False)  # Seconds from the start of the recording
+    end_time = Column(Float, nullable=False)
+    speaker = Column(Integer, nullable=True)  # Set by diarization
+    text = Column(Text, nullable=False)
+    
+    __table_args__ = (
+        Index("ix_transcript_segments_meeting_id_position", "meeting_id", "position", unique=True),
+        # Time range reads find their first and last segment by start time
+        Index("ix_transcript_segments_meeting_id_start_time", "meeting_id", "start_time"),
+    )
 
 class ActionItem(Base):
     __tablename__ = "action_items"
@@ -30,6 +107,7 @@ class ActionItem(Base):
     id = Column(Integer, primary_key=True, index=True)
     meeting_id = Column(Integer, ForeignKey("meetings.id"))
     title = Column(String(255), nullable=False)
+    normalized_title = Column(String(255), nullable=True)  # Upsert key within a meeting
     description = Column(Text, nullable=False)
     assignee = Column(String(255), nullable=False)
     due_date = Column(DateTime, nullable=True)
@@ -37,6 +115,11 @@ class ActionItem(Base):
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     
     meeting = relationship("Meeting", back_populates="action_items")
+    
+    __table_args__ = (
+        Index("ix_action_items_meeting_normalized_title", "meeting_id", "normalized_title", unique=True),
+        Index("ix_action_items_meeting_id_id", "meeting_id", "id"),  # Per-meeting listing in ID order
+    )
 
 class Decision(Base):
     __tablename__ = "decisions"
@@ -44,10 +127,115 @@ class Decision(Base):
     id = Column(Integer, primary_key=True, index=True)
     meeting_id = Column(Integer, ForeignKey("meetings.id"))
     title = Column(String(255), nullable=False)
+    normalized_title = Column(String(255), nullable=True)  # Upsert key within a meeting
     description = Column(Text, nullable=False)
     decision_maker = Column(String(255), nullable=False)
     rationale = Column(Text, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
-    meeting = relationship("Meeting", back_populates="decisions") 
\ No newline at end of file
+    meeting = relationship("Meeting", back_populates="decisions")
+    
+    __table_args__ = (
+        Index("ix_decisions_meeting_normalized_title", "meeting_id", "normalized_title", unique=True),
+        Index("ix_decisions_meeting_id_id", "meeting_id", "id"),  # Per-meeting listing in ID order
+    ) 
+
+class Job(Base):
+    __tablename__ = "jobs"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    meeting_id = Column(Integer, ForeignKey("meetings.id", ondelete="CASCADE"), index=True)
+    job_type = Column(String(50), nullable=False)  # "transcribe" or "summarize"
+    status = Column(String(20), nullable=False, default="queued", index=True)
+    progress = Column(Float, nullable=False, default=0.0)
+    params = Column(Text, nullable=True)  # Store as JSON string
+    result = Column(Text, nullable=True)  # Store as JSON string
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    
+    meeting = relationship("Meeting", back_populates="jobs")
+
+class CalendarEvent(Base):
+    """Local copy of an upcoming Google Calendar event, kept current by incremental sync"""
+    __tablename__ = "calendar_events"
+    
+    id = Column(String(255), primary_key=True)  # Google event ID
+    start_time = Column(DateTime, nullable=False)  # UTC
+    end_time = Column(DateTime, nullable=False)  # UTC
+    data = Column(Text, nullable=False)  # The event as returned by /calendar/upcoming, as JSON
+    
+    __table_args__ = (
+        Index("ix_calendar_events_start_time", "start_time"),
+    )
+
+class CalendarSyncState(Base):
+    """Where incremental sync of a calendar left off"""
+    __tablename__ = "calendar_sync_state"
+    
+    calendar_id = Column(String(255), primary_key=True)
+    sync_token = Column(Text, nullable=True)  # nextSyncToken from the last completed sync
+    synced_at = Column(DateTime, nullable=True)
+
+class SearchDocument(Base):
+    """
+    One searchable text: a meeting's transcript or summary, an action item or
+    a decision. A diarized transcript is split into "turn" documents, one per
+    speaker turn, keyed by the turn's first segment. The full-text index over these rows is built with raw DDL per
+    backend below: an FTS5 table kept in sync by triggers on SQLite, a GIN
+    expression index on Postgres.
+    """
+    __tablename__ = "search_documents"
+    
+    id = Column(Integer, primary_key=True)
+    kind = Column(String(20), nullable=False)  # "transcript", "turn", "summary", "action_item" or "decision"
+    item_id = Column(Integer, nullable=False)  # Meeting, transcript segment, action item or decision ID
+    meeting_id = Column(Integer, ForeignKey("meetings.id"), nullable=False)
+    title = Column(Text, nullable=True)
+    body = Column(Text, nullable=True)
+    # Turns only: who spoke and when, in seconds
+    speaker = Column(Integer, nullable=True)
+    start_time = Column(Float, nullable=True)
+    end_time = Column(Float, nullable=True)
+    
+    __table_args__ = (
+        Index("ix_search_documents_kind_item_id", "kind", "item_id", unique=True),
+        Index("ix_search_documents_meeting_id", "meeting_id"),
+    )
+
+def search_tsvector(alias: str = "") -> str:
+    """Postgres document vector for search_documents, titles ranking above bodies"""
+    prefix = f"{alias}." if alias else ""
+    return (
+        f"setweight(to_tsvector('english', coalesce({prefix}title, '')), 'A') || "
+        f"setweight(to_tsvector('english', coalesce({prefix}body, '')), 'B')"
+    )
+
+SEARCH_SQLITE_DDL = [
+    "CREATE VIRTUAL TABLE search_documents_fts USING fts5("
+    "title, body, content='search_documents', content_rowid='id', "
+    "tokenize='porter unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER search_documents_ai AFTER INSERT ON search_documents BEGIN "
+    "INSERT INTO search_documents_fts(rowid, title, body) VALUES (new.id, new.title, new.body); END",
+    "CREATE TRIGGER search_documents_ad AFTER DELETE ON search_documents BEGIN "
+    "INSERT INTO search_documents_fts(search_documents_fts, rowid, title, body) VALUES ('delete', old.id, old.title, old.body); END",
+    "CREATE TRIGGER search_documents_au AFTER UPDATE ON search_documents BEGIN "
+    "INSERT INTO search_documents_fts(search_documents_fts, rowid, title, body) VALUES ('delete', old.id, old.title, old.body); "
+    "INSERT INTO search_documents_fts(rowid, title, body) VALUES (new.id, new.title, new.body); END",
+]
+
+SEARCH_POSTGRES_DDL = [
+    f"CREATE INDEX ix_search_documents_tsv ON search_documents USING gin (({search_tsvector()}))",
+]
+
+for statement in SEARCH_SQLITE_DDL:
+    event.listen(SearchDocument.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+for statement in SEARCH_POSTGRES_DDL:
+    event.listen(SearchDocument.__table__, "after_create", DDL(statement).execute_if(dialect="postgresql"))
+event.listen(
+    SearchDocument.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS search_documents_fts").execute_if(dialect="sqlite")
+)
@@ -1,6 +1,7 @@
-from pydantic import BaseModel
-from typing import Optional, List
+from pydantic import BaseModel, field_validator
+from typing import Optional, List, Any, Dict
 from datetime import datetime
+import json
 
 # Meeting schemas
 class MeetingBase(BaseModel):
@@ -15,6 +16,11 @@ class MeetingCreate(MeetingBase):
     pass
 
 class MeetingUpdate(BaseModel):
+    """
+    Fields a client may change. The audio checksum and duration and the
+    transcription resume point are server-owned: they are written only by
+    the upload and transcription code paths.
+    """
     title: Optional[str] = None
     description: Optional[str] = None
     date: Optional[datetime] = None
@@ -26,11 +32,12 @@ class MeetingUpdate(BaseModel):
     summary: Optional[str] = None
     calendar_event_id: Optional[str] = None
 
-class Meeting(MeetingBase):
+class MeetingListItem(MeetingBase):
+    """Meeting fields for list views; leaves out the transcript and summary text"""
     id: int
-    audio_file_path: Optional[str] = None
-    transcript: Optional[str] = None
-    summary: Optional[str] = None
+    audio_duration: Optional[float] = None
+    has_transcript: bool = False
+    has_summary: bool = False
     calendar_event_id: Optional[str] = None
     created_at: datetime
     updated_at: Optional[datetime] = None
@@ -38,6 +45,13 @@ class Meeting(MeetingBase):
     class Config:
         from_attributes = True
 
+class Meeting(MeetingListItem):
+    """A single meeting; the transcript is served by GET /api/meetings/{id}/transcript"""
+    audio_file_path: Optional[str] = None
+    audio_checksum: Optional[str] = None
+    transcribed_until: Optional[float] = None
+    summary: Optional[str] = None
+
 # Action Item schemas
 class ActionItemBase(BaseModel):
     title: str
@@ -51,6 +65,13 @@ class ActionItemCreate(ActionItemBase):
 class ActionItemUpdate(ActionItemBase):
     pass
 
+class ActionItemBulkUpdate(BaseModel):
+    id: int
+    title: Optional[str] = None
+    description: Optional[str] = None
+    assignee: Optional[str] = None
+    due_date: Optional[datetime] = None
+
 class ActionItem(ActionItemBase):
     id: int
     meeting_id: int
@@ -73,6 +94,13 @@ class DecisionCreate(DecisionBase):
 class DecisionUpdate(DecisionBase):
     pass
 
+class DecisionBulkUpdate(BaseModel):
+    id: int
+    title: Optional[str] = None
+    description: Optional[str] = None
+    decision_maker: Optional[str] = None
+    rationale: Optional[str] = None
+
 class Decision(DecisionBase):
     id: int
     meeting_id: int
@@ -80,4 +108,88 @@ class Decision(DecisionBase):
     updated_at: datetime
 
     class Config:
-        orm_mode = True 
\ No newline at end of file
+        orm_mode = True 
+
+# Bulk operation schemas
+class BulkDelete(BaseModel):
+    ids: List[int]
+
+# Calendar schemas
+class CalendarScheduleItem(BaseModel):
+    meeting_id: int
+    start_time: datetime
+    end_time: datetime
+    attendees: Optional[List[Dict[str, str]]] = None
+
+class CalendarEventBulkUpdate(BaseModel):
+    meeting_id: int
+    summary: Optional[str] = None
+    description: Optional[str] = None
+    start_time: Optional[datetime] = None
+    end_time: Optional[datetime] = None
+    attendees: Optional[List[Dict[str, str]]] = None
+
+class CalendarBatchResult(BaseModel):
+    meeting_id: int
+    event_id: Optional[str] = None
+    calendar_link: Optional[str] = None
+    meet_link: Optional[str] = None
+    error: Optional[str] = None  # Set when this meeting's calendar change failed
+
+# Job schemas
+class Job(BaseModel):
+    id: int
+    meeting_id: int
+    job_type: str
+    status: str
+    progress: float
+    result: Optional[Any] = None
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    @field_validator("result", mode="before")
+    @classmethod
+    def parse_result(cls, value):
+        # Results are stored as JSON strings in the database
+        if isinstance(value, str):
+            return json.loads(value)
+        return value
+
+    class Config:
+        from_attributes = True
+# Search schemas
+class SearchResult(BaseModel):
+    kind: str  # "transcript", "summary", "action_item" or "decision"
+    item_id: int
+    meeting_id: int
+    meeting_title: Optional[str] = None
+    meeting_date: Optional[datetime] = None
+    title: Optional[str] = None
+    snippet: str
+    score: float
+    # For passages of a diarized transcript: who spoke and when, in seconds
+    speaker: Optional[str] = None
+    start_time: Optional[float] = None
+    end_time: Optional[float] = None
+
+class SemanticSearchResult(BaseModel):
+    kind: str  # "transcript", "summary" or "decision"
+    item_id: int
+    meeting_id: int
+    meeting_title: Optional[str] = None
+    meeting_date: Optional[datetime] = None
+    text: str
+    score: float  # Cosine similarity, -1 to 1
+    # For passages of a diarized transcript: who spoke and when, in seconds
+    speaker: Optional[str] = None
+    start_time: Optional[float] = None
+    end_time: Optional[float] = None
+
+class RelatedMeeting(BaseModel):
+    meeting_id: int
+    title: str
+    date: Optional[datetime] = None
+    status: Optional[str] = None
+    score: float
@@ -1,18 +1,101 @@
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
+from app.core.database import upsert_insert
 from app.models.models import ActionItem
-from app.schemas.schemas import ActionItemCreate, ActionItemUpdate
+from app.schemas.schemas import ActionItemCreate, ActionItemUpdate, ActionItemBulkUpdate
+from app.services.search_service import SearchService
+from app.services.text_utils import normalize_title
 from fastapi import HTTPException
+from typing import List, Optional
 
 class ActionItemService:
+    @staticmethod
+    def _flush_titles(db: Session):
+        """Flush pending changes; a title already used in the same meeting is a 409"""
+        try:
+            db.flush()
+        except IntegrityError as e:
+            if "normalized_title" not in str(e.orig):
+                raise
+            db.rollback()
+            raise HTTPException(status_code=409, detail="An action item with this title already exists for this meeting")
+    
     @staticmethod
     def create_action_item(db: Session, action_item: ActionItemCreate) -> ActionItem:
         """Create a new action item"""
-        db_action_item = ActionItem(**action_item.dict())
+        db_action_item = ActionItem(**action_item.dict(), normalized_title=normalize_title(action_item.title))
         db.add(db_action_item)
+        ActionItemService._flush_titles(db)
+        SearchService.index_action_items(db, [db_action_item])
         db.commit()
         db.refresh(db_action_item)
         return db_action_item
     
+    @staticmethod
+    def bulk_upsert_action_items(db: Session, action_items: List[ActionItemCreate]) -> List[ActionItem]:
+        """
+        Create or update many action items in one transaction. An action item whose
+        normalized title already exists for the same meeting is updated in
+        place instead of inserted again, so re-running extraction is idempotent.
+        One INSERT ... ON CONFLICT on the unique (meeting_id, normalized_title)
+        index, so concurrent runs can't insert the same item twice.
+        """
+        if not action_items:
+            return []
+        
+        # A key repeated in the batch keeps its first position and its last values
+        values = {}
+        for item in action_items:
+            row = item.dict()
+            row["normalized_title"] = normalize_title(item.title)
+            values[(row["meeting_id"], row["normalized_title"])] = row
+        
+        statement = upsert_insert(db, ActionItem)
+        updated = {field: statement.excluded[field] for field in ActionItemCreate.model_fields}
+        statement = statement.values(list(values.values())).on_conflict_do_update(
+            index_elements=["meeting_id", "normalized_title"],
+            set_={**updated, "updated_at": func.now()}
+        ).returning(ActionItem.id, ActionItem.meeting_id, ActionItem.normalized_title)
+        ids_by_key = {(meeting_id, title): id for id, meeting_id, title in db.execute(statement)}
+        ids = [ids_by_key[key] for key in values]
+        
+        SearchService.index_action_items(db, db.query(ActionItem).populate_existing().filter(ActionItem.id.in_(ids)).all())
+        db.commit()
+        
+        # Reload server-side defaults for all rows in one query instead of one refresh each
+        rows = {row.id: row for row in db.query(ActionItem).filter(ActionItem.id.in_(ids)).all()}
+        return [rows[id] for id in ids]
+    
+    @staticmethod
+    def bulk_update_action_items(db: Session, updates: List[ActionItemBulkUpdate]) -> List[ActionItem]:
+        """Update many action items in one transaction; fails without changes if any ID is missing"""
+        ids = [update.id for update in updates]
+        rows = {row.id: row for row in db.query(ActionItem).filter(ActionItem.id.in_(ids)).all()}
+        missing = [id for id in ids if id not in rows]
+        if missing:
+            raise HTTPException(status_code=404, detail=f"Action items not found: {missing}")
+        
+        for update in updates:
+            db_action_item = rows[update.id]
+            for field, value in update.dict(exclude_unset=True, exclude={"id"}).items():
+                setattr(db_action_item, field, value)
+            db_action_item.normalized_title = normalize_title(db_action_item.title)
+        
+        ActionItemService._flush_titles(db)
+        SearchService.index_action_items(db, rows.values())
+        db.commit()
+        rows = {row.id: row for row in db.query(ActionItem).filter(ActionItem.id.in_(ids)).all()}
+        return [rows[id] for id in ids]
+    
+    @staticmethod
+    def bulk_delete_action_items(db: Session, ids: List[int]) -> int:
+        """Delete many action items in one statement; returns how many were deleted"""
+        deleted = db.query(ActionItem).filter(ActionItem.id.in_(ids)).delete(synchronize_session=False)
+        SearchService.remove_documents(db, "action_item", ids)
+        db.commit()
+        return deleted
+    
     @staticmethod
     def get_action_item(db: Session, action_item_id: int) -> ActionItem:
         """Get an action item by ID"""
@@ -21,7 +104,23 @@ class ActionItemService:
     @staticmethod
     def get_meeting_action_items(db: Session, meeting_id: int) -> list[ActionItem]:
         """Get all action items for a meeting"""
-        return db.query(ActionItem).filter(ActionItem.meeting_id == meeting_id).all()
+        return db.query(ActionItem).filter(ActionItem.meeting_id == meeting_id).order_by(ActionItem.id).all()
+    
+    @staticmethod
+    def get_action_items(
+        db: Session,
+        meeting_id: Optional[int] = None,
+        skip: int = 0,
+        limit: int = 100,
+        after_id: Optional[int] = None
+    ) -> List[ActionItem]:
+        """Get action items in ID order, optionally for one meeting; after_id continues from a previous page"""
+        query = db.query(ActionItem)
+        if meeting_id is not None:
+            query = query.filter(ActionItem.meeting_id == meeting_id)
+        if after_id is not None:
+            query = query.filter(ActionItem.id > after_id)
+        return query.order_by(ActionItem.id).offset(skip).limit(limit).all()
     
     @staticmethod
     def update_action_item(db: Session, action_item_id: int, action_item: ActionItemUpdate) -> ActionItem:
@@ -32,7 +131,10 @@ class ActionItemService:
         
         for key, value in action_item.dict(exclude_unset=True).items():
             setattr(db_action_item, key, value)
+        db_action_item.normalized_title = normalize_title(db_action_item.title)
         
+        ActionItemService._flush_titles(db)
+        SearchService.index_action_items(db, [db_action_item])
         db.commit()
         db.refresh(db_action_item)
         return db_action_item
@@ -44,6 +146,7 @@ class ActionItemService:
         if not db_action_item:
             raise HTTPException(status_code=404, detail="Action item not found")
         
+        SearchService.remove_documents(db, "action_item", [db_action_item.id])
         db.delete(db_action_item)
         db.commit()
         return True 
\ No newline at end of file
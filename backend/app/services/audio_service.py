@@ -0,0 +1,228 @@
+from fastapi import UploadFile, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from app.core.config import settings
+from app.services.cache_service import file_sha256
+from app.services.segmentation import SAMPLE_RATE
+from typing import Optional, Dict, Any, Iterator
+import numpy as np
+import aiofiles
+import glob
+import hashlib
+import json
+import os
+import subprocess
+import tempfile
+import wave
+
+UPLOAD_BLOCK_SIZE = 1024 * 1024
+# Decoded audio is cached next to the upload as <prefix><checksum>.npy
+PCM_CACHE_PREFIX = "pcm-16k-"
+
+class AudioService:
+    @staticmethod
+    async def save_upload(file: UploadFile, meeting_dir: str) -> Dict[str, Any]:
+        """
+        Stream an uploaded audio file to disk in fixed-size blocks, hashing it on
+        the way. The upload is never held in memory as a whole, and uploads larger
+        than MAX_UPLOAD_BYTES are rejected with a 413, and files that aren't
+        decodable audio with a 415 or 422, without touching any file already
+        stored for the meeting.
+        """
+        os.makedirs(meeting_dir, exist_ok=True)
+        filename = os.path.basename(file.filename or "audio")
+        file_path = f"{meeting_dir}/{filename}"
+        partial_path = f"{file_path}.part"
+
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            async with aiofiles.open(partial_path, "wb") as buffer:
+                while True:
+                    block = await file.read(UPLOAD_BLOCK_SIZE)
+                    if not block:
+                        break
+                    size += len(block)
+                    if size > settings.MAX_UPLOAD_BYTES:
+                        raise HTTPException(
+                            status_code=413,
+                            detail=f"Audio file exceeds the {settings.MAX_UPLOAD_BYTES} byte upload limit"
+                        )
+                    digest.update(block)
+                    await buffer.write(block)
+            duration = await run_in_threadpool(AudioService.validate_audio, partial_path)
+            os.replace(partial_path, file_path)
+        finally:
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+
+        return {
+            "file_path": file_path,
+            "checksum": digest.hexdigest(),
+            "size": size,
+            "duration": duration
+        }
+
+    @staticmethod
+    def validate_audio(file_path: str) -> Optional[float]:
+        """
+        Check from its headers that a file holds audio we can decode, and
+        return its duration in seconds (None if it can't be determined).
+        Files without an audio stream are rejected with a 415, truncated or
+        empty ones with a 422, before any decoding or model work.
+        """
+        try:
+            with wave.open(file_path, "rb") as wav:
+                frames = wav.getnframes()
+                frame_bytes = wav.getsampwidth() * wav.getnchannels()
+                rate = wav.getframerate()
+        except (wave.Error, EOFError, OSError):
+            pass
+        else:
+            if frames == 0:
+                raise HTTPException(status_code=422, detail="Audio file contains no samples")
+            if os.path.getsize(file_path) < frames * frame_bytes:
+                raise HTTPException(status_code=422, detail="Audio file is truncated")
+            return frames / float(rate)
+
+        try:
+            result = subprocess.run(
+                [
+                    "ffprobe", "-v", "error", "-select_streams", "a",
+                    "-show_entries", "stream=codec_name:format=duration", "-of", "json", file_path
+                ],
+                capture_output=True,
+                text=True,
+                timeout=30
+            )
+        except (OSError, subprocess.SubprocessError) as e:
+            # Can't check here; decoding reports the problem if there is one
+            print(f"Error probing audio file: {str(e)}")
+            return None
+
+        if result.returncode != 0:
+            raise HTTPException(
+                status_code=415,
+                detail=f"Unsupported or corrupt audio file: {_last_line(result.stderr, file_path)}"
+            )
+        try:
+            info = json.loads(result.stdout or "{}")
+        except ValueError:
+            info = {}
+        if not info.get("streams"):
+            raise HTTPException(status_code=415, detail="File has no audio stream")
+        try:
+            duration = float(info.get("format", {})["duration"])
+        except (KeyError, TypeError, ValueError):
+            return None
+        if duration <= 0:
+            raise HTTPException(status_code=422, detail="Audio file contains no samples")
+        return duration
+
+    @staticmethod
+    def iter_pcm(file_path: str, chunk_seconds: Optional[float] = None) -> Iterator[np.ndarray]:
+        """
+        Decode a recording to 16 kHz mono float32 through an ffmpeg subprocess,
+        yielding chunk_seconds (default AUDIO_DECODE_CHUNK_SECONDS) of samples
+        at a time, so the decoded audio is never held in memory as a whole.
+        Samples match whisper.load_audio.
+        """
+        chunk_bytes = 2 * int(SAMPLE_RATE * (chunk_seconds or settings.AUDIO_DECODE_CHUNK_SECONDS))
+        errors = tempfile.TemporaryFile()
+        try:
+            process = subprocess.Popen(
+                [
+                    "ffmpeg", "-nostdin", "-v", "error", "-threads", "0", "-i", file_path,
+                    "-f", "s16le", "-ac", "1", "-acodec", "pcm_s16le", "-ar", str(SAMPLE_RATE), "-"
+                ],
+                stdout=subprocess.PIPE,
+                # A file, not a pipe: nobody reads stderr until ffmpeg exits
+                stderr=errors
+            )
+        except OSError as e:
+            errors.close()
+            raise HTTPException(status_code=500, detail=f"Error starting ffmpeg to decode audio: {str(e)}")
+
+        try:
+            while True:
+                block = process.stdout.read(chunk_bytes)
+                if not block:
+                    break
+                yield np.frombuffer(block, np.int16, len(block) // 2).astype(np.float32) / 32768.0
+            if process.wait() != 0:
+                errors.seek(0)
+                raise HTTPException(
+                    status_code=422,
+                    detail=f"Could not decode audio: {_last_line(errors.read().decode(errors='replace'), file_path)}"
+                )
+        finally:
+            # Also reached when the caller stops early
+            process.stdout.close()
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+            errors.close()
+
+    @staticmethod
+    def pcm_cache_path(file_path: str, checksum: Optional[str] = None) -> str:
+        """Where the decoded samples of an audio file are cached: next to it, named by its content"""
+        if checksum is None:
+            checksum = file_sha256(file_path)
+        return os.path.join(os.path.dirname(file_path) or ".", f"{PCM_CACHE_PREFIX}{checksum[:16]}.npy")
+
+    @staticmethod
+    def load_pcm(file_path: str, checksum: Optional[str] = None) -> np.ndarray:
+        """
+        The 16 kHz mono samples of a recording as a memory-mapped float32
+        array. The first call decodes the file into a .npy cache beside it;
+        later calls (retranscription, VAD, diarization) map that file, so
+        the OS pages samples in as they are read instead of decoding again.
+        """
+        path = AudioService.pcm_cache_path(file_path, checksum)
+        if not os.path.exists(path):
+            AudioService._write_pcm_cache(file_path, path)
+        # Copy-on-write: callers may scribble on the samples, the cache stays as decoded
+        return np.load(path, mmap_mode="c")
+
+    @staticmethod
+    def _write_pcm_cache(file_path: str, path: str):
+        """Stream decoded chunks into a .npy file, then fill in its length"""
+        fd, partial_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".pcm-", suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                header = {"descr": np.lib.format.dtype_to_descr(np.dtype(np.float32)), "fortran_order": False}
+                np.lib.format.write_array_header_1_0(f, dict(header, shape=(0,)))
+                data_offset = f.tell()
+                count = 0
+                for chunk in AudioService.iter_pcm(file_path):
+                    f.write(chunk.tobytes())
+                    count += len(chunk)
+                if count == 0:
+                    raise HTTPException(status_code=422, detail="Audio file contains no samples")
+                # numpy pads the header so the length can be rewritten in place
+                f.seek(0)
+                np.lib.format.write_array_header_1_0(f, dict(header, shape=(count,)))
+                if f.tell() != data_offset:
+                    raise ValueError("Decoded audio header changed size")
+            os.replace(partial_path, path)
+        finally:
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+
+    @staticmethod
+    def remove_pcm_cache(directory: str, keep: Optional[str] = None) -> int:
+        """Delete the decoded audio cached in a directory, except that of checksum keep"""
+        removed = 0
+        for path in glob.glob(os.path.join(directory, f"{PCM_CACHE_PREFIX}*.npy")):
+            if keep and os.path.basename(path) == f"{PCM_CACHE_PREFIX}{keep[:16]}.npy":
+                continue
+            try:
+                os.remove(path)
+                removed += 1
+            except OSError:
+                pass
+        return removed
+
+def _last_line(message: str, file_path: str) -> str:
+    """The last line of an ffmpeg error, without the local path it names"""
+    lines = [line.strip() for line in (message or "").splitlines() if line.strip()]
+    return lines[-1].replace(f"{file_path}: ", "") if lines else "unknown error"
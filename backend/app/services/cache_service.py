@@ -0,0 +1,175 @@
+from app.core.config import settings
+from typing import Optional, Dict, Any
+import hashlib
+import json
+import os
+import threading
+
+HASH_BLOCK_SIZE = 1024 * 1024
+
+def text_sha256(text: str) -> str:
+    """Content hash of a transcript or other text"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+def file_sha256(file_path: str) -> str:
+    """Content hash of a file, read in blocks so large audio never sits in memory"""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+class ResultCache:
+    """
+    Persistent, content-addressed cache for inference results.
+
+    Entries are JSON files under RESULT_CACHE_DIR/<namespace>/, keyed by a hash
+    of the input content, the model name and the generation parameters. Reads
+    touch the file's mtime, so evicting the oldest mtimes first gives LRU order
+    once the cache grows past RESULT_CACHE_MAX_BYTES.
+    """
+    _lock = threading.Lock()
+    _size = None
+    _stats: Dict[str, Dict[str, int]] = {}
+
+    @staticmethod
+    def make_key(content_hash: str, model: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """Build a cache key from the content hash, model and generation parameters"""
+        key_data = json.dumps(
+            {"content": content_hash, "model": model, "params": params or {}},
+            sort_keys=True
+        )
+        return hashlib.sha256(key_data.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _path(namespace: str, key: str) -> str:
+        return os.path.join(settings.RESULT_CACHE_DIR, namespace, f"{key}.json")
+
+    @staticmethod
+    def _count(namespace: str, outcome: str):
+        stats = ResultCache._stats.setdefault(namespace, {"hits": 0, "misses": 0})
+        stats[outcome] += 1
+
+    @staticmethod
+    def _entries():
+        """Yield (path, size, mtime) for every cached entry"""
+        if not os.path.isdir(settings.RESULT_CACHE_DIR):
+            return
+        for namespace in os.listdir(settings.RESULT_CACHE_DIR):
+            namespace_dir = os.path.join(settings.RESULT_CACHE_DIR, namespace)
+            if not os.path.isdir(namespace_dir):
+                continue
+            for name in os.listdir(namespace_dir):
+                path = os.path.join(namespace_dir, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                yield path, stat.st_size, stat.st_mtime
+
+    @staticmethod
+    def _current_size() -> int:
+        if ResultCache._size is None:
+            ResultCache._size = sum(size for _, size, _ in ResultCache._entries())
+        return ResultCache._size
+
+    @staticmethod
+    def get(namespace: str, key: str) -> Optional[Any]:
+        """Return the cached value, or None on a miss"""
+        if not settings.RESULT_CACHE_ENABLED:
+            return None
+
+        path = ResultCache._path(namespace, key)
+        with ResultCache._lock:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    value = json.load(f)
+                os.utime(path)  # Mark as recently used
+            except (OSError, ValueError):
+                ResultCache._count(namespace, "misses")
+                return None
+            ResultCache._count(namespace, "hits")
+            return value
+
+    @staticmethod
+    def set(namespace: str, key: str, value: Any):
+        """Store a value, evicting least recently used entries if over budget"""
+        if not settings.RESULT_CACHE_ENABLED:
+            return
+
+        path = ResultCache._path(namespace, key)
+        data = json.dumps(value, default=str).encode("utf-8")
+        with ResultCache._lock:
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                size = ResultCache._current_size()
+                if os.path.exists(path):
+                    size -= os.path.getsize(path)
+
+                # Write to a temp file and rename so readers never see a partial entry
+                temp_path = f"{path}.{threading.get_ident()}.tmp"
+                with open(temp_path, "wb") as f:
+                    f.write(data)
+                os.replace(temp_path, path)
+                ResultCache._size = size + len(data)
+            except OSError as e:
+                print(f"Error writing result cache entry: {str(e)}")
+                return
+
+            if ResultCache._size > settings.RESULT_CACHE_MAX_BYTES:
+                ResultCache._evict()
+
+    @staticmethod
+    def _evict():
+        """Delete least recently used entries until the cache fits its budget"""
+        entries = sorted(ResultCache._entries(), key=lambda entry: entry[2])
+        size = sum(entry_size for _, entry_size, _ in entries)
+        for path, entry_size, _ in entries:
+            if size <= settings.RESULT_CACHE_MAX_BYTES:
+                break
+            try:
+                os.remove(path)
+                size -= entry_size
+            except OSError:
+                pass
+        ResultCache._size = size
+
+    @staticmethod
+    def invalidate(namespace: Optional[str] = None, key: Optional[str] = None) -> int:
+        """
+        Remove cached entries: one key, a whole namespace, or everything.
+        Returns the number of entries removed.
+        """
+        removed = 0
+        with ResultCache._lock:
+            if namespace and key:
+                paths = [ResultCache._path(namespace, key)]
+            else:
+                namespace_dir = os.path.join(settings.RESULT_CACHE_DIR, namespace) if namespace else None
+                paths = [
+                    path for path, _, _ in ResultCache._entries()
+                    if (namespace_dir is None or os.path.dirname(path) == namespace_dir)
+                    and (key is None or os.path.basename(path) == f"{key}.json")
+                ]
+            for path in paths:
+                try:
+                    os.remove(path)
+                    removed += 1
+                except OSError:
+                    pass
+            ResultCache._size = None
+        return removed
+
+    @staticmethod
+    def get_stats() -> Dict[str, Any]:
+        """Hit/miss counters since startup plus current on-disk usage"""
+        with ResultCache._lock:
+            entries = list(ResultCache._entries())
+            ResultCache._size = sum(size for _, size, _ in entries)
+            return {
+                "enabled": settings.RESULT_CACHE_ENABLED,
+                "entries": len(entries),
+                "size_bytes": ResultCache._size,
+                "max_bytes": settings.RESULT_CACHE_MAX_BYTES,
+                "namespaces": {name: dict(stats) for name, stats in ResultCache._stats.items()}
+            }
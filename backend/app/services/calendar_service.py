@@ -4,93 +4,290 @@ from datetime import datetime as dt  # Add specific datetime import
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
+from google_auth_httplib2 import AuthorizedHttp
 from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
+from googleapiclient.http import BatchHttpRequest, HttpRequest
 from fastapi import HTTPException
+from sqlalchemy.orm import Session
 from app.core.config import settings
+from app.core.database import SessionLocal, run_write
+from app.models.models import CalendarEvent, CalendarSyncState
+import httplib2
 import json
 import pickle
-from typing import List, Dict, Any, Optional
+import threading
+from typing import List, Dict, Any, Optional, Tuple
+
+CALENDAR_ID = 'primary'
 
 class CalendarService:
+    """
+    Google Calendar client.
+
+    The API client and credentials are built once per process and shared:
+    the token is read from token.pickle only on first use, written back only
+    when it changes, and refreshed on a background timer shortly before it
+    expires so requests don't pay for the refresh. Each thread gets its own
+    keep-alive HTTP connection, since httplib2 connections aren't thread-safe.
+    """
     SCOPES = ['https://www.googleapis.com/auth/calendar']
     TOKEN_FILE = 'token.pickle'
     CREDENTIALS_FILE = 'credentials.json'
 
+    _credentials: Optional[Credentials] = None
+    _service = None
+    _events = None
+    _events_service = None
+    _refresh_timer: Optional[threading.Timer] = None
+    _sync_lock = threading.Lock()
+    _sync_running = False
+    _lock = threading.RLock()
+    _local = threading.local()
+
     @staticmethod
-    def _get_credentials() -> Credentials:
-        """Get or refresh Google Calendar credentials"""
-        creds = None
-        
-        # Look for credentials in multiple locations
+    def _find_credentials_file() -> Optional[str]:
+        """Look for credentials.json in the usual locations"""
         credentials_paths = [
             CalendarService.CREDENTIALS_FILE,
             os.path.join(os.getcwd(), CalendarService.CREDENTIALS_FILE),
             os.path.join(os.path.dirname(os.getcwd()), CalendarService.CREDENTIALS_FILE)
         ]
-        
-        credentials_file = None
         for path in credentials_paths:
             if os.path.exists(path):
-                credentials_file = path
-                break
-        
-        # Load token from file if it exists
-        if os.path.exists(CalendarService.TOKEN_FILE):
+                return path
+        return None
+
+    @staticmethod
+    def _load_token() -> Optional[Credentials]:
+        if not os.path.exists(CalendarService.TOKEN_FILE):
+            return None
+        try:
+            with open(CalendarService.TOKEN_FILE, 'rb') as token:
+                return pickle.load(token)
+        except Exception as e:
+            print(f"Error loading credentials: {str(e)}")
+            return None
+
+    @staticmethod
+    def _save_token(creds: Credentials):
+        try:
+            with open(CalendarService.TOKEN_FILE, 'wb') as token:
+                pickle.dump(creds, token)
+        except Exception as e:
+            print(f"Error saving credentials: {str(e)}")
+
+    @staticmethod
+    def _expires_soon(creds: Credentials) -> bool:
+        """Whether the access token is invalid or within the refresh margin of expiring"""
+        if not creds.valid:
+            return True
+        if creds.expiry is None:
+            return False
+        margin = datetime.timedelta(seconds=settings.CALENDAR_TOKEN_REFRESH_MARGIN)
+        return creds.expiry - dt.utcnow() <= margin
+
+    @staticmethod
+    def _get_credentials() -> Credentials:
+        """Get or refresh Google Calendar credentials"""
+        with CalendarService._lock:
+            creds = CalendarService._credentials
+            if creds is None:
+                creds = CalendarService._load_token()
+
+            # If credentials don't exist or are about to expire, get new ones
+            if not creds or CalendarService._expires_soon(creds):
+                if creds and creds.refresh_token:
+                    try:
+                        creds.refresh(Request())
+                    except Exception as e:
+                        print(f"Error refreshing credentials: {str(e)}")
+                else:
+                    credentials_file = CalendarService._find_credentials_file()
+                    if not credentials_file:
+                        raise HTTPException(
+                            status_code=500,
+                            detail="Google Calendar credentials not found. Please place your desktop app credentials.json in the backend directory"
+                        )
+
+                    try:
+                        flow = InstalledAppFlow.from_client_secrets_file(
+                            credentials_file,
+                            CalendarService.SCOPES
+                        )
+                        creds = flow.run_local_server(port=0)
+                    except Exception as e:
+                        print(f"Error creating credentials flow: {str(e)}")
+                        raise HTTPException(
+                            status_code=500,
+                            detail=f"Error creating credentials flow: {str(e)}"
+                        )
+
+                # Save credentials for future use
+                CalendarService._save_token(creds)
+
+            if creds is not CalendarService._credentials:
+                CalendarService._credentials = creds
+                CalendarService._service = None
+            CalendarService._schedule_refresh(creds)
+            return creds
+
+    @staticmethod
+    def _schedule_refresh(creds: Credentials):
+        """Refresh the token on a daemon timer shortly before it expires"""
+        if CalendarService._refresh_timer is not None and CalendarService._refresh_timer.is_alive():
+            return
+        if creds.expiry is None or not creds.refresh_token:
+            return
+        margin = datetime.timedelta(seconds=settings.CALENDAR_TOKEN_REFRESH_MARGIN)
+        delay = max((creds.expiry - margin - dt.utcnow()).total_seconds(), 0)
+        timer = threading.Timer(delay, CalendarService._background_refresh)
+        timer.daemon = True
+        timer.start()
+        CalendarService._refresh_timer = timer
+
+    @staticmethod
+    def _background_refresh():
+        with CalendarService._lock:
+            CalendarService._refresh_timer = None
+            creds = CalendarService._credentials
+            if creds is None:
+                return
             try:
-                with open(CalendarService.TOKEN_FILE, 'rb') as token:
-                    creds = pickle.load(token)
+                creds.refresh(Request())
             except Exception as e:
-                print(f"Error loading credentials: {str(e)}")
-        
-        # If credentials don't exist or are invalid, get new ones
-        if not creds or not creds.valid:
-            if creds and creds.expired and creds.refresh_token:
-                try:
-                    creds.refresh(Request())
-                except Exception as e:
-                    print(f"Error refreshing credentials: {str(e)}")
-            else:
-                if not credentials_file:
-                    raise HTTPException(
-                        status_code=500,
-                        detail="Google Calendar credentials not found. Please place your desktop app credentials.json in the backend directory"
-                    )
-                
-                try:
-                    flow = InstalledAppFlow.from_client_secrets_file(
-                        credentials_file,
-                        CalendarService.SCOPES
-                    )
-                    creds = flow.run_local_server(port=0)
-                except Exception as e:
-                    print(f"Error creating credentials flow: {str(e)}")
-                    raise HTTPException(
-                        status_code=500,
-                        detail=f"Error creating credentials flow: {str(e)}"
-                    )
-            
-            # Save credentials for future use
+                # The next request will retry the refresh itself
+                print(f"Error refreshing credentials: {str(e)}")
+                return
+            CalendarService._save_token(creds)
+            CalendarService._schedule_refresh(creds)
+
+    @staticmethod
+    def _get_calendar_service():
+        """Get the shared Google Calendar service instance"""
+        creds = CalendarService._get_credentials()
+        with CalendarService._lock:
+            if CalendarService._service is not None:
+                return CalendarService._service
             try:
-                with open(CalendarService.TOKEN_FILE, 'wb') as token:
-                    pickle.dump(creds, token)
+                client_options = {"api_endpoint": settings.CALENDAR_API_ENDPOINT} if settings.CALENDAR_API_ENDPOINT else None
+                # Built from the discovery document bundled with the client
+                # library, so there is nothing to fetch or cache on disk
+                CalendarService._service = build(
+                    'calendar', 'v3',
+                    credentials=creds,
+                    cache_discovery=False,
+                    static_discovery=True,
+                    client_options=client_options
+                )
+                return CalendarService._service
             except Exception as e:
-                print(f"Error saving credentials: {str(e)}")
-        
-        return creds
+                print(f"Error creating calendar service: {str(e)}")
+                raise HTTPException(
+                    status_code=500,
+                    detail=f"Error creating calendar service: {str(e)}"
+                )
 
     @staticmethod
-    def _get_calendar_service():
-        """Get Google Calendar service instance"""
-        try:
-            creds = CalendarService._get_credentials()
-            service = build('calendar', 'v3', credentials=creds)
-            return service
-        except Exception as e:
-            print(f"Error creating calendar service: {str(e)}")
-            raise HTTPException(
-                status_code=500,
-                detail=f"Error creating calendar service: {str(e)}"
-            )
+    def _event_resource():
+        """The shared events() collection; building one renders docs for every method, so it is built once"""
+        service = CalendarService._get_calendar_service()
+        with CalendarService._lock:
+            if CalendarService._events is None or CalendarService._events_service is not service:
+                CalendarService._events = service.events()
+                CalendarService._events_service = service
+            return CalendarService._events
+
+    @staticmethod
+    def _http() -> AuthorizedHttp:
+        """This thread's authorized HTTP connection, kept alive between requests"""
+        creds = CalendarService._credentials
+        http = getattr(CalendarService._local, "http", None)
+        if http is None or http.credentials is not creds:
+            http = AuthorizedHttp(creds, http=httplib2.Http(timeout=settings.CALENDAR_HTTP_TIMEOUT))
+            CalendarService._local.http = http
+        return http
+
+    @staticmethod
+    def _execute(request) -> Any:
+        """Run an API request on this thread's connection"""
+        return request.execute(http=CalendarService._http())
+
+    @staticmethod
+    def reset():
+        """Drop the cached client and credentials, e.g. after replacing token.pickle"""
+        with CalendarService._lock:
+            if CalendarService._refresh_timer is not None:
+                CalendarService._refresh_timer.cancel()
+                CalendarService._refresh_timer = None
+            CalendarService._credentials = None
+            CalendarService._service = None
+            CalendarService._events = None
+
+    @staticmethod
+    def _event_body(
+        summary: Optional[str] = None,
+        description: Optional[str] = None,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        attendees: Optional[List[Dict[str, str]]] = None,
+        location: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Event resource with the given fields; unset fields are left out, so it also serves as a patch"""
+        event = {}
+        if summary:
+            event['summary'] = summary
+        if description:
+            event['description'] = description
+        if start_time:
+            event['start'] = {'dateTime': start_time.isoformat(), 'timeZone': 'UTC'}
+        if end_time:
+            event['end'] = {'dateTime': end_time.isoformat(), 'timeZone': 'UTC'}
+        if attendees:
+            event['attendees'] = [
+                {'email': attendee['email']} for attendee in attendees
+            ]
+        if location:
+            event['location'] = location
+        return event
+
+    @staticmethod
+    def _new_event_body(**fields) -> Dict[str, Any]:
+        event = CalendarService._event_body(**fields)
+        event['reminders'] = {
+            'useDefault': False,
+            'overrides': [
+                {'method': 'email', 'minutes': 24 * 60},
+                {'method': 'popup', 'minutes': 30},
+            ],
+        }
+        return event
+
+    @staticmethod
+    def _event_result(event: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            'event_id': event['id'],
+            'html_link': event['htmlLink'],
+            'meet_link': event.get('hangoutLink'),
+            'start_time': event['start'].get('dateTime', event['start'].get('date')),
+            'end_time': event['end'].get('dateTime', event['end'].get('date'))
+        }
+
+    @staticmethod
+    def _format_event(event: Dict[str, Any]) -> Dict[str, Any]:
+        """An event as listed by /calendar/upcoming"""
+        return {
+            'id': event['id'],
+            'summary': event.get('summary', ''),
+            'description': event.get('description', ''),
+            'start_time': event['start'].get('dateTime', event['start'].get('date')),
+            'end_time': event['end'].get('dateTime', event['end'].get('date')),
+            'html_link': event.get('htmlLink'),
+            'meet_link': event.get('hangoutLink'),
+            'attendees': [
+                attendee['email'] for attendee in event.get('attendees', [])
+            ]
+        }
 
     @staticmethod
     def create_meeting_event(
@@ -103,53 +300,23 @@ class CalendarService:
     ) -> Dict[str, Any]:
         """Create a calendar event for a meeting"""
         try:
-            service = CalendarService._get_calendar_service()
+            resource = CalendarService._event_resource()
             
-            # Prepare event details
-            event = {
-                'summary': summary,
-                'description': description,
-                'start': {
-                    'dateTime': start_time.isoformat(),
-                    'timeZone': 'UTC',
-                },
-                'end': {
-                    'dateTime': end_time.isoformat(),
-                    'timeZone': 'UTC',
-                },
-                'reminders': {
-                    'useDefault': False,
-                    'overrides': [
-                        {'method': 'email', 'minutes': 24 * 60},
-                        {'method': 'popup', 'minutes': 30},
-                    ],
-                },
-            }
-            
-            # Add attendees if provided
-            if attendees:
-                event['attendees'] = [
-                    {'email': attendee['email']} for attendee in attendees
-                ]
-            
-            # Add location if provided
-            if location:
-                event['location'] = location
-            
-            # Create the event
-            event = service.events().insert(
+            event = CalendarService._execute(resource.insert(
                 calendarId='primary',
-                body=event,
+                body=CalendarService._new_event_body(
+                    summary=summary,
+                    description=description,
+                    start_time=start_time,
+                    end_time=end_time,
+                    attendees=attendees,
+                    location=location
+                ),
                 sendUpdates='all'
-            ).execute()
+            ))
             
-            return {
-                'event_id': event['id'],
-                'html_link': event['htmlLink'],
-                'meet_link': event.get('hangoutLink'),
-                'start_time': event['start']['dateTime'],
-                'end_time': event['end']['dateTime']
-            }
+            CalendarService._store_events([event])
+            return CalendarService._event_result(event)
             
         except Exception as e:
             raise HTTPException(
@@ -159,44 +326,23 @@ class CalendarService:
 
     @staticmethod
     def get_upcoming_meetings(max_results: int = 10) -> List[Dict[str, Any]]:
-        """Get upcoming calendar events"""
+        """Get upcoming calendar events straight from Google"""
         try:
-            service = CalendarService._get_calendar_service()
+            resource = CalendarService._event_resource()
             
             # Get current time in UTC
             now = dt.utcnow().isoformat() + 'Z'  # Use dt instead of datetime.utcnow
             
             # Get events
-            events_result = service.events().list(
+            events_result = CalendarService._execute(resource.list(
                 calendarId='primary',
                 timeMin=now,
                 maxResults=max_results,
                 singleEvents=True,
                 orderBy='startTime'
-            ).execute()
-            
-            events = events_result.get('items', [])
+            ))
             
-            # Format events
-            formatted_events = []
-            for event in events:
-                start = event['start'].get('dateTime', event['start'].get('date'))
-                end = event['end'].get('dateTime', event['end'].get('date'))
-                
-                formatted_events.append({
-                    'id': event['id'],
-                    'summary': event['summary'],
-                    'description': event.get('description', ''),
-                    'start_time': start,
-                    'end_time': end,
-                    'html_link': event['htmlLink'],
-                    'meet_link': event.get('hangoutLink'),
-                    'attendees': [
-                        attendee['email'] for attendee in event.get('attendees', [])
-                    ]
-                })
-            
-            return formatted_events
+            return [CalendarService._format_event(event) for event in events_result.get('items', [])]
             
         except Exception as e:
             print(f"Error retrieving calendar events: {str(e)}")  # Add debug print
@@ -216,43 +362,24 @@ class CalendarService:
     ) -> Dict[str, Any]:
         """Update an existing calendar event"""
         try:
-            service = CalendarService._get_calendar_service()
-            
-            # Get existing event
-            event = service.events().get(
-                calendarId='primary',
-                eventId=event_id
-            ).execute()
-            
-            # Update fields if provided
-            if summary:
-                event['summary'] = summary
-            if description:
-                event['description'] = description
-            if start_time:
-                event['start']['dateTime'] = start_time.isoformat()
-            if end_time:
-                event['end']['dateTime'] = end_time.isoformat()
-            if attendees:
-                event['attendees'] = [
-                    {'email': attendee['email']} for attendee in attendees
-                ]
+            resource = CalendarService._event_resource()
             
-            # Update the event
-            updated_event = service.events().update(
+            # A patch changes only the given fields, without reading the event first
+            updated_event = CalendarService._execute(resource.patch(
                 calendarId='primary',
                 eventId=event_id,
-                body=event,
+                body=CalendarService._event_body(
+                    summary=summary,
+                    description=description,
+                    start_time=start_time,
+                    end_time=end_time,
+                    attendees=attendees
+                ),
                 sendUpdates='all'
-            ).execute()
+            ))
             
-            return {
-                'event_id': updated_event['id'],
-                'html_link': updated_event['htmlLink'],
-                'meet_link': updated_event.get('hangoutLink'),
-                'start_time': updated_event['start']['dateTime'],
-                'end_time': updated_event['end']['dateTime']
-            }
+            CalendarService._store_events([updated_event])
+            return CalendarService._event_result(updated_event)
             
         except Exception as e:
             raise HTTPException(
@@ -264,18 +391,295 @@ class CalendarService:
     def delete_meeting_event(event_id: str) -> bool:
         """Delete a calendar event"""
         try:
-            service = CalendarService._get_calendar_service()
+            resource = CalendarService._event_resource()
             
-            service.events().delete(
+            CalendarService._execute(resource.delete(
                 calendarId='primary',
                 eventId=event_id,
                 sendUpdates='all'
-            ).execute()
+            ))
             
+            CalendarService._store_events([], deleted_ids=[event_id])
             return True
             
         except Exception as e:
             raise HTTPException(
                 status_code=500,
                 detail=f"Error deleting calendar event: {str(e)}"
-            ) 
\ No newline at end of file
+            )
+
+    @staticmethod
+    def _new_batch(callback):
+        if settings.CALENDAR_BATCH_ENDPOINT:
+            return BatchHttpRequest(callback=callback, batch_uri=settings.CALENDAR_BATCH_ENDPOINT)
+        return CalendarService._get_calendar_service().new_batch_http_request(callback=callback)
+
+    @staticmethod
+    def _execute_batch(requests: List[HttpRequest]) -> List[Tuple[Any, Optional[str]]]:
+        """
+        Send API requests through the batch endpoint, CALENDAR_BATCH_SIZE per
+        HTTP round trip. Returns (response, error) per request, in order; one
+        failed request doesn't fail the others.
+        """
+        results: List[Tuple[Any, Optional[str]]] = [(None, "Not sent")] * len(requests)
+
+        def collect(request_id, response, exception):
+            results[int(request_id)] = (response, str(exception) if exception is not None else None)
+
+        batch_size = max(1, min(settings.CALENDAR_BATCH_SIZE, 50))  # The Calendar API allows 50 per batch
+        for start in range(0, len(requests), batch_size):
+            batch = CalendarService._new_batch(collect)
+            for i in range(start, min(start + batch_size, len(requests))):
+                batch.add(requests[i], request_id=str(i))
+            batch.execute(http=CalendarService._http())
+        return results
+
+    @staticmethod
+    def batch_create_events(events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Create many events, each given as create_meeting_event arguments; returns a result or an error per event"""
+        try:
+            resource = CalendarService._event_resource()
+            results = CalendarService._execute_batch([
+                resource.insert(calendarId='primary', body=CalendarService._new_event_body(**event), sendUpdates='all')
+                for event in events
+            ])
+        except Exception as e:
+            raise HTTPException(
+                status_code=500,
+                detail=f"Error creating calendar events: {str(e)}"
+            )
+        CalendarService._store_events([event for event, error in results if error is None])
+        return [
+            CalendarService._event_result(event) if error is None else {'error': error}
+            for event, error in results
+        ]
+
+    @staticmethod
+    def batch_update_events(updates: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Patch many events, each given as update_meeting_event arguments; returns a result or an error per event"""
+        try:
+            resource = CalendarService._event_resource()
+            results = CalendarService._execute_batch([
+                resource.patch(
+                    calendarId='primary',
+                    eventId=update['event_id'],
+                    body=CalendarService._event_body(**{k: v for k, v in update.items() if k != 'event_id'}),
+                    sendUpdates='all'
+                )
+                for update in updates
+            ])
+        except Exception as e:
+            raise HTTPException(
+                status_code=500,
+                detail=f"Error updating calendar events: {str(e)}"
+            )
+        CalendarService._store_events([event for event, error in results if error is None])
+        return [
+            CalendarService._event_result(event) if error is None else {'event_id': update['event_id'], 'error': error}
+            for update, (event, error) in zip(updates, results)
+        ]
+
+    @staticmethod
+    def batch_delete_events(event_ids: List[str]) -> List[Dict[str, Any]]:
+        """Delete many events; returns the event ID and any error per event"""
+        try:
+            resource = CalendarService._event_resource()
+            results = CalendarService._execute_batch([
+                resource.delete(calendarId='primary', eventId=event_id, sendUpdates='all')
+                for event_id in event_ids
+            ])
+        except Exception as e:
+            raise HTTPException(
+                status_code=500,
+                detail=f"Error deleting calendar events: {str(e)}"
+            )
+        CalendarService._store_events([], deleted_ids=[
+            event_id for event_id, (_, error) in zip(event_ids, results) if error is None
+        ])
+        return [
+            {'event_id': event_id, 'error': error}
+            for event_id, (_, error) in zip(event_ids, results)
+        ]
+
+    @staticmethod
+    def _parse_event_time(value: Dict[str, Any]) -> Optional[dt]:
+        """An event's start or end as naive UTC; all-day events start at midnight UTC"""
+        if value.get('dateTime'):
+            parsed = dt.fromisoformat(value['dateTime'].replace('Z', '+00:00'))
+            if parsed.tzinfo is not None:
+                parsed = parsed.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+            return parsed
+        if value.get('date'):
+            return dt.fromisoformat(value['date'])
+        return None
+
+    @staticmethod
+    def _apply_changes(
+        db: Session,
+        events: List[Dict[str, Any]],
+        deleted_ids: List[str] = (),
+        sync_token: Optional[str] = None,
+        full: bool = False
+    ):
+        """
+        Upsert events into the local copy and drop cancelled, deleted and
+        finished ones. With a sync token, record it as where the next
+        incremental sync starts; a full sync replaces the whole copy.
+        """
+        now = dt.utcnow()
+        if full:
+            db.query(CalendarEvent).delete(synchronize_session=False)
+
+        rows, dropped = {}, set(deleted_ids)
+        for event in events:
+            start = CalendarService._parse_event_time(event.get('start', {}))
+            end = CalendarService._parse_event_time(event.get('end', {})) or start
+            if event.get('status') == 'cancelled' or start is None or end <= now:
+                dropped.add(event['id'])
+                rows.pop(event['id'], None)
+            else:
+                dropped.discard(event['id'])
+                rows[event['id']] = {
+                    'start_time': start,
+                    'end_time': end,
+                    'data': json.dumps(CalendarService._format_event(event))
+                }
+
+        if dropped and not full:
+            db.query(CalendarEvent).filter(CalendarEvent.id.in_(list(dropped))).delete(synchronize_session=False)
+        existing = {} if full else {
+            row.id: row
+            for row in db.query(CalendarEvent).filter(CalendarEvent.id.in_(list(rows))).all()
+        }
+        for event_id, values in rows.items():
+            row = existing.get(event_id)
+            if row is None:
+                db.add(CalendarEvent(id=event_id, **values))
+            else:
+                for field, value in values.items():
+                    setattr(row, field, value)
+        db.flush()
+        # Events that have finished since the last sync
+        db.query(CalendarEvent).filter(CalendarEvent.end_time <= now).delete(synchronize_session=False)
+
+        if sync_token is not None:
+            state = db.get(CalendarSyncState, CALENDAR_ID)
+            if state is None:
+                state = CalendarSyncState(calendar_id=CALENDAR_ID)
+                db.add(state)
+            state.sync_token = sync_token
+            state.synced_at = now
+        db.commit()
+
+    @staticmethod
+    def _store_events(events: List[Dict[str, Any]], deleted_ids: List[str] = ()):
+        """Write changes made through this app to the local copy right away, instead of waiting for the next sync"""
+        if not events and not deleted_ids:
+            return
+        db = SessionLocal()
+        try:
+            run_write(db, CalendarService._apply_changes, events, list(deleted_ids))
+        except Exception as e:
+            print(f"Error updating local calendar events: {str(e)}")
+        finally:
+            db.close()
+
+    @staticmethod
+    def _list_changes(sync_token: Optional[str]) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Every event that hasn't ended yet (no sync token) or every change since
+        the sync token, and the next sync token
+        """
+        resource = CalendarService._event_resource()
+        # Past events would only be dropped again; Google accepts timeMin on
+        # the full sync but not alongside a sync token
+        time_min = None if sync_token else dt.utcnow().isoformat() + 'Z'
+        events, page_token = [], None
+        while True:
+            # singleEvents must match the initial full sync
+            params = {'calendarId': CALENDAR_ID, 'singleEvents': True, 'maxResults': 2500}
+            if sync_token:
+                params['syncToken'] = sync_token
+            else:
+                params['timeMin'] = time_min
+            if page_token:
+                params['pageToken'] = page_token
+            response = CalendarService._execute(resource.list(**params))
+            events.extend(response.get('items', []))
+            page_token = response.get('nextPageToken')
+            if not page_token:
+                return events, response.get('nextSyncToken')
+
+    @staticmethod
+    def sync_events(db: Session, full: bool = False) -> int:
+        """
+        Bring the local copy of upcoming events up to date. Only changes since
+        the last sync are fetched, using its sync token; without one, or once
+        Google has expired it (410 Gone), every event is fetched again.
+        Returns the number of events received.
+        """
+        with CalendarService._sync_lock:
+            sync_token = None if full else db.query(CalendarSyncState.sync_token).filter(
+                CalendarSyncState.calendar_id == CALENDAR_ID
+            ).scalar()
+            # Don't hold a read transaction open across the API calls
+            db.rollback()
+            try:
+                events, next_sync_token = CalendarService._list_changes(sync_token)
+            except HttpError as e:
+                if e.resp.status != 410 or not sync_token:
+                    raise
+                sync_token = None
+                events, next_sync_token = CalendarService._list_changes(None)
+            run_write(db, CalendarService._apply_changes, events, [], next_sync_token, not sync_token)
+            return len(events)
+
+    @staticmethod
+    def _background_sync():
+        db = SessionLocal()
+        try:
+            CalendarService.sync_events(db)
+        except Exception as e:
+            print(f"Error syncing calendar events: {str(e)}")
+        finally:
+            db.close()
+            with CalendarService._lock:
+                CalendarService._sync_running = False
+
+    @staticmethod
+    def _sync_in_background():
+        """Start a sync on a daemon thread, unless one is already running"""
+        with CalendarService._lock:
+            if CalendarService._sync_running:
+                return
+            CalendarService._sync_running = True
+        threading.Thread(target=CalendarService._background_sync, name="calendar-sync", daemon=True).start()
+
+    @staticmethod
+    def get_synced_upcoming_meetings(db: Session, max_results: int = 10, refresh: bool = False) -> Dict[str, Any]:
+        """
+        Upcoming events from the local copy. The first call (or refresh=True)
+        syncs before answering; after that, a copy older than
+        CALENDAR_SYNC_INTERVAL is served as is while a background sync
+        catches up, so requests don't wait on Google.
+        """
+        synced_at = db.query(CalendarSyncState.synced_at).filter(CalendarSyncState.calendar_id == CALENDAR_ID).scalar()
+        try:
+            if refresh or synced_at is None:
+                CalendarService.sync_events(db)
+                synced_at = db.query(CalendarSyncState.synced_at).filter(CalendarSyncState.calendar_id == CALENDAR_ID).scalar()
+            elif dt.utcnow() - synced_at > datetime.timedelta(seconds=settings.CALENDAR_SYNC_INTERVAL):
+                CalendarService._sync_in_background()
+        except HTTPException:
+            raise
+        except Exception as e:
+            print(f"Error syncing calendar events: {str(e)}")
+            raise HTTPException(
+                status_code=500,
+                detail=f"Error syncing calendar events: {str(e)}"
+            )
+
+        rows = db.query(CalendarEvent.data).filter(
+            CalendarEvent.end_time > dt.utcnow()
+        ).order_by(CalendarEvent.start_time, CalendarEvent.id).limit(max_results).all()
+        return {"events": [json.loads(row.data) for row in rows], "synced_at": synced_at}
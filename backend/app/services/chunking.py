@@ -0,0 +1,162 @@
+from typing import List, NamedTuple, Tuple
+import bisect
+import re
+
+# A sentence ends at ., ! or ? followed by whitespace or the end of the text
+SENTENCE_END = re.compile(r'[.!?]+(?=\s|$)')
+
+class TextChunk(NamedTuple):
+    text: str
+    start_char: int
+    end_char: int
+    num_tokens: int
+
+class ChunkedText(NamedTuple):
+    chunks: List[TextChunk]
+    num_tokens: int
+
+def chunk_text(tokenizer, text: str, max_tokens: int = 1024, overlap_tokens: int = 0) -> ChunkedText:
+    """
+    Split text into chunks of at most max_tokens tokens, breaking on sentence
+    boundaries where possible.
+
+    The text is tokenized once with an offset mapping; chunk boundaries are then
+    picked by token index, so no chunk needs to be re-encoded. Consecutive
+    chunks share roughly overlap_tokens tokens, starting at a sentence boundary
+    when one falls inside the overlap window. max_tokens should leave room for
+    any special tokens the model adds.
+    """
+    encoding = tokenizer(
+        text,
+        add_special_tokens=False,
+        return_offsets_mapping=True,
+        return_attention_mask=False
+    )
+    offsets = encoding["offset_mapping"]
+    num_tokens = len(offsets)
+    if num_tokens == 0:
+        return ChunkedText([], 0)
+
+    max_tokens = max(1, max_tokens)
+    overlap_tokens = max(0, min(overlap_tokens, max_tokens // 2))
+
+    # Token indices right after the last token of each sentence
+    token_ends = [end for _, end in offsets]
+    boundaries = []
+    for match in SENTENCE_END.finditer(text):
+        index = bisect.bisect_left(token_ends, match.end())
+        if index < num_tokens and (not boundaries or boundaries[-1] != index + 1):
+            boundaries.append(index + 1)
+
+    chunks = []
+    start = 0
+    previous_end = 0
+    while start < num_tokens:
+        end = min(start + max_tokens, num_tokens)
+        if end < num_tokens:
+            # Back off to the last sentence boundary inside the window, as long
+            # as the chunk still gets past the end of the previous one
+            position = bisect.bisect_right(boundaries, end) - 1
+            if position >= 0 and boundaries[position] > max(start, previous_end):
+                end = boundaries[position]
+
+        start_char = offsets[start][0]
+        end_char = offsets[end - 1][1]
+        chunks.append(TextChunk(text[start_char:end_char].strip(), start_char, end_char, end - start))
+
+        if end >= num_tokens:
+            break
+        previous_end = end
+
+        next_start = end
+        if overlap_tokens:
+            next_start = max(end - overlap_tokens, start + 1)
+            # Prefer to start the overlap at a sentence boundary
+            position = bisect.bisect_left(boundaries, next_start)
+            if position < len(boundaries) and boundaries[position] < end:
+                next_start = boundaries[position]
+        start = next_start
+
+    return ChunkedText(chunks, num_tokens)
+
+def chunk_segments(tokenizer, segments: List[str], max_tokens: int = 1024, overlap_tokens: int = 0) -> ChunkedText:
+    """
+    Pack consecutive transcript segments into chunks of at most max_tokens
+    tokens without cutting through a segment, so chunks end where the
+    speaker paused rather than mid-sentence. Character offsets refer to the
+    segments joined with spaces. Consecutive chunks share the whole trailing
+    segments that fit in overlap_tokens. A segment too long for one chunk is
+    split by chunk_text.
+    """
+    lengths = [len(ids) for ids in tokenizer(segments, add_special_tokens=False)["input_ids"]] if segments else []
+    max_tokens = max(1, max_tokens)
+    overlap_tokens = max(0, min(overlap_tokens, max_tokens // 2))
+
+    pieces, position = [], 0
+    for text, length in zip(segments, lengths):
+        if length > max_tokens:
+            for chunk in chunk_text(tokenizer, text, max_tokens).chunks:
+                pieces.append(TextChunk(chunk.text, position + chunk.start_char, position + chunk.end_char, chunk.num_tokens))
+        elif length:
+            pieces.append(TextChunk(text, position, position + len(text), length))
+        position += len(text) + 1
+
+    chunks = []
+    start = 0
+    while start < len(pieces):
+        end, tokens = start, 0
+        while end < len(pieces) and tokens + pieces[end].num_tokens <= max_tokens:
+            tokens += pieces[end].num_tokens
+            end += 1
+        chunks.append(TextChunk(
+            " ".join(piece.text for piece in pieces[start:end]), pieces[start].start_char, pieces[end - 1].end_char, tokens
+        ))
+        if end >= len(pieces):
+            break
+
+        # Step back over whole segments for the overlap, as long as the next
+        # chunk still has room for the segment that didn't fit in this one
+        next_start, overlap = end, 0
+        while (
+            next_start - 1 > start
+            and overlap + pieces[next_start - 1].num_tokens <= overlap_tokens
+            and overlap + pieces[next_start - 1].num_tokens + pieces[end].num_tokens <= max_tokens
+        ):
+            next_start -= 1
+            overlap += pieces[next_start].num_tokens
+        start = next_start
+
+    return ChunkedText(chunks, sum(lengths))
+
+def chunk_turns(tokenizer, turns: List[Tuple[str, str]], max_tokens: int = 1024) -> List[str]:
+    """
+    Pack (speaker, text) turns into chunks of at most max_tokens tokens, one
+    "speaker: text" line per turn. Turns are never split between chunks unless
+    a single turn is too long for one; its pieces (split by chunk_text) then
+    each keep the speaker, so every line in every chunk says who is talking.
+    """
+    lines = [f"{speaker}: {text}" for speaker, text in turns]
+    if not lines:
+        return []
+    # One batched call; +1 per line for the newline joining it to the next
+    lengths = [len(ids) + 1 for ids in tokenizer(lines, add_special_tokens=False)["input_ids"]]
+
+    chunks, current, current_tokens = [], [], 0
+    for (speaker, text), line, length in zip(turns, lines, lengths):
+        if length > max_tokens:
+            prefix_tokens = len(tokenizer(f"{speaker}: ", add_special_tokens=False)["input_ids"])
+            pieces = [
+                (f"{speaker}: {chunk.text}", prefix_tokens + chunk.num_tokens + 1)
+                for chunk in chunk_text(tokenizer, text, max_tokens - prefix_tokens - 1).chunks
+            ]
+        else:
+            pieces = [(line, length)]
+        for piece, piece_tokens in pieces:
+            if current and current_tokens + piece_tokens > max_tokens:
+                chunks.append("\n".join(current))
+                current, current_tokens = [], 0
+            current.append(piece)
+            current_tokens += piece_tokens
+    if current:
+        chunks.append("\n".join(current))
+    return chunks
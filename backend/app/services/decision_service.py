@@ -1,18 +1,101 @@
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
+from app.core.database import upsert_insert
 from app.models.models import Decision
-from app.schemas.schemas import DecisionCreate, DecisionUpdate
+from app.schemas.schemas import DecisionCreate, DecisionUpdate, DecisionBulkUpdate
+from app.services.search_service import SearchService
+from app.services.text_utils import normalize_title
 from fastapi import HTTPException
+from datetime import datetime
+from typing import List, Optional
 
 class DecisionService:
+    @staticmethod
+    def _flush_titles(db: Session):
+        """Flush pending changes; a title already used in the same meeting is a 409"""
+        try:
+            db.flush()
+        except IntegrityError as e:
+            if "normalized_title" not in str(e.orig):
+                raise
+            db.rollback()
+            raise HTTPException(status_code=409, detail="A decision with this title already exists for this meeting")
+    
     @staticmethod
     def create_decision(db: Session, decision: DecisionCreate) -> Decision:
         """Create a new decision"""
-        db_decision = Decision(**decision.dict())
+        db_decision = Decision(**decision.dict(), normalized_title=normalize_title(decision.title))
         db.add(db_decision)
+        DecisionService._flush_titles(db)
+        SearchService.index_decisions(db, [db_decision])
         db.commit()
         db.refresh(db_decision)
         return db_decision
     
+    @staticmethod
+    def bulk_upsert_decisions(db: Session, decisions: List[DecisionCreate]) -> List[Decision]:
+        """
+        Create or update many decisions in one transaction. A decision whose
+        normalized title already exists for the same meeting is updated in
+        place instead of inserted again, so re-running extraction is idempotent.
+        One INSERT ... ON CONFLICT on the unique (meeting_id, normalized_title)
+        index, so concurrent runs can't insert the same item twice.
+        """
+        if not decisions:
+            return []
+        
+        # A key repeated in the batch keeps its first position and its last values
+        values = {}
+        for item in decisions:
+            row = item.dict()
+            row["normalized_title"] = normalize_title(item.title)
+            values[(row["meeting_id"], row["normalized_title"])] = row
+        
+        statement = upsert_insert(db, Decision)
+        updated = {field: statement.excluded[field] for field in DecisionCreate.model_fields}
+        statement = statement.values(list(values.values())).on_conflict_do_update(
+            index_elements=["meeting_id", "normalized_title"],
+            set_={**updated, "updated_at": datetime.utcnow()}
+        ).returning(Decision.id, Decision.meeting_id, Decision.normalized_title)
+        ids_by_key = {(meeting_id, title): id for id, meeting_id, title in db.execute(statement)}
+        ids = [ids_by_key[key] for key in values]
+        
+        SearchService.index_decisions(db, db.query(Decision).populate_existing().filter(Decision.id.in_(ids)).all())
+        db.commit()
+        
+        # Reload server-side defaults for all rows in one query instead of one refresh each
+        rows = {row.id: row for row in db.query(Decision).filter(Decision.id.in_(ids)).all()}
+        return [rows[id] for id in ids]
+    
+    @staticmethod
+    def bulk_update_decisions(db: Session, updates: List[DecisionBulkUpdate]) -> List[Decision]:
+        """Update many decisions in one transaction; fails without changes if any ID is missing"""
+        ids = [update.id for update in updates]
+        rows = {row.id: row for row in db.query(Decision).filter(Decision.id.in_(ids)).all()}
+        missing = [id for id in ids if id not in rows]
+        if missing:
+            raise HTTPException(status_code=404, detail=f"Decisions not found: {missing}")
+        
+        for update in updates:
+            db_decision = rows[update.id]
+            for field, value in update.dict(exclude_unset=True, exclude={"id"}).items():
+                setattr(db_decision, field, value)
+            db_decision.normalized_title = normalize_title(db_decision.title)
+        
+        DecisionService._flush_titles(db)
+        SearchService.index_decisions(db, rows.values())
+        db.commit()
+        rows = {row.id: row for row in db.query(Decision).filter(Decision.id.in_(ids)).all()}
+        return [rows[id] for id in ids]
+    
+    @staticmethod
+    def bulk_delete_decisions(db: Session, ids: List[int]) -> int:
+        """Delete many decisions in one statement; returns how many were deleted"""
+        deleted = db.query(Decision).filter(Decision.id.in_(ids)).delete(synchronize_session=False)
+        SearchService.remove_documents(db, "decision", ids)
+        db.commit()
+        return deleted
+    
     @staticmethod
     def get_decision(db: Session, decision_id: int) -> Decision:
         """Get a decision by ID"""
@@ -21,7 +104,23 @@ class DecisionService:
     @staticmethod
     def get_meeting_decisions(db: Session, meeting_id: int) -> list[Decision]:
         """Get all decisions for a meeting"""
-        return db.query(Decision).filter(Decision.meeting_id == meeting_id).all()
+        return db.query(Decision).filter(Decision.meeting_id == meeting_id).order_by(Decision.id).all()
+    
+    @staticmethod
+    def get_decisions(
+        db: Session,
+        meeting_id: Optional[int] = None,
+        skip: int = 0,
+        limit: int = 100,
+        after_id: Optional[int] = None
+    ) -> List[Decision]:
+        """Get decisions in ID order, optionally for one meeting; after_id continues from a previous page"""
+        query = db.query(Decision)
+        if meeting_id is not None:
+            query = query.filter(Decision.meeting_id == meeting_id)
+        if after_id is not None:
+            query = query.filter(Decision.id > after_id)
+        return query.order_by(Decision.id).offset(skip).limit(limit).all()
     
     @staticmethod
     def update_decision(db: Session, decision_id: int, decision: DecisionUpdate) -> Decision:
@@ -32,7 +131,10 @@ class DecisionService:
         
         for key, value in decision.dict(exclude_unset=True).items():
             setattr(db_decision, key, value)
+        db_decision.normalized_title = normalize_title(db_decision.title)
         
+        DecisionService._flush_titles(db)
+        SearchService.index_decisions(db, [db_decision])
         db.commit()
         db.refresh(db_decision)
         return db_decision
@@ -44,6 +146,7 @@ class DecisionService:
         if not db_decision:
             raise HTTPException(status_code=404, detail="Decision not found")
         
+        SearchService.remove_documents(db, "decision", [db_decision.id])
         db.delete(db_decision)
         db.commit()
         return True 
\ No newline at end of file
@@ -0,0 +1,293 @@
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.services.segmentation import SAMPLE_RATE
+
+# Short-time analysis: 25 ms frames every 10 ms
+FRAME_SECONDS = 0.025
+HOP_SECONDS = 0.010
+FFT_SIZE = 512
+MEL_BANDS = 40
+MFCC_COEFFICIENTS = 20
+# Frames this far (in dB) below a window's loudest are silence and left out
+SILENCE_DB = 30.0
+
+# Stretches shorter than this carry too little speech for a stable embedding
+MIN_WINDOW_SECONDS = 0.5
+# Windows clustered pairwise; the rest join the nearest resulting cluster
+MAX_CLUSTERED_WINDOWS = 2000
+# Clusters with less speech than this don't count as a speaker of their own
+MIN_SPEAKER_SECONDS = 5.0
+
+@lru_cache(maxsize=4)
+def _mel_basis(sample_rate: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Triangular mel filterbank (bands x FFT bins) and DCT-II matrix for MFCCs"""
+    def hz_to_mel(hz):
+        return 2595.0 * np.log10(1.0 + hz / 700.0)
+
+    def mel_to_hz(mel):
+        return 700.0 * (10.0 ** (mel / 2595.0) - 1.0)
+
+    edges = mel_to_hz(np.linspace(hz_to_mel(20.0), hz_to_mel(sample_rate / 2), MEL_BANDS + 2))
+    bins = np.fft.rfftfreq(FFT_SIZE, 1.0 / sample_rate)
+    lower, center, upper = edges[:-2, None], edges[1:-1, None], edges[2:, None]
+    filters = np.maximum(0.0, np.minimum((bins - lower) / (center - lower), (upper - bins) / (upper - center)))
+    # c0 only tracks loudness, so the coefficients start at c1
+    dct = np.cos(np.pi / MEL_BANDS * (np.arange(MEL_BANDS) + 0.5) * np.arange(1, MFCC_COEFFICIENTS + 1)[:, None])
+    return filters.astype(np.float32), dct.astype(np.float32)
+
+def _mfcc(samples: np.ndarray, sample_rate: int) -> np.ndarray:
+    """MFCCs (frames x coefficients) of the voiced frames of a stretch of audio"""
+    frame_length = int(FRAME_SECONDS * sample_rate)
+    hop = int(HOP_SECONDS * sample_rate)
+    samples = np.asarray(samples, dtype=np.float32)
+    if len(samples) < frame_length:
+        samples = np.pad(samples, (0, frame_length - len(samples)))
+    emphasized = np.append(samples[:1], samples[1:] - 0.97 * samples[:-1])
+
+    count = 1 + (len(emphasized) - frame_length) // hop
+    frames = emphasized[np.arange(frame_length)[None, :] + hop * np.arange(count)[:, None]]
+    power = np.square(np.abs(np.fft.rfft(frames * np.hamming(frame_length).astype(np.float32), FFT_SIZE)))
+
+    filters, dct = _mel_basis(sample_rate)
+    log_mel = np.log(power @ filters.T + 1e-10)
+    energy = 10.0 * np.log10(power.sum(axis=1) + 1e-10)
+    voiced = energy > energy.max() - SILENCE_DB
+    return log_mel[voiced] @ dct.T
+
+def speaker_embeddings(samples: np.ndarray, windows: Sequence[Tuple[int, int]], sample_rate: int = SAMPLE_RATE) -> np.ndarray:
+    """
+    One vector per (start_sample, end_sample) window: the mean and spread of
+    its MFCCs, centred on the whole recording (which cancels the channel) and
+    scaled by the recording's frame-to-frame spread. One voice then gives
+    short distances between windows and different voices long ones, whatever
+    the number of speakers.
+    """
+    stats = np.zeros((len(windows), 2 * MFCC_COEFFICIENTS), dtype=np.float64)
+    frames, total, total_squares = 0, 0.0, 0.0
+    for i, (start, end) in enumerate(windows):
+        mfcc = _mfcc(samples[start:end], sample_rate).astype(np.float64)
+        stats[i] = np.concatenate([mfcc.mean(axis=0), mfcc.std(axis=0)])
+        frames += len(mfcc)
+        total = total + mfcc.sum(axis=0)
+        total_squares = total_squares + np.square(mfcc).sum(axis=0)
+    spread = np.sqrt(np.maximum(total_squares / max(frames, 1) - np.square(total / max(frames, 1)), 1e-8))
+    return ((stats - stats.mean(axis=0)) / np.tile(spread, 2)).astype(np.float32)
+
+def _distances(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Root-mean-square difference between every row of a and every row of b"""
+    squared = np.square(a).sum(axis=1)[:, None] + np.square(b).sum(axis=1)[None, :] - 2.0 * (a @ b.T)
+    return np.sqrt(np.maximum(squared, 0.0) / a.shape[1])
+
+def _average_linkage(embeddings: np.ndarray) -> Tuple[List[Tuple[int, int]], np.ndarray]:
+    """
+    Agglomerative clustering with average linkage, run to a single cluster.
+    Returns the merges in order as (kept, absorbed) row pairs, with the
+    distance of each. Every row remembers its nearest neighbour, so a merge
+    only rescans the rows it affected.
+    """
+    count = len(embeddings)
+    distances = _distances(embeddings, embeddings).astype(np.float64)
+    np.fill_diagonal(distances, np.inf)
+    sizes = np.ones(count)
+    active = np.ones(count, dtype=bool)
+    nearest = distances.argmin(axis=1)
+    nearest_distance = distances[np.arange(count), nearest]
+
+    merges, heights = [], []
+    for _ in range(count - 1):
+        row = int(np.argmin(nearest_distance))
+        col = int(nearest[row])
+        merges.append((row, col))
+        heights.append(nearest_distance[row])
+
+        # Lance-Williams update for the merged cluster's average distances
+        merged = (sizes[row] * distances[row] + sizes[col] * distances[col]) / (sizes[row] + sizes[col])
+        distances[row], distances[:, row] = merged, merged
+        distances[row, row] = np.inf
+        distances[col], distances[:, col] = np.inf, np.inf
+        sizes[row] += sizes[col]
+        active[col] = False
+        nearest_distance[col] = np.inf
+
+        stale = np.union1d(np.flatnonzero(active & ((nearest == row) | (nearest == col))), [row])
+        nearest[stale] = distances[stale].argmin(axis=1)
+        nearest_distance[stale] = distances[stale, nearest[stale]]
+        closer = active & (distances[:, row] < nearest_distance)
+        nearest[closer] = row
+        nearest_distance[closer] = distances[closer, row]
+    return merges, np.array(heights)
+
+def _cut(count: int, merges: List[Tuple[int, int]], steps: int) -> np.ndarray:
+    """Cluster labels after the first `steps` merges"""
+    parent = np.arange(count)
+    for row, col in merges[:steps]:
+        parent[col] = row
+    while True:
+        resolved = parent[parent]
+        if np.array_equal(resolved, parent):
+            return parent
+        parent = resolved
+
+def cluster_embeddings(
+    embeddings: np.ndarray,
+    weights: np.ndarray,
+    threshold: float,
+    num_speakers: Optional[int] = None,
+    max_speakers: Optional[int] = None
+) -> np.ndarray:
+    """
+    Group window embeddings by speaker; weights are window durations in
+    seconds. Only clusters with at least MIN_SPEAKER_SECONDS of speech count
+    as speakers, so a few stray windows (a cough, crosstalk) never take the
+    place of a real one. The tree is cut where exactly num_speakers such
+    clusters remain or, without it, where merges pass the distance threshold
+    (keeping at most max_speakers). Leftover small clusters join the nearest
+    speaker, then a few weighted k-means passes over every window settle the
+    boundaries. Returns one cluster number per window.
+    """
+    count = len(embeddings)
+    if count < 2:
+        return np.zeros(count, dtype=np.int64)
+
+    # Long recordings: cluster an even subsample, then place every window
+    sample = np.unique(np.linspace(0, count - 1, min(count, MAX_CLUSTERED_WINDOWS)).astype(np.int64))
+    sample_weights = weights[sample] * weights.sum() / weights[sample].sum()
+    merges, heights = _average_linkage(embeddings[sample])
+
+    # Speech in each cluster and the number of speaker-sized clusters after every merge
+    mass = sample_weights.astype(np.float64).copy()
+    speakers = [int((mass >= MIN_SPEAKER_SECONDS).sum())]
+    for row, col in merges:
+        before = int(mass[row] >= MIN_SPEAKER_SECONDS) + int(mass[col] >= MIN_SPEAKER_SECONDS)
+        mass[row] += mass[col]
+        mass[col] = 0.0
+        speakers.append(speakers[-1] - before + int(mass[row] >= MIN_SPEAKER_SECONDS))
+    speakers = np.array(speakers)
+
+    if num_speakers:
+        # The last point at which that many speakers are still apart
+        reached = np.flatnonzero(speakers >= num_speakers)
+        steps = int(reached[-1]) if len(reached) else len(merges)
+    else:
+        steps = int((heights <= threshold).sum())
+        if max_speakers:
+            allowed = np.flatnonzero(speakers[steps:] <= max_speakers)
+            steps += int(allowed[0]) if len(allowed) else 0
+    sample_labels = _cut(len(sample), merges, steps)
+
+    clusters, members = np.unique(sample_labels, return_inverse=True)
+    totals = np.bincount(members, weights=sample_weights)
+    big = totals >= MIN_SPEAKER_SECONDS
+    if not big.any():
+        big[np.argmax(totals)] = True
+    centroids = np.stack([embeddings[sample[members == i]].mean(axis=0) for i in np.flatnonzero(big)])
+
+    labels = _distances(embeddings, centroids).argmin(axis=1)
+    for _ in range(10):
+        used = np.unique(labels)
+        centroids = np.stack([
+            np.average(embeddings[labels == i], axis=0, weights=weights[labels == i]) for i in used
+        ])
+        updated = _distances(embeddings, centroids).argmin(axis=1)
+        if np.array_equal(updated, np.searchsorted(used, labels)):
+            break
+        labels = updated
+    return np.searchsorted(np.unique(labels), labels)
+
+def diarize(
+    samples: np.ndarray,
+    segments: List[Dict[str, Any]],
+    sample_rate: int = SAMPLE_RATE,
+    num_speakers: Optional[int] = None,
+    threshold: float = 0.4,
+    max_speakers: Optional[int] = None,
+    window_seconds: float = 3.0
+) -> List[Dict[str, Any]]:
+    """
+    Label timestamped transcript segments with speakers. Each segment is cut
+    into windows of at most window_seconds, the windows are embedded and
+    clustered, and a segment takes the speaker heard longest in it. Segments
+    too short to embed take the previous speaker. Speakers are numbered from
+    0 in order of first appearance.
+    """
+    windows, owners = [], []
+    for i, segment in enumerate(segments):
+        start = max(0, int(segment["start"] * sample_rate))
+        end = min(len(samples), int(segment["end"] * sample_rate))
+        duration = (end - start) / sample_rate
+        if duration < MIN_WINDOW_SECONDS:
+            continue
+        bounds = np.linspace(start, end, int(np.ceil(duration / window_seconds)) + 1).astype(np.int64)
+        for window_start, window_end in zip(bounds[:-1], bounds[1:]):
+            windows.append((int(window_start), int(window_end)))
+            owners.append(i)
+
+    speakers = np.full(len(segments), -1, dtype=np.int64)
+    if windows:
+        weights = np.array([(end - start) / sample_rate for start, end in windows])
+        labels = cluster_embeddings(
+            speaker_embeddings(samples, windows, sample_rate), weights, threshold, num_speakers, max_speakers
+        )
+        votes = np.zeros((len(segments), labels.max() + 1))
+        np.add.at(votes, (np.array(owners), labels), weights)
+        voted = votes.sum(axis=1) > 0
+        speakers[voted] = votes[voted].argmax(axis=1)
+
+    # Fill unlabelled segments from the previous one, or the next at the start
+    known = np.flatnonzero(speakers >= 0)
+    if len(known):
+        previous = np.maximum.accumulate(np.where(speakers >= 0, np.arange(len(speakers)), -1))
+        speakers = np.where(previous >= 0, speakers[np.maximum(previous, 0)], speakers[known[0]])
+    else:
+        speakers[:] = 0
+
+    order = {}
+    for speaker in speakers:
+        order.setdefault(int(speaker), len(order))
+    return [dict(segment, speaker=order[int(speaker)]) for segment, speaker in zip(segments, speakers)]
+
+def speaker_label(speaker: Optional[int]) -> str:
+    return f"Speaker {speaker + 1}" if speaker is not None else "Speaker"
+
+def has_speakers(segments: List[Dict[str, Any]]) -> bool:
+    return any(segment.get("speaker") is not None for segment in segments)
+
+def turn_spans(segments: List[Dict[str, Any]], words: int) -> List[Tuple[int, int]]:
+    """Segment index ranges of one speaker each, of up to about `words` words"""
+    spans, first, count = [], None, 0
+    for i, segment in enumerate(segments):
+        length = len(segment["text"].split())
+        if first is not None and (segment["speaker"] != segments[first]["speaker"] or count + length > words):
+            spans.append((first, i))
+            first = None
+        if first is None:
+            first, count = i, 0
+        count += length
+    if first is not None:
+        spans.append((first, len(segments)))
+    return spans
+
+def speaker_turns(segments: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Merge consecutive segments of the same speaker into turns"""
+    turns = []
+    for segment in segments:
+        if not segment["text"]:
+            continue
+        if turns and turns[-1]["speaker"] == segment.get("speaker"):
+            turns[-1]["end"] = segment["end"]
+            turns[-1]["text"] = f"{turns[-1]['text']} {segment['text']}"
+        else:
+            turns.append({
+                "start": segment["start"],
+                "end": segment["end"],
+                "speaker": segment.get("speaker"),
+                "text": segment["text"]
+            })
+    return turns
+
+def labelled_transcript(segments: List[Dict[str, Any]]) -> str:
+    """The transcript as one "Speaker N: ..." line per turn"""
+    return "\n".join(f"{speaker_label(turn['speaker'])}: {turn['text']}" for turn in speaker_turns(segments))
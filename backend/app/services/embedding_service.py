@@ -0,0 +1,273 @@
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.models import Meeting, Decision
+from app.services.cache_service import text_sha256
+from app.services.diarization import has_speakers, speaker_label, turn_spans
+from app.services.meeting_service import MeetingService
+from app.services.model_registry import ModelRegistry, inference_mode
+from app.services.vector_index import VectorIndex
+from fastapi import HTTPException
+from typing import Any, Dict, List, Optional, Tuple
+import json
+import os
+import re
+import threading
+
+import numpy as np
+
+# Kinds of vectors in the index. "meeting" is one vector per meeting, used to
+# find related meetings; the others are what semantic search returns. A
+# diarized transcript is embedded as "turn" chunks, whose start and end are
+# segment IDs rather than character offsets; search reports them as
+# "transcript".
+EMBEDDING_KINDS = {"meeting": 0, "transcript": 1, "summary": 2, "decision": 3, "turn": 4}
+KIND_NAMES = {code: name for name, code in EMBEDDING_KINDS.items()}
+SEARCHABLE_KINDS = ("transcript", "summary", "decision")
+
+def chunk_spans(text: str, words: int, overlap: int) -> List[Tuple[int, int]]:
+    """Character spans of overlapping windows of `words` words over text"""
+    positions = [match.span() for match in re.finditer(r"\S+", text or "")]
+    if not positions:
+        return []
+    step = max(1, words - overlap)
+    spans = []
+    for start in range(0, len(positions), step):
+        window = positions[start:start + words]
+        spans.append((window[0][0], window[-1][1]))
+        if start + words >= len(positions):
+            break
+    return spans
+
+def _decision_text(decision: Decision) -> str:
+    return ". ".join(part for part in (decision.title, decision.description, decision.rationale) if part)
+
+class EmbeddingService:
+    """
+    Embeds meeting content with a local sentence-embedding model and answers
+    semantic queries from a memory-mapped VectorIndex. Nothing leaves the
+    machine: the model is loaded from the Hugging Face cache (set
+    HUGGINGFACE_OFFLINE to forbid downloads) and the index is plain files.
+    """
+    _index: Optional[VectorIndex] = None
+    _lock = threading.Lock()
+
+    @staticmethod
+    def _index_exists() -> bool:
+        return os.path.exists(os.path.join(settings.EMBEDDING_INDEX_DIR, "index.json"))
+
+    @staticmethod
+    def _embedding_dim() -> int:
+        # Read from an existing index, so lookups and deletes don't load the model
+        try:
+            with open(os.path.join(settings.EMBEDDING_INDEX_DIR, "index.json")) as f:
+                state = json.load(f)
+            if state.get("model") == settings.EMBEDDING_MODEL:
+                return int(state["dim"])
+        except (OSError, ValueError, KeyError):
+            pass
+        _, model = ModelRegistry.get("embedder")
+        return model.config.hidden_size
+
+    @staticmethod
+    def get_index() -> VectorIndex:
+        """The process-wide index for EMBEDDING_MODEL, opened on first use"""
+        with EmbeddingService._lock:
+            if EmbeddingService._index is None:
+                EmbeddingService._index = VectorIndex(
+                    settings.EMBEDDING_INDEX_DIR,
+                    EmbeddingService._embedding_dim(),
+                    settings.EMBEDDING_MODEL
+                )
+            return EmbeddingService._index
+
+    @staticmethod
+    def embed_texts(texts: List[str]) -> np.ndarray:
+        """
+        Unit-length embeddings (mean-pooled token states) for a list of texts.
+        Texts are batched in length order so each batch pads to similar lengths.
+        """
+        import torch
+        tokenizer, model = ModelRegistry.get("embedder")
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        vectors = np.zeros((len(texts), model.config.hidden_size), dtype=np.float32)
+        batch_size = max(1, settings.EMBEDDING_BATCH_SIZE)
+        with inference_mode():
+            for start in range(0, len(order), batch_size):
+                batch_indices = order[start:start + batch_size]
+                inputs = tokenizer(
+                    [texts[i] for i in batch_indices],
+                    padding=True,
+                    truncation=True,
+                    max_length=settings.EMBEDDING_MAX_TOKENS,
+                    return_tensors="pt"
+                ).to(model.device)
+                hidden = model(**inputs).last_hidden_state
+                mask = inputs["attention_mask"].unsqueeze(-1).to(hidden.dtype)
+                pooled = (hidden * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1e-9)
+                pooled = torch.nn.functional.normalize(pooled, dim=1)
+                vectors[batch_indices] = pooled.float().cpu().numpy()
+        return vectors
+
+    @staticmethod
+    def index_meeting(db: Session, meeting_id: int) -> int:
+        """
+        Embed a meeting's transcript and summary chunks and its decisions, plus
+        one meeting vector for related-meeting lookups. Skipped when the content
+        hasn't changed since it was last embedded. Returns the number of vectors.
+        """
+        meeting = db.query(Meeting.transcript, Meeting.summary).filter(Meeting.id == meeting_id).first()
+        if meeting is None:
+            raise HTTPException(status_code=404, detail="Meeting not found")
+        transcript, summary = meeting
+        segments = MeetingService.get_segments(db, meeting_id)
+        decisions = db.query(Decision).filter(Decision.meeting_id == meeting_id).order_by(Decision.id).all()
+
+        texts, rows = [], []
+        if has_speakers(segments):
+            # Chunks follow speaker turns, so a hit can say who said it and when
+            for first, last in turn_spans(segments, settings.EMBEDDING_CHUNK_WORDS):
+                texts.append(" ".join(segment["text"] for segment in segments[first:last]))
+                rows.append({
+                    "item_id": meeting_id,
+                    "kind": EMBEDDING_KINDS["turn"],
+                    "start": segments[first]["id"],
+                    "end": segments[last - 1]["id"] + 1
+                })
+            transcript = None
+        for kind, text in (("transcript", transcript), ("summary", summary)):
+            for start, end in chunk_spans(text, settings.EMBEDDING_CHUNK_WORDS, settings.EMBEDDING_CHUNK_OVERLAP_WORDS):
+                texts.append(text[start:end])
+                rows.append({"item_id": meeting_id, "kind": EMBEDDING_KINDS[kind], "start": start, "end": end})
+        for decision in decisions:
+            texts.append(_decision_text(decision))
+            rows.append({"item_id": decision.id, "kind": EMBEDDING_KINDS["decision"]})
+
+        content = {"model": settings.EMBEDDING_MODEL, "max_tokens": settings.EMBEDDING_MAX_TOKENS, "texts": texts}
+        if has_speakers(segments):
+            # Relabelled speakers move turn boundaries even where the text is unchanged
+            content["turns"] = [(row["start"], row["end"]) for row in rows if row["kind"] == EMBEDDING_KINDS["turn"]]
+        content_hash = text_sha256(json.dumps(content))
+        index = EmbeddingService.get_index()
+        if index.content_hash(meeting_id) == content_hash:
+            return len(texts) + 1
+        if not texts:
+            index.remove_meeting(meeting_id)
+            return 0
+
+        vectors = EmbeddingService.embed_texts(texts)
+        # The meeting vector averages the transcript and the summary, weighting them equally
+        kinds = np.array([row["kind"] for row in rows])
+        parts = [
+            vectors[np.isin(kinds, codes)].mean(axis=0)
+            for codes in ([EMBEDDING_KINDS["transcript"], EMBEDDING_KINDS["turn"]], [EMBEDDING_KINDS["summary"]])
+            if np.isin(kinds, codes).any()
+        ] or [vectors.mean(axis=0)]
+        rows.append({"item_id": meeting_id, "kind": EMBEDDING_KINDS["meeting"]})
+        vectors = np.vstack([vectors, np.mean(parts, axis=0)])
+
+        index.replace_meeting(meeting_id, rows, vectors, content_hash)
+        return len(rows)
+
+    @staticmethod
+    def remove_meeting(meeting_id: int):
+        """Drop a deleted meeting's vectors"""
+        if EmbeddingService._index_exists():
+            EmbeddingService.get_index().remove_meeting(meeting_id)
+
+    @staticmethod
+    def _meetings(db: Session, meeting_ids) -> Dict[int, Any]:
+        rows = db.query(Meeting.id, Meeting.title, Meeting.date, Meeting.status).filter(
+            Meeting.id.in_([int(meeting_id) for meeting_id in set(meeting_ids)])
+        ).all()
+        return {row.id: row for row in rows}
+
+    @staticmethod
+    def search(db: Session, query: str, kinds: Optional[List[str]] = None, limit: int = 10) -> List[Dict[str, Any]]:
+        """Transcript passages, summaries and decisions closest in meaning to the query, best first"""
+        kinds = kinds or list(SEARCHABLE_KINDS)
+        unknown = [kind for kind in kinds if kind not in SEARCHABLE_KINDS]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown search kinds: {unknown}")
+        if not EmbeddingService._index_exists():
+            return []
+
+        codes = [EMBEDDING_KINDS[kind] for kind in kinds]
+        if "transcript" in kinds:
+            codes.append(EMBEDDING_KINDS["turn"])
+        vector = EmbeddingService.embed_texts([query])
+        hits = EmbeddingService.get_index().search(vector, limit, kinds=codes)[0]
+        meetings = EmbeddingService._meetings(db, [row["meeting_id"] for row, _ in hits])
+        decision_ids = [int(row["item_id"]) for row, _ in hits if row["kind"] == EMBEDDING_KINDS["decision"]]
+        decisions = {
+            decision.id: decision
+            for decision in db.query(Decision).filter(Decision.id.in_(decision_ids)).all()
+        } if decision_ids else {}
+
+        results = []
+        for row, score in hits:
+            meeting_id, item_id, kind = int(row["meeting_id"]), int(row["item_id"]), KIND_NAMES[int(row["kind"])]
+            meeting = meetings.get(meeting_id)
+            if meeting is None:
+                continue
+            turn = {}
+            if kind == "turn":
+                first, last = int(row["start"]), int(row["end"])
+                matched = MeetingService.get_segment_range(db, meeting_id, first=first, last=last - 1, limit=last - first)
+                if not matched:
+                    # Segments replaced since the meeting was embedded
+                    continue
+                kind, text = "transcript", " ".join(segment["text"] for segment in matched)
+                turn = {
+                    "speaker": speaker_label(matched[0]["speaker"]),
+                    "start_time": matched[0]["start"],
+                    "end_time": matched[-1]["end"]
+                }
+            elif kind == "decision":
+                decision = decisions.get(item_id)
+                if decision is None:
+                    continue
+                text = _decision_text(decision)
+            else:
+                # Only the matched chunk is read, sliced by the database
+                column = Meeting.transcript if kind == "transcript" else Meeting.summary
+                start, end = int(row["start"]), int(row["end"])
+                text = db.query(func.substr(column, start + 1, end - start)).filter(Meeting.id == meeting_id).scalar() or ""
+            results.append({
+                "kind": kind,
+                "item_id": item_id,
+                "meeting_id": meeting_id,
+                "meeting_title": meeting.title,
+                "meeting_date": meeting.date,
+                "text": text,
+                "score": score,
+                **turn
+            })
+        return results
+
+    @staticmethod
+    def related_meetings(db: Session, meeting_id: int, limit: int = 5) -> List[Dict[str, Any]]:
+        """Meetings whose content is closest to this one's, best first"""
+        rows, vectors = (
+            EmbeddingService.get_index().meeting_rows(meeting_id, kinds=[EMBEDDING_KINDS["meeting"]])
+            if EmbeddingService._index_exists() else ([], None)
+        )
+        if not len(rows):
+            raise HTTPException(status_code=400, detail="Meeting has not been embedded yet. Please summarize it first.")
+
+        hits = EmbeddingService.get_index().search(
+            vectors[:1], limit, kinds=[EMBEDDING_KINDS["meeting"]], exclude_meeting_id=meeting_id
+        )[0]
+        meetings = EmbeddingService._meetings(db, [row["meeting_id"] for row, _ in hits])
+        return [
+            {
+                "meeting_id": meeting.id,
+                "title": meeting.title,
+                "date": meeting.date,
+                "status": meeting.status,
+                "score": score
+            }
+            for row, score in hits
+            for meeting in [meetings.get(int(row["meeting_id"]))]
+            if meeting is not None
+        ]
@@ -0,0 +1,291 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.database import SessionLocal, run_write
+from app.models.models import Job, Meeting
+from app.schemas.schemas import ActionItemCreate, DecisionCreate
+from app.services.transcription_service import TranscriptionService
+from app.services.summarization_service import SummarizationService
+from app.services.action_item_service import ActionItemService
+from app.services.decision_service import DecisionService
+from app.services.meeting_service import MeetingService
+from app.services.embedding_service import EmbeddingService
+from concurrent.futures import ThreadPoolExecutor
+from fastapi import HTTPException
+from datetime import datetime
+from typing import Optional, Dict, Any, Callable, List
+import json
+import threading
+
+class JobService:
+    """
+    Runs transcription, diarization and summarization off the event loop.
+
+    Jobs are rows in the ``jobs`` table, so their status survives a restart;
+    the work itself runs on a bounded thread pool shared by the process.
+    """
+    _executor = None
+    _lock = threading.Lock()
+
+    @staticmethod
+    def _get_executor() -> ThreadPoolExecutor:
+        """Create the worker pool on first use"""
+        with JobService._lock:
+            if JobService._executor is None:
+                JobService._executor = ThreadPoolExecutor(
+                    max_workers=settings.JOB_WORKERS,
+                    thread_name_prefix="job-worker"
+                )
+            return JobService._executor
+
+    @staticmethod
+    def submit_job(meeting_id: int, job_type: str, params: Optional[Dict[str, Any]] = None) -> Job:
+        """Persist a new job and queue it on the worker pool"""
+        if job_type not in JOB_HANDLERS:
+            raise HTTPException(status_code=400, detail=f"Unknown job type: {job_type}")
+
+        # Use a dedicated session so nothing pending on the caller's session
+        # gets flushed along with the job row
+        db = SessionLocal()
+        try:
+            db_job = run_write(db, JobService._create_job, meeting_id, job_type, params)
+        finally:
+            db.close()
+
+        # Always on the pool, even when every result is cached: the cache hit
+        # makes the job quick without tying up the request thread
+        JobService._get_executor().submit(JobService._run_job, db_job.id)
+        return db_job
+
+    @staticmethod
+    def _create_job(db: Session, meeting_id: int, job_type: str, params: Optional[Dict[str, Any]]) -> Job:
+        """Insert a queued job row, unless too many jobs are already pending"""
+        pending = db.query(Job).filter(Job.status.in_(["queued", "running"])).count()
+        if pending >= settings.JOB_MAX_PENDING:
+            raise HTTPException(status_code=503, detail="Too many pending jobs, please retry later")
+
+        db_job = Job(
+            meeting_id=meeting_id,
+            job_type=job_type,
+            status="queued",
+            progress=0.0,
+            params=json.dumps(params or {})
+        )
+        db.add(db_job)
+        db.commit()
+        db.refresh(db_job)
+        return db_job
+
+    @staticmethod
+    def _update_job(db: Session, job_id: int, **values):
+        """Set columns on a job row"""
+        db.query(Job).filter(Job.id == job_id).update(values, synchronize_session=False)
+        db.commit()
+
+    @staticmethod
+    def _requeue_unfinished(db: Session) -> List[int]:
+        """Mark jobs left queued or running as queued again; returns their IDs"""
+        jobs = db.query(Job).filter(Job.status.in_(["queued", "running"])).order_by(Job.id).all()
+        for job in jobs:
+            job.status = "queued"
+            job.progress = 0.0
+        db.commit()
+        return [job.id for job in jobs]
+
+    @staticmethod
+    def get_job(db: Session, job_id: int) -> Job:
+        """Get a job by ID"""
+        return db.query(Job).filter(Job.id == job_id).first()
+
+    @staticmethod
+    def get_jobs(db: Session, meeting_id: Optional[int] = None, status: Optional[str] = None, skip: int = 0, limit: int = 100):
+        """Get jobs, optionally filtered by meeting and status"""
+        query = db.query(Job)
+        if meeting_id is not None:
+            query = query.filter(Job.meeting_id == meeting_id)
+        if status:
+            query = query.filter(Job.status == status)
+        return query.order_by(Job.id.desc()).offset(skip).limit(limit).all()
+
+    @staticmethod
+    async def get_job_async(db: AsyncSession, job_id: int) -> Optional[Job]:
+        """Get a job by ID without blocking the event loop"""
+        return await db.get(Job, job_id)
+
+    @staticmethod
+    async def get_jobs_async(db: AsyncSession, meeting_id: Optional[int] = None, status: Optional[str] = None, skip: int = 0, limit: int = 100):
+        """Async counterpart of get_jobs, for the polling endpoints"""
+        query = select(Job)
+        if meeting_id is not None:
+            query = query.where(Job.meeting_id == meeting_id)
+        if status:
+            query = query.where(Job.status == status)
+        result = await db.execute(query.order_by(Job.id.desc()).offset(skip).limit(limit))
+        return result.scalars().all()
+
+    @staticmethod
+    def recover_jobs():
+        """Re-queue jobs left queued or running by a previous process"""
+        job_ids = run_write(None, JobService._requeue_unfinished)
+
+        for job_id in job_ids:
+            JobService._get_executor().submit(JobService._run_job, job_id)
+        return len(job_ids)
+
+    @staticmethod
+    def shutdown():
+        """Stop accepting work; unfinished jobs stay queued in the database"""
+        with JobService._lock:
+            if JobService._executor is not None:
+                JobService._executor.shutdown(wait=False, cancel_futures=True)
+                JobService._executor = None
+
+    @staticmethod
+    def _run_job(job_id: int):
+        """Worker entry point: run one job in its own database session"""
+        db = SessionLocal()
+        try:
+            job = JobService.get_job(db, job_id)
+            if not job or job.status not in ("queued", "running"):
+                return
+
+            meeting_id, job_type, params = job.meeting_id, job.job_type, json.loads(job.params or "{}")
+            # Handlers read on this session and send their writes through run_write
+            db.rollback()
+            run_write(db, JobService._update_job, job_id, status="running", started_at=datetime.utcnow())
+
+            def report_progress(progress: float):
+                run_write(db, JobService._update_job, job_id, progress=max(0.0, min(1.0, progress)))
+
+            try:
+                result = JOB_HANDLERS[job_type](db, meeting_id, params, report_progress)
+                outcome = {"result": json.dumps(result, default=str), "status": "completed", "progress": 1.0}
+            except HTTPException as e:
+                db.rollback()
+                outcome = {"status": "failed", "error": str(e.detail)}
+            except Exception as e:
+                db.rollback()
+                print(f"Error running job {job_id}: {str(e)}")
+                outcome = {"status": "failed", "error": str(e)}
+
+            run_write(db, JobService._update_job, job_id, finished_at=datetime.utcnow(), **outcome)
+        finally:
+            db.close()
+
+def _get_meeting_or_fail(db: Session, meeting_id: int) -> Meeting:
+    meeting = MeetingService.get_meeting(db, meeting_id)
+    if not meeting:
+        raise HTTPException(status_code=404, detail="Meeting not found")
+    return meeting
+
+def run_transcription(db: Session, meeting_id: int, params: Dict[str, Any], report_progress: Callable[[float], None]) -> Dict[str, Any]:
+    """Transcribe the meeting's uploaded audio and store the transcript"""
+    meeting = _get_meeting_or_fail(db, meeting_id)
+    if not meeting.audio_file_path:
+        raise HTTPException(status_code=400, detail="No audio file has been uploaded for this meeting")
+
+    report_progress(0.05)
+    result = TranscriptionService.transcribe_segments(
+        meeting.audio_file_path,
+        meeting.audio_checksum,
+        params.get("mode"),
+        params.get("num_speakers"),
+        provider=params.get("provider")
+    )
+    report_progress(0.95)
+
+    transcribed_until = meeting.audio_duration or (result["segments"][-1]["end"] if result["segments"] else 0.0)
+    run_write(db, MeetingService.save_transcript_progress, meeting_id, result["text"], transcribed_until, result["segments"])
+    return {"transcript": result["text"], "segments": result["segments"], "speakers": _count_speakers(result["segments"])}
+
+def run_diarization(db: Session, meeting_id: int, params: Dict[str, Any], report_progress: Callable[[float], None]) -> Dict[str, Any]:
+    """Label the meeting's stored transcript segments with speakers"""
+    meeting = _get_meeting_or_fail(db, meeting_id)
+    if not meeting.audio_file_path:
+        raise HTTPException(status_code=400, detail="No audio file has been uploaded for this meeting")
+    segments = MeetingService.get_segments(db, meeting_id)
+    if not segments:
+        raise HTTPException(status_code=400, detail="No transcript segments available for this meeting. Please transcribe first.")
+
+    report_progress(0.05)
+    segments = TranscriptionService.diarize_segments(
+        meeting.audio_file_path, segments, params.get("num_speakers"), meeting.audio_checksum
+    )
+    run_write(db, MeetingService.save_segments, meeting_id, segments)
+    return {"speakers": _count_speakers(segments)}
+
+def _count_speakers(segments: List[Dict[str, Any]]) -> int:
+    return len({segment["speaker"] for segment in segments if segment.get("speaker") is not None})
+
+def run_summarization(db: Session, meeting_id: int, params: Dict[str, Any], report_progress: Callable[[float], None]) -> Dict[str, Any]:
+    """Summarize the transcript and extract action items and decisions"""
+    meeting = _get_meeting_or_fail(db, meeting_id)
+    if not meeting.transcript:
+        raise HTTPException(status_code=400, detail="No transcript available for this meeting. Please transcribe first.")
+    transcript = meeting.transcript
+    segments = MeetingService.get_segments(db, meeting_id)
+
+    summary = SummarizationService.summarize_text(transcript, segments=segments, preset=params.get("preset"))
+    run_write(db, MeetingService.save_summary, meeting_id, summary)
+    report_progress(0.5)
+
+    extracted = SummarizationService.extract_items(transcript, segments)
+    action_items = extracted.get("action_items") or []
+    decisions = extracted.get("decisions") or []
+    report_progress(0.95)
+
+    # Upsert everything in one transaction each, so re-running doesn't duplicate items
+    saved_action_items = run_write(db, ActionItemService.bulk_upsert_action_items, [
+        ActionItemCreate(
+            meeting_id=meeting_id,
+            title=item.get('title', ''),
+            description=item.get('description', ''),
+            assignee=item.get('assignee', ''),
+            due_date=None  # Free-text due dates from the model are not datetimes
+        )
+        for item in action_items if item.get('title')
+    ])
+    saved_decisions = run_write(db, DecisionService.bulk_upsert_decisions, [
+        DecisionCreate(
+            meeting_id=meeting_id,
+            title=decision.get('title', ''),
+            description=decision.get('description', ''),
+            decision_maker=decision.get('decision_maker', ''),
+            rationale=decision.get('rationale', '')
+        )
+        for decision in decisions if decision.get('title')
+    ])
+
+    if settings.EMBEDDINGS_ENABLED:
+        # Semantic search is an extra: embed in a job of its own, so a summary
+        # replayed from the cache inside the request never waits on the
+        # embedding model, and a missing model doesn't fail the summary
+        try:
+            JobService.submit_job(meeting_id, "embed")
+        except Exception as e:
+            print(f"Error queueing embedding for meeting {meeting_id}: {str(e)}")
+
+    return {
+        "summary": summary,
+        "action_items": [
+            {"id": item.id, "title": item.title, "description": item.description, "assignee": item.assignee}
+            for item in saved_action_items
+        ],
+        "decisions": [
+            {"id": decision.id, "title": decision.title, "description": decision.description, "decision_maker": decision.decision_maker, "rationale": decision.rationale}
+            for decision in saved_decisions
+        ]
+    }
+
+def run_embedding(db: Session, meeting_id: int, params: Dict[str, Any], report_progress: Callable[[float], None]) -> Dict[str, Any]:
+    """(Re)build the meeting's semantic search vectors"""
+    _get_meeting_or_fail(db, meeting_id)
+    return {"vectors": EmbeddingService.index_meeting(db, meeting_id)}
+
+JOB_HANDLERS = {
+    "transcribe": run_transcription,
+    "summarize": run_summarization,
+    "embed": run_embedding,
+    "diarize": run_diarization,
+}
@@ -1,20 +1,17 @@
-from sqlalchemy.orm import Session
-from app.models.models import Meeting
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import Session, defer
+from app.models.models import Meeting, MeetingParticipant, TranscriptSegment
 from app.schemas.schemas import MeetingCreate, MeetingUpdate
+from app.services.search_service import SearchService
+from app.services.text_utils import normalize_participant
 from datetime import datetime
-from typing import Optional
-import json
+from typing import Optional, Dict, Any, List
 
 class MeetingService:
     @staticmethod
     def create_meeting(db: Session, meeting: MeetingCreate):
-        meeting_data = meeting.dict()
-        
-        # Convert participants list to JSON string if present
-        if meeting_data.get('participants'):
-            meeting_data['participants'] = json.dumps(meeting_data['participants'])
-        
-        db_meeting = Meeting(**meeting_data)
+        # Meeting.participants stores the list as meeting_participants rows
+        db_meeting = Meeting(**meeting.dict())
         db.add(db_meeting)
         db.commit()
         db.refresh(db_meeting)
@@ -22,16 +19,7 @@ class MeetingService:
     
     @staticmethod
     def get_meeting(db: Session, meeting_id: int):
-        db_meeting = db.query(Meeting).filter(Meeting.id == meeting_id).first()
-        
-        # Convert participants from JSON string back to list if present
-        if db_meeting and db_meeting.participants:
-            try:
-                db_meeting.participants = json.loads(db_meeting.participants)
-            except:
-                db_meeting.participants = []
-                
-        return db_meeting
+        return db.query(Meeting).filter(Meeting.id == meeting_id).first()
     
     @staticmethod
     def get_meetings(
@@ -40,9 +28,12 @@ class MeetingService:
         limit: int = 100,
         status: Optional[str] = None,
         date_from: Optional[datetime] = None,
-        date_to: Optional[datetime] = None
+        date_to: Optional[datetime] = None,
+        participant: Optional[str] = None,
+        before_id: Optional[int] = None
     ):
-        query = db.query(Meeting)
+        # Transcripts and summaries can be megabytes each; list views don't show them
+        query = db.query(Meeting).options(defer(Meeting.transcript), defer(Meeting.summary))
         
         # Apply filters if provided
         if status:
@@ -51,20 +42,46 @@ class MeetingService:
             query = query.filter(Meeting.date >= date_from)
         if date_to:
             query = query.filter(Meeting.date <= date_to)
+        if participant:
+            # Resolved through the (normalized_name, meeting_id) index
+            attended = select(MeetingParticipant.meeting_id).where(
+                MeetingParticipant.normalized_name == normalize_participant(participant)
+            )
+            query = query.filter(Meeting.id.in_(attended))
         
-        # Apply pagination and order by date if available, otherwise by created_at
-        query = query.order_by(Meeting.created_at.desc())
-        meetings = query.offset(skip).limit(limit).all()
-        
-        # Convert participants from JSON string back to list for each meeting
-        for meeting in meetings:
-            if meeting.participants:
-                try:
-                    meeting.participants = json.loads(meeting.participants)
-                except:
-                    meeting.participants = []
-        
-        return meetings
+        # Newest first. IDs increase with created_at (set by the database on
+        # insert), and unlike created_at they are unique, so they make a
+        # stable keyset: with before_id a page starts right after the previous
+        # one through the index instead of counting past `skip` rows
+        if before_id is not None:
+            query = query.filter(Meeting.id < before_id)
+        query = query.order_by(Meeting.id.desc())
+        return query.offset(skip).limit(limit).all()
+    
+    @staticmethod
+    def get_transcript_info(db: Session, meeting_id: int) -> Optional[Dict[str, Any]]:
+        """Length and last change of a meeting's transcript, without reading the text itself"""
+        row = db.query(
+            func.length(Meeting.transcript),
+            Meeting.transcribed_until,
+            Meeting.updated_at,
+            Meeting.created_at
+        ).filter(Meeting.id == meeting_id).first()
+        if row is None:
+            return None
+        length, transcribed_until, updated_at, created_at = row
+        return {
+            "total_length": length or 0,
+            "transcribed_until": transcribed_until,
+            "updated_at": updated_at or created_at
+        }
+    
+    @staticmethod
+    def get_transcript_range(db: Session, meeting_id: int, offset: int = 0, limit: Optional[int] = None) -> str:
+        """Characters [offset, offset + limit) of a meeting's transcript, sliced by the database"""
+        # SQL substr() is 1-based
+        text = func.substr(Meeting.transcript, offset + 1, limit) if limit is not None else func.substr(Meeting.transcript, offset + 1)
+        return db.query(text).filter(Meeting.id == meeting_id).scalar() or ""
     
     @staticmethod
     def update_meeting(db: Session, meeting_id: int, meeting_update: MeetingUpdate):
@@ -73,33 +90,213 @@ class MeetingService:
             # Get update data, excluding unset fields
             update_data = meeting_update.dict(exclude_unset=True)
             
-            # Convert participants list to JSON string if present
-            if 'participants' in update_data and update_data['participants'] is not None:
-                update_data['participants'] = json.dumps(update_data['participants'])
-            
             # Update each field if it's provided
             for field, value in update_data.items():
                 setattr(db_meeting, field, value)
+            if "transcript" in update_data:
+                # Segment timestamps and speakers describe the old text
+                MeetingService._delete_segments(db, meeting_id)
             
             # Update the updated_at timestamp
             db_meeting.updated_at = datetime.utcnow()
             
+            if update_data.keys() & {"title", "transcript", "summary"}:
+                db.flush()
+                SearchService.index_meeting(db, meeting_id)
+            
             db.commit()
             db.refresh(db_meeting)
-            
-            # Convert participants back to a list for the returned object
-            if db_meeting.participants:
-                try:
-                    db_meeting.participants = json.loads(db_meeting.participants)
-                except:
-                    db_meeting.participants = []
         
         return db_meeting
     
+    @staticmethod
+    def save_audio(db: Session, meeting_id: int, file_path: str, checksum: str, duration: Optional[float]):
+        """
+        Point the meeting at newly uploaded audio. The checksum keys cached
+        results, so it is only ever set here, from the stored file's content.
+        New audio invalidates any partial transcript progress.
+        """
+        db.query(Meeting).filter(Meeting.id == meeting_id).update(
+            {
+                Meeting.audio_file_path: file_path,
+                Meeting.audio_checksum: checksum,
+                Meeting.audio_duration: duration,
+                Meeting.transcribed_until: None,
+                Meeting.updated_at: datetime.utcnow()
+            },
+            synchronize_session=False
+        )
+        db.commit()
+    
+    @staticmethod
+    def save_transcript_progress(
+        db: Session,
+        meeting_id: int,
+        transcript: str,
+        transcribed_until: Optional[float],
+        segments: Optional[List[Dict[str, Any]]] = None,
+        append: bool = False
+    ):
+        """
+        Store a partial transcript and how far into the audio it reaches.
+        segments replaces the meeting's timestamped segments, or with
+        append=True is added after them; None leaves them as they are.
+        """
+        db.query(Meeting).filter(Meeting.id == meeting_id).update(
+            {
+                Meeting.transcript: transcript,
+                Meeting.transcribed_until: transcribed_until,
+                Meeting.updated_at: datetime.utcnow()
+            },
+            synchronize_session=False
+        )
+        if segments is not None:
+            MeetingService._write_segments(db, meeting_id, segments, append)
+        SearchService.index_meeting(db, meeting_id)
+        db.commit()
+    
+    @staticmethod
+    def _delete_segments(db: Session, meeting_id: int):
+        db.query(TranscriptSegment).filter(TranscriptSegment.meeting_id == meeting_id).delete(synchronize_session=False)
+    
+    @staticmethod
+    def _write_segments(db: Session, meeting_id: int, segments: List[Dict[str, Any]], append: bool = False):
+        """Insert segment rows in one statement, numbering them after any kept rows"""
+        first = 0
+        if append:
+            last = db.query(func.max(TranscriptSegment.position)).filter(TranscriptSegment.meeting_id == meeting_id).scalar()
+            first = last + 1 if last is not None else 0
+        else:
+            MeetingService._delete_segments(db, meeting_id)
+        if segments:
+            db.execute(insert(TranscriptSegment), [
+                {
+                    "meeting_id": meeting_id,
+                    "position": first + i,
+                    "start_time": segment["start"],
+                    "end_time": segment["end"],
+                    "speaker": segment.get("speaker"),
+                    "text": segment["text"]
+                }
+                for i, segment in enumerate(segments)
+            ])
+    
+    @staticmethod
+    def _segment_dicts(rows) -> List[Dict[str, Any]]:
+        return [
+            {"id": row.position, "start": row.start_time, "end": row.end_time, "speaker": row.speaker, "text": row.text}
+            for row in rows
+        ]
+    
+    @staticmethod
+    def _select_segments(meeting_id: int):
+        # Plain column rows through select(): no ORM identity bookkeeping per segment
+        return select(
+            TranscriptSegment.position,
+            TranscriptSegment.start_time,
+            TranscriptSegment.end_time,
+            TranscriptSegment.speaker,
+            TranscriptSegment.text
+        ).where(TranscriptSegment.meeting_id == meeting_id)
+    
+    @staticmethod
+    def get_segments(db: Session, meeting_id: int) -> List[Dict[str, Any]]:
+        """A meeting's timestamped transcript segments in order, with speakers once diarized"""
+        query = MeetingService._select_segments(meeting_id).order_by(TranscriptSegment.position)
+        return MeetingService._segment_dicts(db.execute(query).all())
+    
+    @staticmethod
+    def get_segment_range(
+        db: Session,
+        meeting_id: int,
+        start_time: Optional[float] = None,
+        end_time: Optional[float] = None,
+        first: Optional[int] = None,
+        last: Optional[int] = None,
+        speaker: Optional[int] = None,
+        limit: int = 500
+    ) -> List[Dict[str, Any]]:
+        """
+        Segments overlapping [start_time, end_time) seconds and/or with IDs in
+        [first, last], in order, at most limit of them. Every bound is optional.
+        Segments are stored in time order, so a time range is turned into an
+        ID range by two lookups on (meeting_id, start_time), and only the rows
+        in it are read.
+        """
+        query = MeetingService._select_segments(meeting_id)
+        
+        def position_before(bound, inclusive):
+            # ID of the last segment starting before the bound
+            condition = TranscriptSegment.start_time <= bound if inclusive else TranscriptSegment.start_time < bound
+            return select(TranscriptSegment.position).where(
+                TranscriptSegment.meeting_id == meeting_id, condition
+            ).order_by(TranscriptSegment.start_time.desc()).limit(1).scalar_subquery()
+        
+        if start_time is not None:
+            # The segment under start_time may have begun before it
+            query = query.where(
+                TranscriptSegment.position >= func.coalesce(position_before(start_time, True), 0),
+                TranscriptSegment.end_time > start_time
+            )
+        if end_time is not None:
+            query = query.where(
+                TranscriptSegment.position <= func.coalesce(position_before(end_time, False), -1),
+                TranscriptSegment.start_time < end_time
+            )
+        if first is not None:
+            query = query.where(TranscriptSegment.position >= first)
+        if last is not None:
+            query = query.where(TranscriptSegment.position <= last)
+        if speaker is not None:
+            query = query.where(TranscriptSegment.speaker == speaker)
+        return MeetingService._segment_dicts(db.execute(query.order_by(TranscriptSegment.position).limit(limit)).all())
+    
+    @staticmethod
+    def get_segment_speakers(db: Session, meeting_id: int) -> List[int]:
+        """Speaker indexes that occur in a meeting's segments"""
+        rows = db.query(TranscriptSegment.speaker).filter(
+            TranscriptSegment.meeting_id == meeting_id,
+            TranscriptSegment.speaker.isnot(None)
+        ).distinct().all()
+        return sorted(row.speaker for row in rows)
+    
+    @staticmethod
+    def save_segments(db: Session, meeting_id: int, segments: List[Dict[str, Any]]):
+        """Replace a meeting's segments, e.g. with newly assigned speakers"""
+        MeetingService._write_segments(db, meeting_id, segments)
+        db.query(Meeting).filter(Meeting.id == meeting_id).update(
+            {Meeting.updated_at: datetime.utcnow()},
+            synchronize_session=False
+        )
+        SearchService.index_meeting(db, meeting_id)
+        db.commit()
+    
+    @staticmethod
+    def save_summary(db: Session, meeting_id: int, summary: str):
+        """Store a generated summary"""
+        db.query(Meeting).filter(Meeting.id == meeting_id).update(
+            {Meeting.summary: summary, Meeting.updated_at: datetime.utcnow()},
+            synchronize_session=False
+        )
+        SearchService.index_meeting(db, meeting_id)
+        db.commit()
+    
+    @staticmethod
+    def set_calendar_event_ids(db: Session, event_ids: Dict[int, Optional[str]]):
+        """Link meetings to calendar events (None unlinks) in one transaction"""
+        for meeting_id, event_id in event_ids.items():
+            db.query(Meeting).filter(Meeting.id == meeting_id).update(
+                {Meeting.calendar_event_id: event_id, Meeting.updated_at: datetime.utcnow()},
+                synchronize_session=False
+            )
+        db.commit()
+    
     @staticmethod
     def delete_meeting(db: Session, meeting_id: int):
         db_meeting = db.query(Meeting).filter(Meeting.id == meeting_id).first()
         if db_meeting:
+            SearchService.remove_meeting_documents(db, meeting_id)
+            MeetingService._delete_segments(db, meeting_id)
             db.delete(db_meeting)
             db.commit()
             return True
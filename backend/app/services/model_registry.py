@@ -0,0 +1,246 @@
+from app.core.config import settings
+from contextlib import contextmanager
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional
+import gc
+import os
+import threading
+import time
+
+# Heavy ML libraries (torch, whisper, transformers) are imported inside the
+# loaders, so importing this module - and the API - stays fast.
+
+_threads_configured = False
+
+def configure_torch_threads():
+    """
+    Apply TORCH_INTRA_OP_THREADS / TORCH_INTER_OP_THREADS once per process.
+    Must run before torch does any parallel work, so every loader calls it.
+    """
+    global _threads_configured
+    if _threads_configured:
+        return
+    import torch
+    if settings.TORCH_INTRA_OP_THREADS > 0:
+        torch.set_num_threads(settings.TORCH_INTRA_OP_THREADS)
+    if settings.TORCH_INTER_OP_THREADS > 0:
+        try:
+            torch.set_num_interop_threads(settings.TORCH_INTER_OP_THREADS)
+        except RuntimeError as e:
+            # Only possible before the first inter-op parallel call
+            print(f"Error setting inter-op threads: {str(e)}")
+    _threads_configured = True
+
+@contextmanager
+def inference_mode():
+    """torch.inference_mode() around model calls, unless TORCH_INFERENCE_MODE is off"""
+    if not settings.TORCH_INFERENCE_MODE:
+        yield
+        return
+    import torch
+    with torch.inference_mode():
+        yield
+
+def _device():
+    import torch
+    return 0 if torch.cuda.is_available() else -1
+
+def _prepare_for_inference(model, precision: str = "fp32"):
+    """
+    Put a torch model in eval mode with gradients off and, for "int8", swap its
+    Linear layers for dynamically quantized ones (CPU only).
+    """
+    import torch
+    model.eval()
+    for parameter in model.parameters():
+        parameter.requires_grad_(False)
+
+    if precision == "int8":
+        if next(model.parameters()).is_cuda:
+            print("int8 dynamic quantization is CPU-only; keeping fp32 weights on GPU")
+        else:
+            model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    elif precision != "fp32":
+        raise ValueError(f"Unknown inference precision: {precision}")
+    return model
+
+def load_whisper(size: Optional[str] = None):
+    import torch
+    import whisper
+    configure_torch_threads()
+    precision = settings.WHISPER_PRECISION
+    # Quantized weights only run on CPU, so don't move the model to the GPU for int8
+    device = "cuda" if torch.cuda.is_available() and precision == "fp32" else "cpu"
+    model = whisper.load_model(size or settings.WHISPER_MODEL_SIZE, device=device)
+    if precision == "int8":
+        # Whisper's Linear subclass only adds fp16 casting; quantize_dynamic
+        # matches exact types, so turn them back into plain Linear layers
+        for module in model.modules():
+            if isinstance(module, whisper.model.Linear):
+                module.__class__ = torch.nn.Linear
+    return _prepare_for_inference(model, precision)
+
+def load_vosk():
+    """A Vosk model from a local directory, or downloaded by name on first use"""
+    import vosk
+    vosk.SetLogLevel(-1)
+    if os.path.isdir(settings.VOSK_MODEL):
+        return vosk.Model(settings.VOSK_MODEL)
+    return vosk.Model(model_name=settings.VOSK_MODEL)
+
+def _load_seq2seq_pipeline(task: str, model_name: str, precision: str):
+    from transformers import pipeline, AutoModelForSeq2SeqLM, AutoTokenizer
+    configure_torch_threads()
+    tokenizer = AutoTokenizer.from_pretrained(
+        model_name,
+        cache_dir=settings.HUGGINGFACE_CACHE_DIR,
+        local_files_only=settings.HUGGINGFACE_OFFLINE
+    )
+    model = AutoModelForSeq2SeqLM.from_pretrained(
+        model_name,
+        cache_dir=settings.HUGGINGFACE_CACHE_DIR,
+        local_files_only=settings.HUGGINGFACE_OFFLINE
+    )
+    return pipeline(
+        task,
+        model=_prepare_for_inference(model, precision),
+        tokenizer=tokenizer,
+        device=-1 if precision == "int8" else _device()
+    )
+
+def load_summarizer():
+    return _load_seq2seq_pipeline("summarization", settings.SUMMARIZATION_MODEL, settings.SUMMARIZER_PRECISION)
+
+def load_generator():
+    return _load_seq2seq_pipeline("text2text-generation", settings.GENERATION_MODEL, settings.GENERATOR_PRECISION)
+
+def load_embedder():
+    """Sentence-embedding encoder and its tokenizer; pooling is done by EmbeddingService"""
+    import torch
+    from transformers import AutoModel, AutoTokenizer
+    configure_torch_threads()
+    tokenizer = AutoTokenizer.from_pretrained(
+        settings.EMBEDDING_MODEL,
+        cache_dir=settings.HUGGINGFACE_CACHE_DIR,
+        local_files_only=settings.HUGGINGFACE_OFFLINE
+    )
+    model = AutoModel.from_pretrained(
+        settings.EMBEDDING_MODEL,
+        cache_dir=settings.HUGGINGFACE_CACHE_DIR,
+        local_files_only=settings.HUGGINGFACE_OFFLINE
+    )
+    if torch.cuda.is_available():
+        model = model.to("cuda")
+    return tokenizer, _prepare_for_inference(model)
+
+class ModelRegistry:
+    """
+    Process-wide registry of inference models.
+
+    Each model is loaded once, on first use or up front via preload(), and
+    shared by every service in the process. Loading before a server forks its
+    workers (e.g. gunicorn --preload with MODEL_LOADING=eager) lets the
+    workers share the weights copy-on-write instead of each holding a copy.
+    """
+    _loaders: Dict[str, Callable[[], Any]] = {
+        "whisper": load_whisper,
+        "summarizer": load_summarizer,
+        "generator": load_generator,
+        "embedder": load_embedder,
+        "vosk": load_vosk,
+    }
+    _models: Dict[str, Any] = {}
+    _status: Dict[str, Dict[str, Any]] = {}
+    _locks: Dict[str, threading.Lock] = {name: threading.Lock() for name in _loaders}
+
+    @staticmethod
+    def register(name: str, loader: Callable[[], Any]):
+        """Register (or replace) the loader for a model"""
+        ModelRegistry._loaders[name] = loader
+        ModelRegistry._locks.setdefault(name, threading.Lock())
+
+    @staticmethod
+    def get(name: str) -> Any:
+        """Return a loaded model, loading it on first use"""
+        model = ModelRegistry._models.get(name)
+        if model is not None:
+            return model
+        if name not in ModelRegistry._loaders and name.startswith("whisper-"):
+            # Whisper in a size other than WHISPER_MODEL_SIZE, e.g. "whisper-tiny"
+            ModelRegistry.register(name, partial(load_whisper, name[len("whisper-"):]))
+        if name not in ModelRegistry._loaders:
+            raise KeyError(f"Unknown model: {name}")
+
+        with ModelRegistry._locks[name]:
+            # Another thread may have finished loading while we waited
+            if name in ModelRegistry._models:
+                return ModelRegistry._models[name]
+
+            ModelRegistry._status[name] = {"state": "loading"}
+            start = time.perf_counter()
+            try:
+                model = ModelRegistry._loaders[name]()
+            except Exception as e:
+                ModelRegistry._status[name] = {"state": "failed", "error": str(e)}
+                raise
+            ModelRegistry._models[name] = model
+            ModelRegistry._status[name] = {
+                "state": "ready",
+                "load_seconds": round(time.perf_counter() - start, 2),
+                "pid": os.getpid()
+            }
+            return model
+
+    @staticmethod
+    def is_loaded(name: str) -> bool:
+        return name in ModelRegistry._models
+
+    @staticmethod
+    def preload(names: List[str] = None):
+        """
+        Load models up front. Afterwards the loaded objects are moved out of
+        the garbage collector's tracked generations, so collections in forked
+        workers don't write to (and un-share) the pages holding them.
+        """
+        for name in names if names is not None else ModelRegistry.preload_names():
+            try:
+                ModelRegistry.get(name)
+            except Exception as e:
+                # Unknown names fail before get() records a state
+                ModelRegistry._status.setdefault(name, {"state": "failed", "error": str(e)})
+                print(f"Error preloading model {name}: {str(e)}")
+        gc.freeze()
+
+    @staticmethod
+    def preload_in_background() -> threading.Thread:
+        """Preload models on a daemon thread so the server can answer while warming up"""
+        thread = threading.Thread(target=ModelRegistry.preload, name="model-preload", daemon=True)
+        thread.start()
+        return thread
+
+    @staticmethod
+    def preload_names() -> List[str]:
+        """Models named in PRELOAD_MODELS"""
+        return [name.strip() for name in settings.PRELOAD_MODELS.split(",") if name.strip()]
+
+    @staticmethod
+    def get_status() -> Dict[str, Any]:
+        """
+        Loading state of every registered model, whether preloading is done
+        and the preloads that failed, with their errors. A failed model is
+        retried on first use.
+        """
+        models = {
+            name: ModelRegistry._status.get(name, {"state": "not_loaded"})
+            for name in ModelRegistry._loaders
+        }
+        if settings.MODEL_LOADING in ("eager", "background"):
+            preloads = {name: ModelRegistry._status.get(name, {}) for name in ModelRegistry.preload_names()}
+        else:
+            preloads = {}
+        return {
+            "loading": settings.MODEL_LOADING,
+            "ready": all(status.get("state") in ("ready", "failed") for status in preloads.values()),
+            "failed": {name: status.get("error") for name, status in preloads.items() if status.get("state") == "failed"},
+            "models": models
+        }
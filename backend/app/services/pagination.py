@@ -0,0 +1,31 @@
+from fastapi import HTTPException, Response
+from typing import Any, Dict, List, Optional
+import base64
+import json
+
+# Response header carrying the cursor for the next page
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+def encode_cursor(values: Dict[str, Any]) -> str:
+    """Opaque, URL-safe cursor for the position after a row"""
+    raw = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str, key: str = "id") -> int:
+    """Read the row ID out of a cursor from encode_cursor; 400 if it's malformed"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        return int(json.loads(base64.urlsafe_b64decode(padded.encode()))[key])
+    except (ValueError, TypeError, KeyError, json.JSONDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+
+def set_next_cursor(response: Response, rows: List[Any], limit: int, key: str = "id") -> Optional[str]:
+    """
+    Put the cursor for the page after rows in the X-Next-Cursor header. A
+    page shorter than limit is the last one and gets no header.
+    """
+    if not rows or len(rows) < limit:
+        return None
+    cursor = encode_cursor({key: getattr(rows[-1], key)})
+    response.headers[NEXT_CURSOR_HEADER] = cursor
+    return cursor
@@ -0,0 +1,292 @@
+from sqlalchemy import DateTime, bindparam, func, insert, literal, select, text
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.models import Meeting, ActionItem, Decision, SearchDocument, TranscriptSegment, search_tsvector
+from app.services.diarization import has_speakers, speaker_label, turn_spans
+from fastapi import HTTPException
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+import re
+
+SEARCH_KINDS = ("transcript", "summary", "action_item", "decision")
+
+# Highlight markers around matched terms in snippets
+SNIPPET_START = "<mark>"
+SNIPPET_END = "</mark>"
+
+def _join(*parts: Optional[str]) -> str:
+    return " ".join(part or "" for part in parts)
+
+def _fts5_query(query: str) -> str:
+    """
+    Turn free text into an FTS5 MATCH expression: every word must match,
+    "quoted phrases" match as phrases and word* matches as a prefix. Words are
+    quoted so FTS5 operators in the input are plain text.
+    """
+    terms = []
+    for phrase, word, star in re.findall(r'"([^"]*)"|(\w+)(\*?)', query):
+        words = re.findall(r"\w+", phrase) if phrase else [word] if word else []
+        if words:
+            terms.append('"' + " ".join(words) + '"' + star)
+    return " ".join(terms)
+
+class SearchService:
+    @staticmethod
+    def _upsert_documents(db: Session, kind: str, documents: Dict[int, Dict[str, Any]]):
+        """Insert or update search documents of one kind, keyed by item ID; None removes one"""
+        if not documents:
+            return
+        existing = {
+            row.item_id: row
+            for row in db.query(SearchDocument).filter(
+                SearchDocument.kind == kind,
+                SearchDocument.item_id.in_(list(documents))
+            ).all()
+        }
+        for item_id, document in documents.items():
+            row = existing.get(item_id)
+            if document is None:
+                if row is not None:
+                    db.delete(row)
+            elif row is None:
+                db.add(SearchDocument(kind=kind, item_id=item_id, **document))
+            else:
+                # Unchanged values don't produce an UPDATE, so the index isn't rewritten
+                for field, value in document.items():
+                    setattr(row, field, value)
+
+    @staticmethod
+    def _turn_documents(db: Session, meeting_id: int, title: Optional[str]) -> Dict[int, Dict[str, Any]]:
+        """A diarized transcript's speaker turns, keyed by their first segment's ID; none without speakers"""
+        rows = db.execute(
+            select(
+                TranscriptSegment.id,
+                TranscriptSegment.start_time,
+                TranscriptSegment.end_time,
+                TranscriptSegment.speaker,
+                TranscriptSegment.text
+            ).where(TranscriptSegment.meeting_id == meeting_id).order_by(TranscriptSegment.position)
+        ).all()
+        segments = [
+            {"id": row.id, "start": row.start_time, "end": row.end_time, "speaker": row.speaker, "text": row.text}
+            for row in rows
+        ]
+        if not has_speakers(segments):
+            return {}
+        return {
+            segments[first]["id"]: {
+                "meeting_id": meeting_id,
+                "title": title,
+                "body": " ".join(segment["text"] for segment in segments[first:last]),
+                "speaker": segments[first]["speaker"],
+                "start_time": segments[first]["start"],
+                "end_time": segments[last - 1]["end"]
+            }
+            for first, last in turn_spans(segments, settings.SEARCH_TURN_WORDS)
+        }
+
+    @staticmethod
+    def index_meeting(db: Session, meeting_id: int):
+        """
+        Reindex a meeting's transcript and summary; call after its changes are
+        flushed. A diarized transcript is indexed per speaker turn, so a hit
+        says who spoke and when.
+        """
+        row = db.query(Meeting.title, Meeting.transcript, Meeting.summary).filter(Meeting.id == meeting_id).first()
+        if row is None:
+            return
+        title, transcript, summary = row
+        turns = SearchService._turn_documents(db, meeting_id, title)
+        # Segments are rewritten with new IDs, so turns not found again are removed
+        stale = db.query(SearchDocument.item_id).filter(
+            SearchDocument.kind == "turn",
+            SearchDocument.meeting_id == meeting_id
+        ).all()
+        SearchService._upsert_documents(db, "turn", {**{item_id: None for item_id, in stale}, **turns})
+        if turns:
+            transcript = None
+        for kind, body in (("transcript", transcript), ("summary", summary)):
+            document = {"meeting_id": meeting_id, "title": title, "body": body} if body else None
+            SearchService._upsert_documents(db, kind, {meeting_id: document})
+
+    @staticmethod
+    def index_action_items(db: Session, action_items: Iterable[ActionItem]):
+        """Reindex flushed action items"""
+        SearchService._upsert_documents(db, "action_item", {
+            item.id: {
+                "meeting_id": item.meeting_id,
+                "title": item.title,
+                "body": _join(item.description, item.assignee)
+            } if item.meeting_id is not None else None
+            for item in action_items
+        })
+
+    @staticmethod
+    def index_decisions(db: Session, decisions: Iterable[Decision]):
+        """Reindex flushed decisions"""
+        SearchService._upsert_documents(db, "decision", {
+            decision.id: {
+                "meeting_id": decision.meeting_id,
+                "title": decision.title,
+                "body": _join(decision.description, decision.decision_maker, decision.rationale)
+            } if decision.meeting_id is not None else None
+            for decision in decisions
+        })
+
+    @staticmethod
+    def remove_documents(db: Session, kind: str, item_ids: List[int]):
+        """Drop the search documents of deleted items"""
+        db.query(SearchDocument).filter(
+            SearchDocument.kind == kind,
+            SearchDocument.item_id.in_(item_ids)
+        ).delete(synchronize_session=False)
+
+    @staticmethod
+    def remove_meeting_documents(db: Session, meeting_id: int):
+        """Drop every search document that belongs to a meeting"""
+        db.query(SearchDocument).filter(SearchDocument.meeting_id == meeting_id).delete(synchronize_session=False)
+
+    @staticmethod
+    def rebuild_index(db: Session) -> int:
+        """
+        Rebuild every search document from the source tables, in SQL except for
+        diarized transcripts' turns; returns the document count
+        """
+        db.query(SearchDocument).delete(synchronize_session=False)
+        columns = ["kind", "item_id", "meeting_id", "title", "body"]
+        sources = [
+            select(literal("transcript"), Meeting.id, Meeting.id, Meeting.title, Meeting.transcript)
+                .where(Meeting.transcript.isnot(None), Meeting.transcript != ""),
+            select(literal("summary"), Meeting.id, Meeting.id, Meeting.title, Meeting.summary)
+                .where(Meeting.summary.isnot(None), Meeting.summary != ""),
+            select(
+                literal("action_item"), ActionItem.id, ActionItem.meeting_id, ActionItem.title,
+                func.coalesce(ActionItem.description, "") + " " + func.coalesce(ActionItem.assignee, "")
+            ).where(ActionItem.meeting_id.isnot(None)),
+            select(
+                literal("decision"), Decision.id, Decision.meeting_id, Decision.title,
+                func.coalesce(Decision.description, "") + " " + func.coalesce(Decision.decision_maker, "")
+                + " " + func.coalesce(Decision.rationale, "")
+            ).where(Decision.meeting_id.isnot(None)),
+        ]
+        for source in sources:
+            db.execute(insert(SearchDocument).from_select(columns, source))
+        diarized = db.query(TranscriptSegment.meeting_id).filter(TranscriptSegment.speaker.isnot(None)).distinct().all()
+        for meeting_id, in diarized:
+            SearchService.index_meeting(db, meeting_id)
+        db.commit()
+        return db.query(func.count(SearchDocument.id)).scalar()
+
+    @staticmethod
+    def search(
+        db: Session,
+        query: str,
+        kinds: Optional[List[str]] = None,
+        meeting_id: Optional[int] = None,
+        status: Optional[str] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        skip: int = 0,
+        limit: int = 20
+    ) -> List[Dict[str, Any]]:
+        """Ranked full-text matches with highlighted snippets, best first"""
+        params: Dict[str, Any] = {"skip": skip, "limit": limit}
+        typed = []
+        filters = []
+        if kinds:
+            unknown = [kind for kind in kinds if kind not in SEARCH_KINDS]
+            if unknown:
+                raise HTTPException(status_code=400, detail=f"Unknown search kinds: {unknown}")
+            names = []
+            # Diarized transcripts are stored as turns
+            for i, kind in enumerate(kinds + ["turn"] if "transcript" in kinds else kinds):
+                params[f"kind_{i}"] = kind
+                names.append(f":kind_{i}")
+            filters.append(f"d.kind IN ({', '.join(names)})")
+        if meeting_id is not None:
+            filters.append("d.meeting_id = :meeting_id")
+            params["meeting_id"] = meeting_id
+        if status:
+            filters.append("m.status = :status")
+            params["status"] = status
+        if date_from:
+            filters.append("m.date >= :date_from")
+            params["date_from"] = date_from
+            typed.append(bindparam("date_from", type_=DateTime))
+        if date_to:
+            filters.append("m.date <= :date_to")
+            params["date_to"] = date_to
+            typed.append(bindparam("date_to", type_=DateTime))
+        where = "".join(f" AND {condition}" for condition in filters)
+        # The ranking query only joins what its filters need; titles and
+        # snippets are then computed for the returned page alone
+        joins = ""
+        if filters:
+            joins += " JOIN search_documents d ON d.id = {id}"
+        if status or date_from or date_to:
+            joins += " JOIN meetings m ON m.id = d.meeting_id"
+
+        dialect = db.get_bind().dialect.name
+        if dialect == "sqlite":
+            params["query"] = _fts5_query(query)
+            if not params["query"]:
+                return []
+            # bm25() is lower for better matches; title hits weigh five times body
+            # hits. snippet() needs a second MATCH; running it once over the
+            # page's rowid range (CROSS JOIN keeps FTS5 as the outer loop) costs
+            # far less than one lookup per hit for prefix queries
+            statement = f"""
+                WITH hits AS (
+                    SELECT search_documents_fts.rowid AS id, bm25(search_documents_fts, 5.0, 1.0) AS rank
+                    FROM search_documents_fts{joins.format(id="search_documents_fts.rowid")}
+                    WHERE search_documents_fts MATCH :query{where}
+                    ORDER BY rank
+                    LIMIT :limit OFFSET :skip
+                )
+                SELECT d.kind, d.item_id, d.meeting_id, d.title, m.title AS meeting_title, m.date AS meeting_date,
+                       d.speaker, d.start_time, d.end_time,
+                       snippet(search_documents_fts, -1, '{SNIPPET_START}', '{SNIPPET_END}', '…', 24) AS snippet,
+                       -hits.rank AS score
+                FROM search_documents_fts
+                CROSS JOIN hits ON hits.id = search_documents_fts.rowid
+                JOIN search_documents d ON d.id = hits.id
+                JOIN meetings m ON m.id = d.meeting_id
+                WHERE search_documents_fts MATCH :query
+                  AND search_documents_fts.rowid BETWEEN (SELECT min(id) FROM hits) AND (SELECT max(id) FROM hits)
+                ORDER BY hits.rank
+            """
+        elif dialect == "postgresql":
+            params["query"] = query
+            statement = f"""
+                WITH hits AS (
+                    SELECT s.id, ts_rank_cd({search_tsvector("s")}, q) AS score
+                    FROM search_documents s{joins.format(id="s.id")},
+                         websearch_to_tsquery('english', :query) q
+                    WHERE ({search_tsvector("s")}) @@ q{where}
+                    ORDER BY score DESC
+                    LIMIT :limit OFFSET :skip
+                )
+                SELECT d.kind, d.item_id, d.meeting_id, d.title, m.title AS meeting_title, m.date AS meeting_date,
+                       d.speaker, d.start_time, d.end_time,
+                       ts_headline('english', coalesce(d.body, ''), q,
+                                   'StartSel={SNIPPET_START}, StopSel={SNIPPET_END}, MaxWords=24, MinWords=12') AS snippet,
+                       hits.score
+                FROM hits
+                JOIN search_documents d ON d.id = hits.id
+                JOIN meetings m ON m.id = d.meeting_id,
+                     websearch_to_tsquery('english', :query) q
+                ORDER BY hits.score DESC
+            """
+        else:
+            raise HTTPException(status_code=501, detail=f"Search is not supported on {dialect} databases")
+
+        # Typed so SQLite's date strings come back as datetimes
+        statement = text(statement).bindparams(*typed).columns(meeting_date=DateTime)
+        results = []
+        for row in db.execute(statement, params).mappings():
+            result = dict(row)
+            if result["kind"] == "turn":
+                # Reported like a whole transcript, plus who spoke and when
+                result.update(kind="transcript", item_id=result["meeting_id"], speaker=speaker_label(result["speaker"]))
+            results.append(result)
+        return results
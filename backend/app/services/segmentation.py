@@ -0,0 +1,80 @@
+from typing import List, Tuple
+import numpy as np
+
+SAMPLE_RATE = 16000
+# Frames of energy computed per step (about 2 minutes of 30 ms frames)
+ENERGY_BLOCK_FRAMES = 4096
+
+def detect_speech_segments(
+    samples: np.ndarray,
+    sample_rate: int = SAMPLE_RATE,
+    frame_ms: int = 30,
+    energy_threshold: float = None,
+    min_silence_ms: int = 500,
+    max_segment_seconds: float = 60.0,
+    padding_ms: int = 200
+) -> List[Tuple[int, int]]:
+    """
+    Energy-based voice activity detection.
+
+    Frames whose RMS energy is above the threshold count as speech. Speech runs
+    separated by less than min_silence_ms are merged, then runs are grouped
+    into segments of at most max_segment_seconds, cutting only at silences.
+    Returns (start_sample, end_sample) pairs in order.
+
+    When no threshold is given it adapts to the recording: a fraction of the
+    way between the quiet floor and the typical loud level.
+    """
+    frame_length = max(1, int(sample_rate * frame_ms / 1000))
+    num_frames = len(samples) // frame_length
+    if num_frames == 0:
+        return [(0, len(samples))] if len(samples) else []
+
+    # Block by block, so a memory-mapped recording is read through once
+    # rather than squared into memory as a whole
+    energy = np.empty(num_frames, dtype=np.float32)
+    for first in range(0, num_frames, ENERGY_BLOCK_FRAMES):
+        last = min(num_frames, first + ENERGY_BLOCK_FRAMES)
+        frames = np.asarray(samples[first * frame_length:last * frame_length]).reshape(last - first, frame_length)
+        energy[first:last] = np.sqrt(np.mean(np.square(frames, dtype=np.float32), axis=1))
+
+    if energy_threshold is None:
+        floor = np.percentile(energy, 10)
+        loud = np.percentile(energy, 90)
+        energy_threshold = max(floor + 0.1 * (loud - floor), 1e-4)
+
+    speech = energy > energy_threshold
+    if not speech.any():
+        return []
+
+    # Speech runs as [start_frame, end_frame)
+    edges = np.diff(np.concatenate(([0], speech.astype(np.int8), [0])))
+    run_starts = np.flatnonzero(edges == 1)
+    run_ends = np.flatnonzero(edges == -1)
+
+    # Merge runs separated by short pauses
+    min_silence_frames = max(1, min_silence_ms // frame_ms)
+    runs = [[run_starts[0], run_ends[0]]]
+    for start, end in zip(run_starts[1:], run_ends[1:]):
+        if start - runs[-1][1] < min_silence_frames:
+            runs[-1][1] = end
+        else:
+            runs.append([start, end])
+
+    # Group runs into segments no longer than max_segment_seconds, except
+    # where a single uninterrupted run is longer than that on its own
+    max_frames = max(1, int(max_segment_seconds * 1000 / frame_ms))
+    segments = []
+    segment_start, segment_end = runs[0]
+    for start, end in runs[1:]:
+        if end - segment_start > max_frames:
+            segments.append((segment_start, segment_end))
+            segment_start = start
+        segment_end = end
+    segments.append((segment_start, segment_end))
+
+    padding = int(sample_rate * padding_ms / 1000)
+    return [
+        (max(0, int(start) * frame_length - padding), min(len(samples), int(end) * frame_length + padding))
+        for start, end in segments
+    ]
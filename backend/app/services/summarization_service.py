@@ -1,10 +1,48 @@
-from transformers import pipeline, AutoModelForSeq2SeqLM, AutoTokenizer
 from fastapi import HTTPException
 from app.core.config import settings
-from typing import List, Dict, Any
+from app.services.model_registry import ModelRegistry, inference_mode
+from app.services.chunking import chunk_text, chunk_segments, chunk_turns, ChunkedText
+from app.services.diarization import has_speakers, labelled_transcript, speaker_label, speaker_turns
+from app.services.cache_service import ResultCache, text_sha256
+from app.services.text_utils import normalize_title
+from typing import List, Dict, Any, Optional, Tuple
 import json
-import os
-import torch
+import math
+
+# BART accepts 1024 positions; leave room for the <s> and </s> tokens
+MAX_CHUNK_TOKENS = 1022
+
+# Decoding presets for summaries. "quality" is beam search, as BART-CNN was
+# tuned for, stopping once every beam has finished; "fast" decodes greedily.
+# Beams come from SUMMARY_NUM_BEAMS, repeat blocking from SUMMARY_NO_REPEAT_NGRAM_SIZE.
+SUMMARY_PRESETS = ("quality", "fast")
+
+# Per-chunk length budgets are rounded up to a multiple of this, so chunks of
+# similar size still share a batch
+LENGTH_BUDGET_STEP = 16
+
+# Generation settings for action item and decision extraction
+EXTRACTION_PARAMS = {"max_length": 1024, "num_return_sequences": 1, "temperature": 0.7}
+
+# One prompt that asks for both lists, so each transcript chunk is encoded once
+COMBINED_EXTRACTION_PROMPT = """Extract action items and decisions from this part of a meeting transcript.
+For each action item, identify the task title, a description, the assignee and the due date (if mentioned).
+For each decision, identify what was decided (title), a description, the decision maker and the rationale.
+Include implied tasks, next steps, agreements and conclusions, not only explicit ones.
+
+Format the response as a JSON object with two arrays:
+{{
+  "action_items": [{{"title": "...", "description": "...", "assignee": "...", "due_date": "..."}}],
+  "decisions": [{{"title": "...", "description": "...", "decision_maker": "...", "rationale": "..."}}]
+}}
+Use empty arrays if there is nothing to report.
+{speaker_hint}
+Meeting transcript:
+{transcript}"""
+
+# Added to the prompt when the transcript lines carry speaker labels
+SPEAKER_HINT = """Each line starts with its speaker ("Speaker 1: ..."). Use these labels for assignees and decision makers when no name is given.
+"""
 
 class SummarizationService:
     _summarizer = None
@@ -12,40 +50,25 @@ class SummarizationService:
     _tokenizer = None
 
     @staticmethod
-    def _load_models():
-        """Load or initialize the models"""
+    def _load_summarizer():
+        """Fetch the BART summarization pipeline from the model registry"""
         if SummarizationService._summarizer is None:
             try:
-                # Create cache directory if it doesn't exist
-                os.makedirs(settings.HUGGINGFACE_CACHE_DIR, exist_ok=True)
-                
-                # Load summarization model and tokenizer (using a smaller model)
-                model_name = "facebook/bart-large-cnn"
-                SummarizationService._tokenizer = AutoTokenizer.from_pretrained(
-                    model_name,
-                    cache_dir=settings.HUGGINGFACE_CACHE_DIR
-                )
-                model = AutoModelForSeq2SeqLM.from_pretrained(
-                    model_name,
-                    cache_dir=settings.HUGGINGFACE_CACHE_DIR
-                )
-                
-                # Create summarization pipeline
-                SummarizationService._summarizer = pipeline(
-                    "summarization",
-                    model=model,
-                    tokenizer=SummarizationService._tokenizer,
-                    device=0 if torch.cuda.is_available() else -1
-                )
-                
-                # Load text generation model (using a larger model for better extraction)
-                # Use flan-t5-large or flan-t5-xl for better results if GPU memory allows
-                generation_model = "google/flan-t5-large"
-                SummarizationService._text_generator = pipeline(
-                    "text2text-generation",
-                    model=generation_model,
-                    device=0 if torch.cuda.is_available() else -1
+                summarizer = ModelRegistry.get("summarizer")
+                SummarizationService._tokenizer = summarizer.tokenizer
+                SummarizationService._summarizer = summarizer
+            except Exception as e:
+                raise HTTPException(
+                    status_code=500,
+                    detail=f"Error loading models: {str(e)}"
                 )
+
+    @staticmethod
+    def _load_generator():
+        """Fetch the Flan-T5 extraction pipeline from the model registry"""
+        if SummarizationService._text_generator is None:
+            try:
+                SummarizationService._text_generator = ModelRegistry.get("generator")
             except Exception as e:
                 raise HTTPException(
                     status_code=500,
@@ -53,81 +76,425 @@ class SummarizationService:
                 )
 
     @staticmethod
-    def summarize_text(text: str, max_length: int = None, min_length: int = 30):
+    def _load_models():
+        """Load or initialize the models"""
+        SummarizationService._load_summarizer()
+        SummarizationService._load_generator()
+
+    @staticmethod
+    def _chunk(text: str, max_chunk_length: int = MAX_CHUNK_TOKENS) -> ChunkedText:
+        """Tokenize text once and split it into chunks that fit the summarizer"""
+        return chunk_text(
+            SummarizationService._tokenizer,
+            text,
+            max_tokens=max_chunk_length,
+            overlap_tokens=settings.CHUNK_OVERLAP_TOKENS
+        )
+
+    @staticmethod
+    def _chunk_segments(segments: List[Dict[str, Any]], max_chunk_length: int = MAX_CHUNK_TOKENS) -> ChunkedText:
+        """Pack whole transcript segments into chunks that fit the summarizer"""
+        return chunk_segments(
+            SummarizationService._tokenizer,
+            [segment["text"] for segment in segments],
+            max_tokens=max_chunk_length,
+            overlap_tokens=settings.CHUNK_OVERLAP_TOKENS
+        )
+
+    @staticmethod
+    def generation_params(preset: Optional[str] = None) -> Dict[str, Any]:
+        """Decoding settings of a summary preset (default SUMMARY_PRESET)"""
+        preset = preset or settings.SUMMARY_PRESET
+        if preset not in SUMMARY_PRESETS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown summary preset: {preset}. Use {' or '.join(SUMMARY_PRESETS)}"
+            )
+        params = {"no_repeat_ngram_size": settings.SUMMARY_NO_REPEAT_NGRAM_SIZE}
+        if preset == "fast" or settings.SUMMARY_NUM_BEAMS <= 1:
+            params["num_beams"] = 1
+        else:
+            params.update(num_beams=settings.SUMMARY_NUM_BEAMS, early_stopping=True)
+        return params
+
+    @staticmethod
+    def _length_budget(num_tokens: int, max_length: Optional[int], min_length: int) -> Tuple[int, int]:
+        """
+        (max_length, min_length) for summarizing num_tokens tokens. Without an
+        explicit max_length the budget is SUMMARY_RATIO of the chunk, capped
+        at SUMMARY_MAX_TOKENS, so no chunk asks for more than it can say.
+        """
+        if max_length is None:
+            budget = math.ceil(num_tokens * settings.SUMMARY_RATIO / LENGTH_BUDGET_STEP) * LENGTH_BUDGET_STEP
+            max_length = min(settings.SUMMARY_MAX_TOKENS, max(budget, LENGTH_BUDGET_STEP))
+        # Short chunks aren't padded out to min_length
+        return max_length, max(1, min(min_length, max_length // 2, num_tokens // 2))
+
+    @staticmethod
+    def _summarize_batched(
+        chunks: List[str],
+        max_length: int,
+        min_length: int,
+        batch_size: int,
+        params: Optional[Dict[str, Any]] = None
+    ) -> List[str]:
         """
-        Summarize text using Hugging Face's BART model
+        Run chunks through the summarizer in padded batches. Chunks are sorted by
+        length first so each batch pads to a similar size; results come back
+        in the original order. params holds decoding settings (generation_params).
         """
+        if not chunks:
+            return []
+        
+        order = sorted(range(len(chunks)), key=lambda i: len(chunks[i]), reverse=True)
+        with inference_mode():
+            outputs = SummarizationService._summarizer(
+                [chunks[i] for i in order],
+                max_length=max_length,
+                min_length=min_length,
+                do_sample=False,
+                truncation=True,
+                batch_size=batch_size,
+                **(params or {})
+            )
+        
+        summaries = [None] * len(chunks)
+        for i, output in zip(order, outputs):
+            summaries[i] = output['summary_text']
+        return summaries
+
+    @staticmethod
+    def summary_cache_key(
+        text: str,
+        max_length: int = None,
+        min_length: int = 30,
+        by_segments: bool = False,
+        preset: Optional[str] = None
+    ) -> str:
+        """Result cache key for a summary of text with the given length and decoding settings"""
+        params = {
+            "max_length": max_length,
+            "min_length": min_length,
+            "chunk_overlap": settings.CHUNK_OVERLAP_TOKENS,
+            "precision": settings.SUMMARIZER_PRECISION,
+            "generation": SummarizationService.generation_params(preset)
+        }
+        if max_length is None:
+            params.update(ratio=settings.SUMMARY_RATIO, max_tokens=settings.SUMMARY_MAX_TOKENS)
+        if by_segments:
+            # Chunk boundaries differ from chunking the text, and so can the summary
+            params["chunking"] = "segments"
+        return ResultCache.make_key(text_sha256(text), settings.SUMMARIZATION_MODEL, params)
+
+    @staticmethod
+    def summarize_texts(
+        texts: List[str],
+        max_length: int = None,
+        min_length: int = 30,
+        batch_size: int = None,
+        segments: Optional[List[Optional[List[Dict[str, Any]]]]] = None,
+        preset: Optional[str] = None
+    ) -> List[str]:
+        """
+        Summarize several texts (e.g. transcripts of different meetings) at once.
+        Chunks from all texts that share generation settings are batched together;
+        texts summarized before with the same settings come from the result cache.
+        segments, if given, holds each text's timestamped transcript segments
+        (or None); chunks are then built from whole segments. preset is
+        "quality" or "fast" (default SUMMARY_PRESET).
+        """
+        segments = segments or [None] * len(texts)
+        keys = [
+            SummarizationService.summary_cache_key(text, max_length, min_length, bool(text_segments), preset)
+            for text, text_segments in zip(texts, segments)
+        ]
+        results = [ResultCache.get("summary", key) for key in keys]
+        
+        misses = [i for i, result in enumerate(results) if result is None]
+        if misses:
+            summaries = SummarizationService._summarize_texts(
+                [texts[i] for i in misses], max_length, min_length, batch_size, [segments[i] for i in misses], preset
+            )
+            for i, summary in zip(misses, summaries):
+                ResultCache.set("summary", keys[i], summary)
+                results[i] = summary
+        
+        return results
+
+    @staticmethod
+    def _summarize_texts(
+        texts: List[str],
+        max_length: int = None,
+        min_length: int = 30,
+        batch_size: int = None,
+        segments: Optional[List[Optional[List[Dict[str, Any]]]]] = None,
+        preset: Optional[str] = None
+    ) -> List[str]:
+        """Summarize texts without consulting the result cache"""
+        params = SummarizationService.generation_params(preset)
         try:
             # Load model if not already loaded
-            SummarizationService._load_models()
+            SummarizationService._load_summarizer()
             
-            # Calculate appropriate max_length if not provided
-            if max_length is None:
-                # Tokenize the input text
-                tokens = SummarizationService._tokenizer.encode(text)
-                # Set max_length to 50% of input length, but not less than min_length
-                max_length = max(min_length, len(tokens) // 2)
+            if batch_size is None:
+                batch_size = settings.SUMMARIZATION_BATCH_SIZE
             
-            # Split text into chunks if it's too long
-            max_chunk_length = 1024
-            chunks = []
-            current_chunk = []
-            current_length = 0
-            
-            for sentence in text.split('.'):
-                sentence = sentence.strip() + '.'
-                sentence_length = len(SummarizationService._tokenizer.encode(sentence))
-                
-                if current_length + sentence_length > max_chunk_length:
-                    if current_chunk:
-                        chunks.append(' '.join(current_chunk))
-                    current_chunk = [sentence]
-                    current_length = sentence_length
+            # Chunk every text, giving each chunk a length budget of its own
+            text_chunks = []
+            for text, text_segments in zip(texts, segments or [None] * len(texts)):
+                if text_segments:
+                    chunked = SummarizationService._chunk_segments(text_segments)
                 else:
-                    current_chunk.append(sentence)
-                    current_length += sentence_length
-            
-            if current_chunk:
-                chunks.append(' '.join(current_chunk))
+                    chunked = SummarizationService._chunk(text)
+                text_chunks.append([
+                    (chunk.text, SummarizationService._length_budget(chunk.num_tokens, max_length, min_length))
+                    for chunk in chunked.chunks
+                ])
             
-            # Summarize each chunk
-            summaries = []
-            for chunk in chunks:
-                summary = SummarizationService._summarizer(
-                    chunk,
-                    max_length=max_length,
-                    min_length=min_length,
-                    do_sample=False,
-                    truncation=True
-                )[0]['summary_text']
-                summaries.append(summary)
-            
-            # Combine summaries
-            final_summary = ' '.join(summaries)
+            # Batch all chunks with the same budget together
+            chunk_summaries = [[None] * len(chunks) for chunks in text_chunks]
+            groups = {}
+            for t, chunks in enumerate(text_chunks):
+                for c, (_, budget) in enumerate(chunks):
+                    groups.setdefault(budget, []).append((t, c))
+            for (length, minimum), positions in groups.items():
+                summaries = SummarizationService._summarize_batched(
+                    [text_chunks[t][c][0] for t, c in positions], length, minimum, batch_size, params
+                )
+                for (t, c), summary in zip(positions, summaries):
+                    chunk_summaries[t][c] = summary
             
-            # If the final summary is too long, summarize it again
-            if len(SummarizationService._tokenizer.encode(final_summary)) > max_chunk_length:
-                final_summary = SummarizationService._summarizer(
-                    final_summary,
-                    max_length=max_length,
-                    min_length=min_length,
-                    do_sample=False,
-                    truncation=True
-                )[0]['summary_text']
+            # Combine summaries, summarizing again any that are still too long
+            final_summaries = [' '.join(summaries) for summaries in chunk_summaries]
+            groups = {}
+            for t, summary in enumerate(final_summaries):
+                num_tokens = len(SummarizationService._tokenizer.encode(summary))
+                if num_tokens > MAX_CHUNK_TOKENS:
+                    budget = SummarizationService._length_budget(MAX_CHUNK_TOKENS, max_length, min_length)
+                    groups.setdefault(budget, []).append(t)
+            for (length, minimum), group in groups.items():
+                summaries = SummarizationService._summarize_batched(
+                    [final_summaries[t] for t in group], length, minimum, batch_size, params
+                )
+                for t, summary in zip(group, summaries):
+                    final_summaries[t] = summary
             
-            return final_summary
+            return final_summaries
             
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Summarization error: {str(e)}")
+
+    @staticmethod
+    def summarize_text(
+        text: str,
+        max_length: int = None,
+        min_length: int = 30,
+        batch_size: int = None,
+        segments: Optional[List[Dict[str, Any]]] = None,
+        preset: Optional[str] = None
+    ):
+        """
+        Summarize text using Hugging Face's BART model. With the transcript's
+        timestamped segments, chunks end on segment boundaries.
+        """
+        return SummarizationService.summarize_texts([text], max_length, min_length, batch_size, [segments], preset)[0]
     
+    @staticmethod
+    def extraction_cache_key(text: str) -> str:
+        """Result cache key for action item or decision extraction from text"""
+        params = dict(EXTRACTION_PARAMS, precision=settings.GENERATOR_PRECISION)
+        return ResultCache.make_key(text_sha256(text), settings.GENERATION_MODEL, params)
+
+    @staticmethod
+    def _cached_extraction(namespace: str, text: str, extract) -> List[Dict[str, Any]]:
+        """Serve an extraction from the result cache, running it on a miss"""
+        key = SummarizationService.extraction_cache_key(text)
+        cached = ResultCache.get(namespace, key)
+        if cached is not None:
+            return cached
+        
+        items = extract(text)
+        if items is None:
+            # Extraction failed; don't cache the failure
+            return []
+        ResultCache.set(namespace, key, items)
+        return items
+
     @staticmethod
     def extract_action_items(text: str) -> List[Dict[str, Any]]:
         """
         Extract action items and owners from meeting transcript
         """
+        return SummarizationService._cached_extraction(
+            "action_items", text, SummarizationService._extract_action_items
+        )
+
+    @staticmethod
+    def extract_decisions(text: str) -> List[Dict[str, Any]]:
+        """
+        Extract decisions and their rationale from meeting transcript
+        """
+        return SummarizationService._cached_extraction(
+            "decisions", text, SummarizationService._extract_decisions
+        )
+
+    @staticmethod
+    def combined_extraction_cache_key(text: str, by_segments: bool = False) -> str:
+        """Result cache key for the combined action item and decision extraction"""
+        params = dict(
+            EXTRACTION_PARAMS,
+            precision=settings.GENERATOR_PRECISION,
+            max_input_tokens=settings.EXTRACTION_MAX_INPUT_TOKENS,
+            chunk_overlap=settings.CHUNK_OVERLAP_TOKENS
+        )
+        if by_segments:
+            params["chunking"] = "segments"
+        return ResultCache.make_key(text_sha256(text), settings.GENERATION_MODEL, params)
+
+    @staticmethod
+    def extract_items(text: str, segments: Optional[List[Dict[str, Any]]] = None) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Extract both action items and decisions from a meeting transcript.
+
+        In "combined" mode (EXTRACTION_MODE) the transcript is split into chunks
+        that fit the model, each chunk is encoded once by a joint prompt that
+        asks for both lists, and the per-chunk lists are merged. "separate" runs
+        extract_action_items and extract_decisions over the whole transcript.
+
+        Given the transcript's timestamped segments, combined mode builds
+        chunks from whole segments rather than cutting mid-sentence. Once they
+        are diarized the model sees "Speaker N: ..." lines, chunked by turn.
+        """
+        turns = None
+        if segments and has_speakers(segments):
+            turns = [(speaker_label(turn["speaker"]), turn["text"]) for turn in speaker_turns(segments)]
+            text = labelled_transcript(segments)
+
+        if settings.EXTRACTION_MODE != "combined":
+            return {
+                "action_items": SummarizationService.extract_action_items(text),
+                "decisions": SummarizationService.extract_decisions(text)
+            }
+        
+        key = SummarizationService.combined_extraction_cache_key(text, bool(segments))
+        cached = ResultCache.get("extraction", key)
+        if cached is not None:
+            return cached
+        
+        try:
+            items = SummarizationService._extract_combined(text, turns, segments)
+        except Exception as e:
+            print(f"Error extracting action items and decisions: {str(e)}")
+            return {"action_items": [], "decisions": []}
+        ResultCache.set("extraction", key, items)
+        return items
+
+    @staticmethod
+    def _extract_combined(
+        text: str,
+        turns: Optional[List[tuple]] = None,
+        segments: Optional[List[Dict[str, Any]]] = None
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Map the joint prompt over transcript chunks (speaker turns or segments if known), then merge the results"""
+        SummarizationService._load_generator()
+        tokenizer = SummarizationService._text_generator.tokenizer
+        speaker_hint = SPEAKER_HINT if turns else ""
+        
+        # Budget each chunk so prompt plus chunk fits the model input
+        prompt_tokens = len(tokenizer(
+            COMBINED_EXTRACTION_PROMPT.format(transcript="", speaker_hint=speaker_hint)
+        )["input_ids"])
+        max_tokens = max(64, settings.EXTRACTION_MAX_INPUT_TOKENS - prompt_tokens)
+        if turns:
+            chunks = chunk_turns(tokenizer, turns, max_tokens=max_tokens)
+        else:
+            if segments:
+                chunked = chunk_segments(
+                    tokenizer,
+                    [segment["text"] for segment in segments],
+                    max_tokens=max_tokens,
+                    overlap_tokens=settings.CHUNK_OVERLAP_TOKENS
+                )
+            else:
+                chunked = chunk_text(tokenizer, text, max_tokens=max_tokens, overlap_tokens=settings.CHUNK_OVERLAP_TOKENS)
+            chunks = [chunk.text for chunk in chunked.chunks]
+        prompts = [COMBINED_EXTRACTION_PROMPT.format(transcript=chunk, speaker_hint=speaker_hint) for chunk in chunks]
+        if not prompts:
+            return {"action_items": [], "decisions": []}
+        
+        with inference_mode():
+            outputs = SummarizationService._text_generator(
+                prompts,
+                batch_size=settings.SUMMARIZATION_BATCH_SIZE,
+                truncation=True,
+                **EXTRACTION_PARAMS
+            )
+        
+        # Reduce: concatenate per-chunk lists, dropping repeats (chunk overlap
+        # or the same point raised twice) by normalized title
+        merged = {"action_items": [], "decisions": []}
+        seen = {"action_items": set(), "decisions": set()}
+        for output in outputs:
+            if isinstance(output, list):
+                output = output[0]
+            parsed = SummarizationService._parse_combined_response(output['generated_text'])
+            for kind in merged:
+                for item in parsed[kind]:
+                    title = normalize_title(item.get('title', ''))
+                    if title and title not in seen[kind]:
+                        seen[kind].add(title)
+                        merged[kind].append(item)
+        return merged
+
+    @staticmethod
+    def _parse_combined_response(response: str) -> Dict[str, List[Dict[str, Any]]]:
+        """Parse the joint prompt's output into action item and decision lists"""
+        try:
+            json_start = response.find('{')
+            json_end = response.rfind('}') + 1
+            data = json.loads(response[json_start:json_end] if json_start >= 0 and json_end > json_start else response)
+            result = {}
+            for kind in ("action_items", "decisions"):
+                items = data.get(kind, []) if isinstance(data, dict) else []
+                if not isinstance(items, list):
+                    items = [items]
+                result[kind] = [item for item in items if isinstance(item, dict)]
+            return result
+        except (json.JSONDecodeError, ValueError):
+            # If JSON parsing fails, read "field: value" lines under section headers
+            result = {"action_items": [], "decisions": []}
+            kind = "action_items"
+            current_item = {}
+            for line in response.split('\n'):
+                line = line.strip()
+                header = line.lower().rstrip(':')
+                if header in ("action items", "action_items", "decisions"):
+                    if current_item.get('title'):
+                        result[kind].append(current_item)
+                    current_item = {}
+                    kind = "decisions" if header == "decisions" else "action_items"
+                    continue
+                field, _, value = line.partition(':')
+                field = field.strip().lower()
+                if field == 'title':
+                    if current_item.get('title'):
+                        result[kind].append(current_item)
+                    current_item = {'title': value.strip()}
+                elif field in ('description', 'assignee', 'due_date', 'decision_maker', 'rationale'):
+                    current_item[field] = value.strip()
+            if current_item.get('title'):
+                result[kind].append(current_item)
+            return result
+
+    @staticmethod
+    def _extract_action_items(text: str) -> List[Dict[str, Any]]:
+        """
+        Extract action items and owners from meeting transcript.
+        Returns None if extraction fails.
+        """
         try:
             # Load model if not already loaded
-            SummarizationService._load_models()
+            SummarizationService._load_generator()
             
             # Create prompt for action items
             prompt = f"""Extract action items from this meeting transcript. For each action item, identify:
@@ -158,12 +525,11 @@ class SummarizationService:
             return an empty array: []"""
             
             # Generate response
-            response = SummarizationService._text_generator(
-                prompt,
-                max_length=1024,
-                num_return_sequences=1,
-                temperature=0.7
-            )[0]['generated_text']
+            with inference_mode():
+                response = SummarizationService._text_generator(
+                    prompt,
+                    **EXTRACTION_PARAMS
+                )[0]['generated_text']
             
             try:
                 # Try to parse the response as JSON
@@ -206,16 +572,17 @@ class SummarizationService:
                 
         except Exception as e:
             print(f"Error extracting action items: {str(e)}")
-            return []
+            return None
     
     @staticmethod
-    def extract_decisions(text: str) -> List[Dict[str, Any]]:
+    def _extract_decisions(text: str) -> List[Dict[str, Any]]:
         """
-        Extract decisions and their rationale from meeting transcript
+        Extract decisions and their rationale from meeting transcript.
+        Returns None if extraction fails.
         """
         try:
             # Load model if not already loaded
-            SummarizationService._load_models()
+            SummarizationService._load_generator()
             
             # Create prompt for decisions
             prompt = f"""Extract decisions made during this meeting. For each decision, identify:
@@ -245,12 +612,11 @@ class SummarizationService:
             return an empty array: []"""
             
             # Generate response
-            response = SummarizationService._text_generator(
-                prompt,
-                max_length=1024,
-                num_return_sequences=1,
-                temperature=0.7
-            )[0]['generated_text']
+            with inference_mode():
+                response = SummarizationService._text_generator(
+                    prompt,
+                    **EXTRACTION_PARAMS
+                )[0]['generated_text']
             
             try:
                 # Try to parse the response as JSON
@@ -293,4 +659,4 @@ class SummarizationService:
                 
         except Exception as e:
             print(f"Error extracting decisions: {str(e)}")
-            return [] 
\ No newline at end of file
+            return None 
\ No newline at end of file
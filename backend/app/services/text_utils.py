@@ -0,0 +1,10 @@
+import re
+
+def normalize_title(title: str) -> str:
+    """Lowercase a title and strip punctuation and extra whitespace, for duplicate detection"""
+    title = re.sub(r"[^\w\s]", " ", (title or "").lower())
+    return " ".join(title.split())
+
+def normalize_participant(participant: str) -> str:
+    """Lowercase a participant name or email and trim whitespace, for lookups"""
+    return " ".join((participant or "").lower().split())
\ No newline at end of file
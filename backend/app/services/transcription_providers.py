@@ -0,0 +1,132 @@
+from abc import ABC, abstractmethod
+from fastapi import HTTPException
+from app.core.config import settings
+from app.services.model_registry import ModelRegistry, inference_mode
+from app.services.segmentation import SAMPLE_RATE
+from typing import Any, Dict, List, Optional
+import json
+import os
+import numpy as np
+
+# Model sizes accepted as "whisper-<size>"
+WHISPER_SIZES = (
+    "tiny", "tiny.en", "base", "base.en", "small", "small.en",
+    "medium", "medium.en", "large-v1", "large-v2", "large-v3", "large"
+)
+# Audio fed to a Vosk recognizer per call (half a second)
+VOSK_BLOCK_SAMPLES = SAMPLE_RATE // 2
+
+class TranscriptionProvider(ABC):
+    """
+    A speech-to-text backend. transcribe() takes 16 kHz mono float32 samples
+    and returns the text and the timestamped segments, with times relative
+    to the start of the samples. Models come from the ModelRegistry, so each
+    is loaded once per process.
+    """
+    name = ""
+    model_name = ""  # ModelRegistry key
+    uses_torch = True
+
+    @abstractmethod
+    def cache_model(self) -> str:
+        """Model identity for result cache keys"""
+
+    def cache_params(self) -> Dict[str, Any]:
+        """Settings that change this provider's output, for result cache keys"""
+        return {}
+
+    def load(self):
+        return ModelRegistry.get(self.model_name)
+
+    @abstractmethod
+    def transcribe(self, samples: np.ndarray) -> Dict[str, Any]:
+        """Text and timestamped segments of samples"""
+
+class WhisperProvider(TranscriptionProvider):
+    def __init__(self, size: str):
+        self.size = size
+        self.name = f"whisper-{size}"
+        # The configured size is the registry's (and PRELOAD_MODELS') "whisper"
+        self.model_name = "whisper" if size == settings.WHISPER_MODEL_SIZE else self.name
+
+    def cache_model(self) -> str:
+        return f"whisper-{self.size}"
+
+    def cache_params(self) -> Dict[str, Any]:
+        return {"precision": settings.WHISPER_PRECISION}
+
+    def transcribe(self, samples: np.ndarray) -> Dict[str, Any]:
+        model = self.load()
+        with inference_mode():
+            result = model.transcribe(samples)
+        return {
+            "text": result["text"],
+            "segments": [
+                {"start": segment["start"], "end": segment["end"], "text": segment["text"].strip()}
+                for segment in result["segments"]
+            ]
+        }
+
+class VoskProvider(TranscriptionProvider):
+    """Kaldi models through Vosk: several times faster than Whisper on CPU, less accurate"""
+    name = "vosk"
+    model_name = "vosk"
+    uses_torch = False
+
+    def cache_model(self) -> str:
+        return f"vosk-{os.path.basename(os.path.normpath(settings.VOSK_MODEL))}"
+
+    def transcribe(self, samples: np.ndarray) -> Dict[str, Any]:
+        from vosk import KaldiRecognizer
+        recognizer = KaldiRecognizer(self.load(), SAMPLE_RATE)
+        recognizer.SetWords(True)
+        segments = []
+        # Vosk ends an utterance at each pause; every utterance becomes a segment
+        for start in range(0, len(samples), VOSK_BLOCK_SAMPLES):
+            block = np.clip(np.asarray(samples[start:start + VOSK_BLOCK_SAMPLES]), -1.0, 1.0)
+            if recognizer.AcceptWaveform((block * 32767).astype(np.int16).tobytes()):
+                segments.extend(_vosk_segments(recognizer.Result()))
+        segments.extend(_vosk_segments(recognizer.FinalResult()))
+        return {"text": " ".join(segment["text"] for segment in segments), "segments": segments}
+
+def _vosk_segments(result: str) -> List[Dict[str, Any]]:
+    result = json.loads(result)
+    words = result.get("result") or []
+    if not words:
+        return []
+    return [{"start": words[0]["start"], "end": words[-1]["end"], "text": result.get("text", "").strip()}]
+
+def provider_names() -> List[str]:
+    """Every provider name get_provider accepts, besides the "whisper" and "huggingface" aliases"""
+    return [f"whisper-{size}" for size in WHISPER_SIZES] + ["vosk"]
+
+def get_provider(name: Optional[str] = None) -> TranscriptionProvider:
+    """
+    The provider called name: "whisper" (WHISPER_MODEL_SIZE), "whisper-<size>"
+    or "vosk". Defaults to TRANSCRIPTION_PROVIDER.
+    """
+    name = (name or settings.TRANSCRIPTION_PROVIDER).strip().lower()
+    if name in ("whisper", "huggingface"):
+        return WhisperProvider(settings.WHISPER_MODEL_SIZE)
+    if name.startswith("whisper-") and name[len("whisper-"):] in WHISPER_SIZES:
+        return WhisperProvider(name[len("whisper-"):])
+    if name == "vosk":
+        return VoskProvider()
+    raise HTTPException(
+        status_code=400,
+        detail=f"Unknown transcription provider: {name}. Use whisper, vosk or one of {', '.join(provider_names())}"
+    )
+
+def resolve_provider(provider: Optional[str] = None, quality: Optional[str] = None) -> str:
+    """
+    Name of the provider a request asked for: provider if given, else the
+    provider for quality ("accurate" is TRANSCRIPTION_PROVIDER, "fast" is
+    TRANSCRIPTION_FAST_PROVIDER), else TRANSCRIPTION_PROVIDER.
+    """
+    if provider:
+        return get_provider(provider).name
+    if quality in (None, "accurate"):
+        return get_provider(settings.TRANSCRIPTION_PROVIDER).name
+    if quality == "fast":
+        return get_provider(settings.TRANSCRIPTION_FAST_PROVIDER).name
+    raise HTTPException(status_code=400, detail=f"Unknown transcription quality: {quality}. Use accurate or fast")
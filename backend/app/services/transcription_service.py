@@ -1,62 +1,265 @@
 import os
-from fastapi import UploadFile, HTTPException
-import tempfile
+from fastapi import HTTPException
 from app.core.config import settings
-import whisper
-import torch
+from app.services.audio_service import AudioService
+from app.services.transcription_providers import TranscriptionProvider, get_provider
+from app.services.cache_service import ResultCache, file_sha256
+from app.services.segmentation import detect_speech_segments, SAMPLE_RATE
+from app.services.diarization import diarize
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, List, Dict, Any, Tuple, Iterator
+import multiprocessing
+import threading
+import numpy as np
+
+# Whisper's own decoding window; streamed windows are kept at or below it
+STREAM_WINDOW_SECONDS = 30.0
+
+# Provider (with its model loaded) in each segment decoding worker process
+_worker_provider = None
+
+def _init_segment_worker(provider_name: str, num_threads: int):
+    """Load the provider's model once per worker process through that process's registry"""
+    global _worker_provider
+    _worker_provider = get_provider(provider_name)
+    if _worker_provider.uses_torch:
+        import torch
+        # An explicit TORCH_INTRA_OP_THREADS wins; otherwise split the cores between workers
+        torch.set_num_threads(settings.TORCH_INTRA_OP_THREADS or num_threads)
+    _worker_provider.load()
+
+def _transcribe_segment(task: Tuple[int, Any], provider: Optional[TranscriptionProvider] = None) -> List[Dict[str, Any]]:
+    """Transcribe one speech segment, shifting timestamps to the whole recording"""
+    start_sample, samples = task
+    result = (provider or _worker_provider).transcribe(samples)
+    offset = start_sample / SAMPLE_RATE
+    return [
+        {"start": offset + segment["start"], "end": offset + segment["end"], "text": segment["text"].strip()}
+        for segment in result["segments"]
+    ]
+
+def _transcribe_cached_segment(task: Tuple[str, int, int]) -> List[Dict[str, Any]]:
+    """Transcribe one speech segment read from the decoded audio cache, so no samples cross processes"""
+    pcm_path, start_sample, end_sample = task
+    audio = np.load(pcm_path, mmap_mode="c")
+    return _transcribe_segment((start_sample, audio[start_sample:end_sample]))
 
 class TranscriptionService:
-    _model = None
-
-    @staticmethod
-    def _load_model():
-        """Load or initialize the Whisper model"""
-        if TranscriptionService._model is None:
-            try:
-                # Create cache directory if it doesn't exist
-                os.makedirs(settings.HUGGINGFACE_CACHE_DIR, exist_ok=True)
-                
-                # Load model
-                TranscriptionService._model = whisper.load_model("base")
-                
-                # Move model to GPU if available
-                if torch.cuda.is_available():
-                    TranscriptionService._model = TranscriptionService._model.to("cuda")
-            except Exception as e:
-                raise HTTPException(
-                    status_code=500,
-                    detail=f"Error loading Whisper model: {str(e)}"
+    # Segment decoding pools by provider name
+    _pools: Dict[str, ProcessPoolExecutor] = {}
+    _pools_lock = threading.Lock()
+
+    @staticmethod
+    def _load_model(provider: Optional[str] = None) -> TranscriptionProvider:
+        """The provider (default TRANSCRIPTION_PROVIDER), with its model fetched from the model registry"""
+        transcriber = get_provider(provider)
+        try:
+            transcriber.load()
+        except Exception as e:
+            raise HTTPException(
+                status_code=500,
+                detail=f"Error loading {transcriber.name} model: {str(e)}"
+            )
+        return transcriber
+
+    @staticmethod
+    def cache_key(
+        file_path: str,
+        checksum: Optional[str] = None,
+        mode: Optional[str] = None,
+        provider: Optional[str] = None
+    ) -> str:
+        """Result cache key for an audio file; hashes the file if no checksum is known"""
+        if checksum is None:
+            checksum = file_sha256(file_path)
+        transcriber = get_provider(provider)
+        params = dict(transcriber.cache_params(), mode=mode or settings.TRANSCRIPTION_MODE)
+        return ResultCache.make_key(checksum, transcriber.cache_model(), params)
+
+    @staticmethod
+    def _get_pool(provider: Optional[str] = None) -> ProcessPoolExecutor:
+        """Create the provider's segment decoding process pool on first use"""
+        name = get_provider(provider).name
+        with TranscriptionService._pools_lock:
+            if name not in TranscriptionService._pools:
+                workers = max(1, settings.TRANSCRIPTION_WORKERS)
+                threads_per_worker = max(1, (os.cpu_count() or 1) // workers)
+                TranscriptionService._pools[name] = ProcessPoolExecutor(
+                    max_workers=workers,
+                    # Spawn rather than fork: forking a process that already runs torch threads can deadlock
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_segment_worker,
+                    initargs=(name, threads_per_worker)
                 )
+            return TranscriptionService._pools[name]
+
+    @staticmethod
+    def _transcribe_single_pass(
+        file_path: str,
+        checksum: Optional[str] = None,
+        provider: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Run the provider over the whole recording in one sequential pass"""
+        audio = AudioService.load_pcm(file_path, checksum)
+        return TranscriptionService._load_model(provider).transcribe(audio)
 
     @staticmethod
-    async def transcribe_audio(file: UploadFile, provider: str = "huggingface"):
+    def _transcribe_segmented(
+        file_path: str,
+        checksum: Optional[str] = None,
+        provider: Optional[str] = None
+    ) -> Dict[str, Any]:
         """
-        Transcribe audio file using OpenAI's Whisper model
+        Split the recording on silence and transcribe the speech segments in
+        parallel, then stitch the results back together in order.
         """
+        audio = AudioService.load_pcm(file_path, checksum)
+        ranges = detect_speech_segments(
+            audio,
+            SAMPLE_RATE,
+            min_silence_ms=settings.VAD_MIN_SILENCE_MS,
+            max_segment_seconds=settings.VAD_MAX_SEGMENT_SECONDS
+        )
+        
+        if len(ranges) <= 1 or settings.TRANSCRIPTION_WORKERS <= 1:
+            # Not worth starting other processes
+            transcriber = TranscriptionService._load_model(provider)
+            results = [_transcribe_segment((start, audio[start:end]), transcriber) for start, end in ranges]
+        else:
+            # Workers map the decoded audio themselves; only sample ranges are sent
+            tasks = [(audio.filename, start, end) for start, end in ranges]
+            results = list(TranscriptionService._get_pool(provider).map(_transcribe_cached_segment, tasks))
+        
+        segments = [segment for result in results for segment in result]
+        return {
+            "text": " ".join(segment["text"] for segment in segments if segment["text"]),
+            "segments": segments
+        }
+
+    @staticmethod
+    def diarization_cache_key(transcription_key: str, num_speakers: Optional[int] = None) -> str:
+        """Result cache key for the speakers of a cached transcription's segments"""
+        params = {
+            "num_speakers": num_speakers,
+            "threshold": settings.DIARIZATION_THRESHOLD,
+            "max_speakers": settings.DIARIZATION_MAX_SPEAKERS,
+            "window_seconds": settings.DIARIZATION_WINDOW_SECONDS
+        }
+        return ResultCache.make_key(transcription_key, "diarization", params)
+
+    @staticmethod
+    def diarize_segments(
+        file_path: str,
+        segments: List[Dict[str, Any]],
+        num_speakers: Optional[int] = None,
+        checksum: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Label timestamped segments of a recording with speakers"""
+        if not segments:
+            return []
+        try:
+            audio = AudioService.load_pcm(file_path, checksum)
+            return diarize(
+                audio,
+                segments,
+                num_speakers=num_speakers,
+                threshold=settings.DIARIZATION_THRESHOLD,
+                max_speakers=settings.DIARIZATION_MAX_SPEAKERS,
+                window_seconds=settings.DIARIZATION_WINDOW_SECONDS
+            )
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(
+                status_code=500,
+                detail=f"Diarization error: {str(e)}"
+            )
+
+    @staticmethod
+    def transcribe_segments(
+        file_path: str,
+        checksum: Optional[str] = None,
+        mode: Optional[str] = None,
+        num_speakers: Optional[int] = None,
+        provider: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Transcribe an audio file on disk, returning the full text and the
+        timestamped segments. mode is "single" (one pass) or "segmented" (VAD
+        split plus parallel decoding); it defaults to TRANSCRIPTION_MODE.
+        provider names the backend (default TRANSCRIPTION_PROVIDER).
+        With DIARIZATION_ENABLED each segment is also labelled with a
+        speaker; num_speakers fixes their number. Results are cached
+        by audio content and provider.
+        """
+        mode = mode or settings.TRANSCRIPTION_MODE
+        if mode not in ("single", "segmented"):
+            raise HTTPException(status_code=400, detail=f"Unknown transcription mode: {mode}")
+        
         try:
-            # Load model if not already loaded
-            TranscriptionService._load_model()
-            
-            # Save the uploaded file temporarily
-            temp_path = f"uploads/temp_{file.filename}"
-            with open(temp_path, "wb") as buffer:
-                content = await file.read()
-                buffer.write(content)
-            
-            try:
-                # Transcribe audio
-                result = TranscriptionService._model.transcribe(temp_path)
-                transcript = result["text"]
-                
-                return transcript
-                
-            finally:
-                # Clean up temporary file
-                if os.path.exists(temp_path):
-                    os.remove(temp_path)
-                    
+            if checksum is None:
+                # Hashed once here rather than again by each decoded-audio lookup
+                checksum = file_sha256(file_path)
+            key = TranscriptionService.cache_key(file_path, checksum, mode, provider)
+            result = ResultCache.get("transcription", key)
+            if result is None or "segments" not in result:
+                if mode == "segmented":
+                    result = TranscriptionService._transcribe_segmented(file_path, checksum, provider)
+                else:
+                    result = TranscriptionService._transcribe_single_pass(file_path, checksum, provider)
+                ResultCache.set("transcription", key, result)
+        except HTTPException:
+            raise
         except Exception as e:
             raise HTTPException(
                 status_code=500,
                 detail=f"Transcription error: {str(e)}"
-            ) 
\ No newline at end of file
+            )
+        
+        if not settings.DIARIZATION_ENABLED:
+            return result
+        # Cached apart from the text, so changing speaker settings doesn't redo the transcription
+        diarization_key = TranscriptionService.diarization_cache_key(key, num_speakers)
+        speakers = ResultCache.get("diarization", diarization_key)
+        if speakers is None or len(speakers) != len(result["segments"]):
+            segments = TranscriptionService.diarize_segments(file_path, result["segments"], num_speakers, checksum)
+            speakers = [segment["speaker"] for segment in segments]
+            ResultCache.set("diarization", diarization_key, speakers)
+        return dict(result, segments=[
+            dict(segment, speaker=speaker) for segment, speaker in zip(result["segments"], speakers)
+        ])
+
+    @staticmethod
+    def iter_transcription(
+        file_path: str,
+        resume_from: float = 0.0,
+        checksum: Optional[str] = None,
+        provider: Optional[str] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Transcribe a recording one speech window at a time, yielding each
+        window's timestamped segments as soon as the provider finishes it. Windows
+        that end before resume_from seconds are skipped, so an interrupted run
+        can pick up where it stopped. Each step blocks; drive it from a thread.
+        """
+        audio = AudioService.load_pcm(file_path, checksum)
+        transcriber = TranscriptionService._load_model(provider)
+        ranges = detect_speech_segments(
+            audio,
+            SAMPLE_RATE,
+            min_silence_ms=settings.VAD_MIN_SILENCE_MS,
+            # Keep windows short so partial results arrive often
+            max_segment_seconds=min(settings.VAD_MAX_SEGMENT_SECONDS, STREAM_WINDOW_SECONDS)
+        )
+        resume_sample = int(resume_from * SAMPLE_RATE)
+        
+        for start, end in ranges:
+            if end <= resume_sample:
+                continue
+            start = max(start, resume_sample)
+            segments = _transcribe_segment((start, audio[start:end]), transcriber)
+            yield {
+                "window_start": start / SAMPLE_RATE,
+                "window_end": end / SAMPLE_RATE,
+                "segments": segments
+            }
@@ -0,0 +1,318 @@
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import json
+import os
+import threading
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process lock, the thread lock still applies
+    fcntl = None
+
+# Per-row metadata, kept in memory and rewritten on every change
+ROW_DTYPE = np.dtype([
+    ("meeting_id", np.int64),
+    ("item_id", np.int64),
+    ("kind", np.uint8),
+    ("start", np.int32),
+    ("end", np.int32),
+    ("alive", np.bool_),
+])
+
+# Rows scored per matrix multiply; bounds the temporary score matrix
+QUERY_BLOCK_ROWS = 65536
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    """Scale rows to unit length, so dot products are cosine similarities"""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+class VectorIndex:
+    """
+    Append-only, memory-mapped store of unit vectors with exact cosine top-k.
+
+    Vectors live in a raw float32 file mapped with np.memmap, so the OS pages
+    them in on demand and shares them between worker processes. Row metadata
+    (which meeting and item a vector belongs to) is a small structured array
+    saved next to it. Replacing a meeting's vectors appends new rows and marks
+    the old ones dead; once dead rows outnumber live ones the files are
+    compacted into a new generation. index.json names the current generation
+    and is replaced atomically, so readers never see a half-written index.
+    Other processes' writes are picked up on the next query.
+    """
+    def __init__(self, directory: str, dim: int, model: str = ""):
+        self.directory = directory
+        self.dim = dim
+        self.model = model
+        self._lock = threading.RLock()
+        self._version = None
+        self._foreign = False  # The files on disk hold another model's vectors
+        self._generation = 0
+        self._capacity = 0
+        self._rows = np.zeros(0, dtype=ROW_DTYPE)
+        self._hashes: Dict[str, str] = {}
+        self._vectors: Optional[np.memmap] = None
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def _vectors_path(self, generation: int) -> str:
+        return self._path(f"vectors-{generation}.f32")
+
+    def _rows_path(self, generation: int) -> str:
+        return self._path(f"rows-{generation}.npy")
+
+    @contextmanager
+    def _write_lock(self):
+        """Serialize writers across threads and, where supported, processes"""
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(self._path("index.lock"), "a") as lock_file:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    self._refresh()
+                    yield
+                finally:
+                    if fcntl is not None:
+                        fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _open_vectors(self):
+        if self._capacity == 0:
+            self._vectors = None
+            return
+        self._vectors = np.memmap(
+            self._vectors_path(self._generation),
+            dtype=np.float32,
+            mode="r+",
+            shape=(self._capacity, self.dim)
+        )
+
+    def _state_version(self) -> Optional[Tuple[int, int]]:
+        # Every write ends by replacing index.json, which gives it a new inode
+        try:
+            stat = os.stat(self._path("index.json"))
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns
+
+    def _refresh(self):
+        """Reload state if another writer (thread or process) changed it"""
+        version = self._state_version()
+        if version is None or version == self._version:
+            return
+
+        with open(self._path("index.json")) as f:
+            state = json.load(f)
+        self._version = version
+        self._generation = state["generation"]
+        self._foreign = state.get("dim") != self.dim or state.get("model") != self.model
+        if self._foreign:
+            # Vectors from another model can't be compared with ours: read as
+            # empty until the next write starts a fresh index
+            self._capacity = 0
+            self._rows = np.zeros(0, dtype=ROW_DTYPE)
+            self._hashes = {}
+            self._vectors = None
+            return
+        self._capacity = state["capacity"]
+        self._hashes = state.get("hashes", {})
+        self._rows = np.load(self._rows_path(self._generation))
+        self._open_vectors()
+
+    def _remove_generation(self, generation: int):
+        for path in (self._vectors_path(generation), self._rows_path(generation)):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _reset(self):
+        old_generation = self._generation
+        self._foreign = False
+        self._generation += 1
+        self._capacity = 0
+        self._rows = np.zeros(0, dtype=ROW_DTYPE)
+        self._hashes = {}
+        self._vectors = None
+        open(self._vectors_path(self._generation), "wb").close()
+        self._save_rows()
+        self._save_state()
+        self._remove_generation(old_generation)
+
+    def _save_rows(self):
+        path = self._rows_path(self._generation)
+        with open(path + ".tmp", "wb") as f:
+            np.save(f, self._rows)
+        os.replace(path + ".tmp", path)
+
+    def _save_state(self):
+        path = self._path("index.json")
+        with open(path + ".tmp", "w") as f:
+            json.dump({
+                "model": self.model,
+                "dim": self.dim,
+                "generation": self._generation,
+                "capacity": self._capacity,
+                "hashes": self._hashes
+            }, f)
+        os.replace(path + ".tmp", path)
+        self._version = self._state_version()
+
+    def _grow(self, needed: int):
+        """Extend the vector file, at least doubling it so appends stay amortized O(1)"""
+        if needed <= self._capacity:
+            return
+        capacity = max(needed, 2 * self._capacity, 1024)
+        if self._vectors is not None:
+            self._vectors.flush()
+            self._vectors = None
+        with open(self._vectors_path(self._generation), "ab") as f:
+            f.truncate(capacity * self.dim * 4)
+        self._capacity = capacity
+        self._open_vectors()
+
+    def _compact(self):
+        """Copy live rows into a new generation and drop the old files"""
+        alive = np.flatnonzero(self._rows["alive"])
+        old_generation, old_vectors = self._generation, self._vectors
+        self._generation += 1
+        self._capacity = max(len(alive), 1024)
+        with open(self._vectors_path(self._generation), "wb") as f:
+            f.truncate(self._capacity * self.dim * 4)
+        self._open_vectors()
+        for start in range(0, len(alive), QUERY_BLOCK_ROWS):
+            block = alive[start:start + QUERY_BLOCK_ROWS]
+            self._vectors[start:start + len(block)] = old_vectors[block]
+        self._vectors.flush()
+        self._rows = self._rows[alive]
+        self._save_rows()
+        self._save_state()
+        # Readers still holding the old mapping keep it until they refresh
+        self._remove_generation(old_generation)
+
+    def content_hash(self, meeting_id: int) -> Optional[str]:
+        """Hash recorded with the meeting's vectors, to skip re-embedding unchanged content"""
+        with self._lock:
+            self._refresh()
+            return self._hashes.get(str(meeting_id))
+
+    def replace_meeting(self, meeting_id: int, rows: List[Dict[str, Any]], vectors: np.ndarray, content_hash: Optional[str] = None):
+        """Swap a meeting's vectors for new ones; rows give item_id, kind, start and end per vector"""
+        vectors = normalize(vectors).reshape(-1, self.dim)
+        with self._write_lock():
+            if self._version is None or self._foreign:
+                self._reset()
+
+            count = len(self._rows)
+            self._grow(count + len(vectors))
+            if len(vectors):
+                self._vectors[count:count + len(vectors)] = vectors
+                self._vectors.flush()
+            new_rows = np.zeros(len(rows), dtype=ROW_DTYPE)
+            for i, row in enumerate(rows):
+                new_rows[i] = (meeting_id, row["item_id"], row["kind"], row.get("start", 0), row.get("end", 0), True)
+            # A new array rather than an in-place update, so concurrent searches keep a consistent snapshot
+            updated = np.concatenate([self._rows, new_rows])
+            updated["alive"][:count] &= updated["meeting_id"][:count] != meeting_id
+            self._rows = updated
+            if content_hash is None:
+                self._hashes.pop(str(meeting_id), None)
+            else:
+                self._hashes[str(meeting_id)] = content_hash
+
+            dead = len(self._rows) - int(self._rows["alive"].sum())
+            if dead > 1024 and dead > len(self._rows) // 2:
+                self._compact()
+            else:
+                # Rows are written after the vectors they describe, so a reader
+                # never sees a row whose vector isn't there yet
+                self._save_rows()
+                self._save_state()
+
+    def remove_meeting(self, meeting_id: int):
+        """Drop a meeting's vectors"""
+        if not len(self.meeting_rows(meeting_id)[0]) and self.content_hash(meeting_id) is None:
+            return
+        self.replace_meeting(meeting_id, [], np.zeros((0, self.dim), dtype=np.float32))
+
+    def meeting_rows(self, meeting_id: int, kinds: Optional[Iterable[int]] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """A meeting's live rows and their vectors"""
+        with self._lock:
+            self._refresh()
+            mask = self._rows["alive"] & (self._rows["meeting_id"] == meeting_id)
+            if kinds is not None:
+                mask &= np.isin(self._rows["kind"], list(kinds))
+            positions = np.flatnonzero(mask)
+            if not len(positions):
+                return self._rows[positions], np.zeros((0, self.dim), dtype=np.float32)
+            return self._rows[positions], np.array(self._vectors[positions])
+
+    def search(
+        self,
+        queries: np.ndarray,
+        k: int,
+        kinds: Optional[Iterable[int]] = None,
+        exclude_meeting_id: Optional[int] = None
+    ) -> List[List[Tuple[np.void, float]]]:
+        """
+        Exact cosine top-k for a batch of query vectors. The index is scanned
+        once per batch, a block of rows at a time: each block is scored for
+        every query in one matrix multiply and only its best k per query are
+        kept, so memory stays bounded however large the index grows.
+        """
+        queries = normalize(queries).reshape(-1, self.dim)
+        with self._lock:
+            self._refresh()
+            rows, vectors = self._rows, self._vectors
+        count = len(rows)
+        if not count or k <= 0:
+            return [[] for _ in queries]
+
+        mask = rows["alive"].copy()
+        if kinds is not None:
+            mask &= np.isin(rows["kind"], list(kinds))
+        if exclude_meeting_id is not None:
+            mask &= rows["meeting_id"] != exclude_meeting_id
+
+        best_scores = np.full((len(queries), 0), -np.inf, dtype=np.float32)
+        best_positions = np.zeros((len(queries), 0), dtype=np.int64)
+        for start in range(0, count, QUERY_BLOCK_ROWS):
+            end = min(start + QUERY_BLOCK_ROWS, count)
+            block_mask = mask[start:end]
+            if not block_mask.any():
+                continue
+            selected = np.flatnonzero(block_mask)
+            if len(selected) < (end - start) // 4:
+                # Sparse filter (e.g. meeting vectors only): score just the selected rows
+                scores = queries @ np.asarray(vectors[start + selected]).T
+                positions = selected + start
+            else:
+                scores = queries @ np.asarray(vectors[start:end]).T
+                scores[:, ~block_mask] = -np.inf
+                positions = np.arange(start, end)
+            keep = min(k, scores.shape[1])
+            top = np.argpartition(-scores, keep - 1, axis=1)[:, :keep]
+            best_scores = np.concatenate([best_scores, np.take_along_axis(scores, top, axis=1)], axis=1)
+            best_positions = np.concatenate([best_positions, positions[top]], axis=1)
+            if best_scores.shape[1] > k:
+                top = np.argpartition(-best_scores, k - 1, axis=1)[:, :k]
+                best_scores = np.take_along_axis(best_scores, top, axis=1)
+                best_positions = np.take_along_axis(best_positions, top, axis=1)
+
+        results = []
+        for scores, positions in zip(best_scores, best_positions):
+            order = np.argsort(-scores)
+            results.append([
+                (rows[positions[i]], float(scores[i]))
+                for i in order if np.isfinite(scores[i])
+            ])
+        return results
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._refresh()
+            return int(self._rows["alive"].sum())
@@ -0,0 +1,109 @@
+"""
+Measure decoding a recording once per consumer against decoding it once into
+the memory-mapped PCM cache.
+
+Usage (from the backend directory):
+    python -m benchmarks.audio_decoding --minutes 60
+    python -m benchmarks.audio_decoding --file path/to/meeting.mp3
+
+Without --file, a 44.1 kHz stereo WAV of --minutes is synthesized in a
+scratch directory. For each way of reading the audio, it reports wall time
+and peak Python heap (tracemalloc) for:
+- one-shot decode: the whole ffmpeg output read into one buffer and
+  converted, as whisper.load_audio does on every transcribe or diarize call
+- first load_pcm: streamed into the .npy cache in bounded chunks
+- cached load_pcm plus a VAD pass over the mapped samples, which is what
+  retranscription and diarization pay from then on
+Pages of the mapped file sit in the OS page cache, not the Python heap.
+"""
+import argparse
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+import tracemalloc
+import wave
+
+import numpy as np
+
+from app.services.audio_service import AudioService
+from app.services.cache_service import file_sha256
+from app.services.segmentation import SAMPLE_RATE, detect_speech_segments
+
+def synthesize(path: str, minutes: float, rate: int = 44100):
+    """Stereo tones with pauses, written a minute at a time"""
+    rng = np.random.default_rng(0)
+    with wave.open(path, "wb") as wav:
+        wav.setnchannels(2)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        for minute in range(int(np.ceil(minutes))):
+            seconds = min(60.0, minutes * 60 - minute * 60)
+            t = np.arange(int(seconds * rate)) / rate
+            voiced = np.repeat(rng.random(int(np.ceil(seconds))) > 0.3, rate)[:len(t)]
+            tone = 0.3 * np.sin(2 * np.pi * rng.uniform(100, 300) * t) * voiced
+            wav.writeframes((np.stack([tone, 0.5 * tone], axis=1) * 32767).astype("<i2").tobytes())
+
+def one_shot_decode(file_path: str) -> np.ndarray:
+    """Decode the way whisper.load_audio does: all of ffmpeg's output at once"""
+    out = subprocess.run(
+        [
+            "ffmpeg", "-nostdin", "-threads", "0", "-i", file_path,
+            "-f", "s16le", "-ac", "1", "-acodec", "pcm_s16le", "-ar", str(SAMPLE_RATE), "-"
+        ],
+        capture_output=True,
+        check=True
+    ).stdout
+    return np.frombuffer(out, np.int16).flatten().astype(np.float32) / 32768.0
+
+def measure(read):
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = read()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--minutes", type=float, default=60.0, help="Length of the synthesized recording")
+    parser.add_argument("--file", help="Decode this recording instead of a synthesized one")
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix="decode_")
+    try:
+        if args.file:
+            file_path = os.path.join(directory, os.path.basename(args.file))
+            shutil.copy(args.file, file_path)
+        else:
+            file_path = os.path.join(directory, "meeting.wav")
+            synthesize(file_path, args.minutes)
+        checksum = file_sha256(file_path)
+        duration = AudioService.validate_audio(file_path)
+        print(f"{os.path.basename(file_path)}: {os.path.getsize(file_path) / 2 ** 20:.0f} MB, {duration / 60:.1f} min")
+
+        samples, one_shot_seconds, one_shot_peak = measure(lambda: one_shot_decode(file_path))
+        decoded, first_seconds, first_peak = measure(lambda: AudioService.load_pcm(file_path, checksum))
+        if not np.array_equal(np.asarray(decoded), samples):
+            raise SystemExit("Cached samples differ from a one-shot decode")
+        del samples, decoded
+        _, cached_seconds, cached_peak = measure(
+            lambda: detect_speech_segments(AudioService.load_pcm(file_path, checksum))
+        )
+
+        print(f"{'read':<30}{'seconds':>9}{'peak MB':>9}")
+        for name, seconds, peak in [
+            ("one-shot decode", one_shot_seconds, one_shot_peak),
+            ("first load_pcm (to cache)", first_seconds, first_peak),
+            ("cached load_pcm + VAD", cached_seconds, cached_peak),
+        ]:
+            print(f"{name:<30}{seconds:>9.2f}{peak / 2 ** 20:>9.1f}")
+        cache_path = AudioService.pcm_cache_path(file_path, checksum)
+        print(f"Cache file: {os.path.getsize(cache_path) / 2 ** 20:.0f} MB")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
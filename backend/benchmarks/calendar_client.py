@@ -0,0 +1,74 @@
+"""
+Measure CalendarService per-call overhead against a local fake Calendar API.
+
+Usage (from the backend directory):
+    python -m benchmarks.calendar_client --calls 200 --connect-latency-ms 50
+
+Starts the fake Calendar API from benchmarks.fake_calendar in-process. Each
+CalendarService call is then timed twice: "cold" resets the cached client before every call, which is what every
+call used to cost (read the token file, build the client, open a connection),
+and "warm" reuses the process-wide client. --connect-latency-ms delays each
+new connection on the server, standing in for the TCP and TLS handshakes a
+real connection to Google pays.
+"""
+import argparse
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from app.services.calendar_service import CalendarService
+from benchmarks.fake_calendar import start_fake_calendar
+
+def percentiles(samples):
+    samples = sorted(samples)
+    return statistics.median(samples), samples[int(0.95 * (len(samples) - 1))]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=200, help="Calls timed per operation and mode")
+    parser.add_argument("--connect-latency-ms", type=float, default=0.0)
+    args = parser.parse_args()
+
+    server, state = start_fake_calendar(args.connect_latency_ms)
+
+    start = datetime.utcnow() + timedelta(days=1)
+    created = CalendarService.create_meeting_event("Seed", "", start, start + timedelta(hours=1))
+    doomed = iter([
+        CalendarService.create_meeting_event("Doomed", "", start, start + timedelta(hours=1))["event_id"]
+        for _ in range(2 * args.calls)
+    ])
+    operations = {
+        "get_upcoming_meetings": lambda: CalendarService.get_upcoming_meetings(max_results=10),
+        "create_meeting_event": lambda: CalendarService.create_meeting_event("Sync", "Weekly", start, start + timedelta(hours=1)),
+        "update_meeting_event": lambda: CalendarService.update_meeting_event(created["event_id"], summary="Renamed"),
+        "delete_meeting_event": lambda: CalendarService.delete_meeting_event(next(doomed)),
+    }
+
+    print(f"{'operation':<26}{'mode':<6}{'p50 ms':>9}{'p95 ms':>9}{'connections':>13}{'token reads':>13}")
+    try:
+        for name, operation in operations.items():
+            for mode in ("cold", "warm"):
+                CalendarService.reset()
+                CalendarService._local.http = None
+                connections = state.connections
+                reads = 0
+                samples = []
+                for _ in range(args.calls):
+                    if mode == "cold":
+                        CalendarService.reset()
+                        CalendarService._local.http = None
+                        reads += 1
+                    elif CalendarService._credentials is None:
+                        reads += 1
+                    started = time.perf_counter()
+                    operation()
+                    samples.append((time.perf_counter() - started) * 1000)
+                p50, p95 = percentiles(samples)
+                print(f"{name:<26}{mode:<6}{p50:>9.2f}{p95:>9.2f}{state.connections - connections:>13}{reads:>13}")
+        print(f"Token refreshes: {state.token_requests}")
+    finally:
+        CalendarService.reset()
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Measure batched Calendar writes and incremental sync against a local fake
+Calendar API.
+
+Usage (from the backend directory):
+    python -m benchmarks.calendar_sync --events 2000 --batch 50 --connect-latency-ms 20 --request-latency-ms 30
+
+Seeds the fake API from benchmarks.fake_calendar with --events upcoming
+events, then times:
+- listing upcoming events live from the API (what /calendar/upcoming did)
+  against serving them from the synced local copy
+- a full sync against an incremental sync after a few changes
+- creating, patching and deleting --batch events one request at a time
+  against one batch request each
+--request-latency-ms delays every HTTP response, standing in for the round
+trip to Google. Finally, the local copy is compared with a live listing,
+including after the fake API expires every sync token (410 Gone).
+"""
+import argparse
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from app.core.database import SessionLocal
+from app.services.calendar_service import CalendarService
+from benchmarks.fake_calendar import start_fake_calendar
+
+def percentiles(samples):
+    samples = sorted(samples)
+    return statistics.median(samples), samples[int(0.95 * (len(samples) - 1))]
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return percentiles(samples)
+
+def event_body(rng, now, title):
+    start = now + timedelta(minutes=rng.randrange(60, 60 * 24 * 60))
+    return {
+        "summary": title,
+        "start": {"dateTime": start.isoformat() + "Z"},
+        "end": {"dateTime": (start + timedelta(minutes=30)).isoformat() + "Z"},
+    }
+
+def matches_api(db):
+    """Whether the local copy holds exactly the upcoming events the API lists"""
+    live = CalendarService.get_upcoming_meetings(max_results=100000)
+    local = CalendarService.get_synced_upcoming_meetings(db, max_results=100000)["events"]
+    return {event["id"] for event in live} == {event["id"] for event in local}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=2000)
+    parser.add_argument("--batch", type=int, default=50, help="Events written per batch comparison")
+    parser.add_argument("--changes", type=int, default=10, help="Events changed before each incremental sync")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--connect-latency-ms", type=float, default=0.0)
+    parser.add_argument("--request-latency-ms", type=float, default=0.0)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    server, state = start_fake_calendar(args.connect_latency_ms, args.request_latency_ms)
+
+    now = datetime.utcnow()
+    for i in range(args.events):
+        state.insert(event_body(rng, now, f"Seeded {i}"))
+    # A few finished events, which the local copy leaves out
+    for i in range(args.events // 10):
+        state.insert(event_body(rng, now - timedelta(days=90), f"Past {i}"))
+
+    db = SessionLocal()
+    print(f"{'operation':<44}{'p50 ms':>9}{'p95 ms':>9}")
+    try:
+        started = time.perf_counter()
+        received = CalendarService.sync_events(db, full=True)
+        print(f"{f'full sync ({received} events)':<44}{(time.perf_counter() - started) * 1000:>9.1f}")
+
+        def change_and_sync():
+            for _ in range(args.changes):
+                event_id = rng.choice(list(state.events))
+                state.patch(event_id, {"summary": "Changed"})
+            CalendarService.sync_events(db)
+        p50, p95 = timed(change_and_sync, args.repeat)
+        print(f"{f'incremental sync ({args.changes} changes)':<44}{p50:>9.1f}{p95:>9.1f}")
+
+        p50, p95 = timed(lambda: CalendarService.get_upcoming_meetings(max_results=50), args.repeat)
+        print(f"{'upcoming 50, live from the API':<44}{p50:>9.1f}{p95:>9.1f}")
+        p50, p95 = timed(lambda: CalendarService.get_synced_upcoming_meetings(db, max_results=50), args.repeat)
+        print(f"{'upcoming 50, from the local copy':<44}{p50:>9.1f}{p95:>9.1f}")
+
+        start = now + timedelta(days=1)
+        fields = {"summary": "Batch", "description": "", "start_time": start, "end_time": start + timedelta(hours=1)}
+        requests = state.requests
+        started = time.perf_counter()
+        single = [CalendarService.create_meeting_event(**fields)["event_id"] for _ in range(args.batch)]
+        elapsed, count = (time.perf_counter() - started) * 1000, state.requests - requests
+        print(f"{f'create {args.batch}, one request each':<44}{elapsed:>9.1f}{'':>9}  ({count} API calls)")
+        started = time.perf_counter()
+        batched = [result["event_id"] for result in CalendarService.batch_create_events([fields] * args.batch)]
+        print(f"{f'create {args.batch}, batched':<44}{(time.perf_counter() - started) * 1000:>9.1f}")
+
+        started = time.perf_counter()
+        for event_id in single:
+            CalendarService.update_meeting_event(event_id, summary="Moved")
+        print(f"{f'patch {args.batch}, one request each':<44}{(time.perf_counter() - started) * 1000:>9.1f}")
+        started = time.perf_counter()
+        CalendarService.batch_update_events([{"event_id": event_id, "summary": "Moved"} for event_id in batched])
+        print(f"{f'patch {args.batch}, batched':<44}{(time.perf_counter() - started) * 1000:>9.1f}")
+
+        started = time.perf_counter()
+        for event_id in single:
+            CalendarService.delete_meeting_event(event_id)
+        print(f"{f'delete {args.batch}, one request each':<44}{(time.perf_counter() - started) * 1000:>9.1f}")
+        started = time.perf_counter()
+        errors = [result["error"] for result in CalendarService.batch_delete_events(batched) if result["error"]]
+        print(f"{f'delete {args.batch}, batched':<44}{(time.perf_counter() - started) * 1000:>9.1f}  ({len(errors)} errors)")
+
+        print(f"Local copy matches the API: {matches_api(db)}")
+        for event_id in rng.sample(list(state.events), 20):
+            state.delete(event_id)
+        state.reset_sync_tokens()
+        CalendarService.sync_events(db)
+        print(f"Local copy matches the API after an expired sync token: {matches_api(db)}")
+    finally:
+        db.close()
+        CalendarService.reset()
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Compare the original per-sentence encode loop with the single-pass chunker.
+
+Usage (from the backend directory):
+    python -m benchmarks.chunking --words 20000
+
+Only the BART tokenizer is loaded, so this runs in a few seconds.
+"""
+import argparse
+import time
+
+from transformers import AutoTokenizer
+
+from app.core.config import settings
+from app.services.chunking import chunk_text
+from app.services.summarization_service import MAX_CHUNK_TOKENS
+from benchmarks.summarization_batching import make_transcript
+
+def chunk_per_sentence(tokenizer, text, max_chunk_length):
+    """The original chunking: encode the whole text, then every sentence again"""
+    calls = 1
+    tokenizer.encode(text)
+    chunks = []
+    current_chunk = []
+    current_length = 0
+    for sentence in text.split('.'):
+        sentence = sentence.strip() + '.'
+        sentence_length = len(tokenizer.encode(sentence))
+        calls += 1
+        if current_length + sentence_length > max_chunk_length:
+            if current_chunk:
+                chunks.append(' '.join(current_chunk))
+            current_chunk = [sentence]
+            current_length = sentence_length
+        else:
+            current_chunk.append(sentence)
+            current_length += sentence_length
+    if current_chunk:
+        chunks.append(' '.join(current_chunk))
+    return chunks, calls
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--words", type=int, default=20000)
+    parser.add_argument("--overlap", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    tokenizer = AutoTokenizer.from_pretrained("facebook/bart-large-cnn", cache_dir=settings.HUGGINGFACE_CACHE_DIR)
+    text = make_transcript(args.words, seed=0)
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        old_chunks, calls = chunk_per_sentence(tokenizer, text, 1024)
+    old_time = (time.perf_counter() - start) / args.repeat
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        chunked = chunk_text(tokenizer, text, MAX_CHUNK_TOKENS, args.overlap)
+    new_time = (time.perf_counter() - start) / args.repeat
+
+    print(f"{args.words} words, {chunked.num_tokens} tokens")
+    print(f"per-sentence: {old_time * 1000:8.1f} ms  {calls} tokenizer calls, {len(old_chunks)} chunks")
+    print(f"single-pass:  {new_time * 1000:8.1f} ms  1 tokenizer call, {len(chunked.chunks)} chunks")
+    print(f"speedup: {old_time / new_time:.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Compare fp32 and dynamically quantized int8 inference on CPU.
+
+Usage (from the backend directory):
+    python -m benchmarks.cpu_inference_modes --models summarizer,generator --threads 4
+    python -m benchmarks.cpu_inference_modes --models whisper --audio sample.wav
+
+Each (model, precision) pair runs in a fresh process so peak RSS is not
+polluted by the other run. Reports mean latency, peak RSS and how similar
+each int8 output is to the fp32 output (difflib ratio, 1.0 = identical).
+"""
+import argparse
+import difflib
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+from benchmarks.summarization_batching import make_transcript
+
+PRECISION_SETTINGS = {
+    "whisper": "WHISPER_PRECISION",
+    "summarizer": "SUMMARIZER_PRECISION",
+    "generator": "GENERATOR_PRECISION",
+}
+
+def run_child(model: str, audio: str, repeat: int):
+    """Load one model with the precision from the environment and time it"""
+    from app.core.config import settings
+    from app.services.model_registry import ModelRegistry, inference_mode
+    from app.services.summarization_service import SummarizationService
+
+    settings.RESULT_CACHE_ENABLED = False
+    start = time.perf_counter()
+    ModelRegistry.get(model)
+    load_time = time.perf_counter() - start
+
+    if model == "whisper":
+        def infer():
+            with inference_mode():
+                return ModelRegistry.get("whisper").transcribe(audio)["text"]
+    elif model == "summarizer":
+        text = make_transcript(700, seed=1)
+        def infer():
+            return SummarizationService._summarize_texts([text], max_length=142, min_length=30)[0]
+    else:
+        text = make_transcript(400, seed=2)
+        def infer():
+            return json.dumps(SummarizationService._extract_action_items(text))
+
+    output = infer()  # Warm-up run, also the output compared across modes
+    start = time.perf_counter()
+    for _ in range(repeat):
+        infer()
+    latency = (time.perf_counter() - start) / repeat
+
+    # ru_maxrss is in KB on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    peak_mb = peak / 1024 if sys.platform != "darwin" else peak / (1024 * 1024)
+    print(json.dumps({"load_seconds": load_time, "latency": latency, "peak_rss_mb": peak_mb, "output": output}))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--models", default="summarizer,generator")
+    parser.add_argument("--audio", help="Audio file for the whisper benchmark")
+    parser.add_argument("--threads", type=int, default=0, help="Intra-op threads (0 = torch default)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child, args.audio, args.repeat)
+        return
+
+    for model in args.models.split(","):
+        if model == "whisper" and not args.audio:
+            print("whisper: skipped, pass --audio")
+            continue
+
+        results = {}
+        for precision in ("fp32", "int8"):
+            env = dict(os.environ, TORCH_INTRA_OP_THREADS=str(args.threads))
+            env[PRECISION_SETTINGS[model]] = precision
+            command = [sys.executable, "-m", "benchmarks.cpu_inference_modes", "--child", model, "--repeat", str(args.repeat)]
+            if args.audio:
+                command += ["--audio", args.audio]
+            output = subprocess.run(command, env=env, capture_output=True, text=True, check=True).stdout
+            results[precision] = json.loads(output.strip().splitlines()[-1])
+
+        for precision, result in results.items():
+            similarity = difflib.SequenceMatcher(None, results["fp32"]["output"], result["output"]).ratio()
+            print(
+                f"{model:10s} {precision:5s} latency {result['latency']:7.2f}s  "
+                f"peak RSS {result['peak_rss_mb']:7.0f} MB  similarity {similarity:.3f}"
+            )
+
+if __name__ == "__main__":
+    main()
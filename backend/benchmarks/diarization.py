@@ -0,0 +1,134 @@
+"""
+Measure diarization time per hour of audio and how well it recovers speakers.
+
+Usage (from the backend directory):
+    python -m benchmarks.diarization --minutes 20 --speakers 4
+    python -m benchmarks.diarization --minutes 60 --speakers 6 --num-speakers 6
+
+The recording is synthetic: each speaker is a harmonic voice with its own
+pitch and vocal tract length, speaking syllables with varying vowels, in
+turns of 2-12 seconds. Turns are cut into Whisper-sized transcript segments,
+so the speaker of every segment is known. Accuracy is the share of segment
+time labelled with the right speaker, after matching found speakers to true
+ones. Synthetic voices are easier to tell apart than real ones; the timing is
+what carries over.
+"""
+import argparse
+import time
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.diarization import diarize
+from app.services.segmentation import SAMPLE_RATE
+
+# (F1, F2, F3) in Hz for a few vowels of an average adult voice
+VOWELS = [(730, 1090, 2440), (270, 2290, 3010), (300, 870, 2240), (530, 1840, 2480), (570, 840, 2410), (660, 1720, 2410)]
+
+def make_speakers(rng, count: int) -> list:
+    """Voices spread over vocal tract lengths and spectral tilts, so no two are alike"""
+    tracts = rng.permutation(np.linspace(0.8, 1.25, count)) + rng.uniform(-0.02, 0.02, count)
+    tilts = rng.permutation(np.linspace(0.6, 2.0, count))
+    return [
+        {"f0": 120 / tract ** 2 * rng.uniform(0.8, 1.25), "tract": tract, "tilt": tilt}
+        for tract, tilt in zip(tracts, tilts)
+    ]
+
+def syllable(rng, speaker: dict) -> np.ndarray:
+    """One voiced syllable: harmonics of the speaker's pitch shaped by a vowel's formants"""
+    count = int(rng.uniform(0.12, 0.3) * SAMPLE_RATE)
+    t = np.arange(count) / SAMPLE_RATE
+    f0 = speaker["f0"] * rng.uniform(0.9, 1.1) * (1 + 0.04 * np.sin(2 * np.pi * rng.uniform(2, 5) * t))
+    phase = 2 * np.pi * np.cumsum(f0) / SAMPLE_RATE
+    formants = np.array(VOWELS[rng.integers(len(VOWELS))]) * speaker["tract"]
+
+    harmonics = np.arange(1, int(4000 // speaker["f0"]) + 1)
+    frequencies = harmonics * speaker["f0"]
+    envelope = sum(1.0 / (1.0 + ((frequencies - formant) / 120.0) ** 2) for formant in formants)
+    amplitudes = envelope * harmonics ** -speaker["tilt"]
+    voice = (amplitudes[:, None] * np.sin(harmonics[:, None] * phase[None, :])).sum(axis=0)
+    return (voice / np.abs(voice).max() * 0.3 * np.hanning(count)).astype(np.float32)
+
+def make_meeting(minutes: float, speakers: int, seed: int = 0):
+    """Synthetic recording plus transcript segments that carry their true speaker"""
+    rng = np.random.default_rng(seed)
+    voices = make_speakers(rng, speakers)
+    total = int(minutes * 60 * SAMPLE_RATE)
+    parts, segments, length, previous = [], [], 0, None
+
+    while length < total:
+        speaker = int(rng.integers(speakers))
+        if speaker == previous and speakers > 1:
+            continue
+        previous = speaker
+        turn_start = length
+        turn_length = int(rng.uniform(2, 12) * SAMPLE_RATE)
+        while length - turn_start < turn_length:
+            parts.append(syllable(rng, voices[speaker]))
+            parts.append(np.zeros(int(rng.uniform(0, 0.06) * SAMPLE_RATE), dtype=np.float32))
+            length += len(parts[-2]) + len(parts[-1])
+        # Whisper-sized segments of at most about 6 seconds
+        cuts = np.arange(turn_start, length, int(rng.uniform(3, 6) * SAMPLE_RATE)).tolist() + [length]
+        for start, end in zip(cuts[:-1], cuts[1:]):
+            segments.append({"start": start / SAMPLE_RATE, "end": end / SAMPLE_RATE, "text": "...", "true_speaker": speaker})
+        pause = np.zeros(int(rng.uniform(0.2, 0.8) * SAMPLE_RATE), dtype=np.float32)
+        parts.append(pause)
+        length += len(pause)
+
+    audio = np.concatenate(parts)
+    audio += rng.normal(0, 0.003, len(audio)).astype(np.float32)
+    return audio, segments
+
+def accuracy(segments) -> float:
+    """Duration-weighted share of segments whose speaker matches, pairing speakers greedily by overlap"""
+    found = max(segment["speaker"] for segment in segments) + 1
+    true = max(segment["true_speaker"] for segment in segments) + 1
+    overlap = np.zeros((found, true))
+    for segment in segments:
+        overlap[segment["speaker"], segment["true_speaker"]] += segment["end"] - segment["start"]
+    matched = 0.0
+    remaining = overlap.copy()
+    for _ in range(min(found, true)):
+        row, col = np.unravel_index(np.argmax(remaining), remaining.shape)
+        matched += remaining[row, col]
+        remaining[row, :] = -1
+        remaining[:, col] = -1
+    return matched / overlap.sum()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--minutes", type=float, default=20)
+    parser.add_argument("--speakers", type=int, default=4)
+    parser.add_argument("--num-speakers", type=int, help="Tell diarization the speaker count instead of using the threshold")
+    parser.add_argument("--threshold", type=float, default=settings.DIARIZATION_THRESHOLD)
+    parser.add_argument("--window-seconds", type=float, default=settings.DIARIZATION_WINDOW_SECONDS)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    audio, segments = make_meeting(args.minutes, args.speakers, args.seed)
+    hours = len(audio) / SAMPLE_RATE / 3600
+    print(f"Synthesized {hours * 60:.1f} min, {len(segments)} segments, {args.speakers} speakers "
+          f"in {time.perf_counter() - started:.1f} s")
+
+    timings = []
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        labelled = diarize(
+            audio,
+            segments,
+            num_speakers=args.num_speakers,
+            threshold=args.threshold,
+            max_speakers=settings.DIARIZATION_MAX_SPEAKERS,
+            window_seconds=args.window_seconds
+        )
+        timings.append(time.perf_counter() - started)
+
+    best = min(timings)
+    print(f"Diarization: {best:.2f} s ({best / hours:.1f} s per audio hour, real-time factor {best / (hours * 3600):.4f})")
+    print(f"Speakers found: {max(segment['speaker'] for segment in labelled) + 1} of {args.speakers}")
+    print(f"Segment accuracy: {accuracy(labelled):.1%}")
+
+if __name__ == "__main__":
+    main()
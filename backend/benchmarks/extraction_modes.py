@@ -0,0 +1,47 @@
+"""
+Compare separate action-item/decision extraction with the combined pass.
+
+Usage (from the backend directory):
+    python -m benchmarks.extraction_modes --words 3000
+
+"separate" is the original behaviour: two generations, each over a prompt
+holding the whole transcript, which the model truncates. "combined" runs
+one joint prompt per transcript chunk, so the full transcript is covered.
+"""
+import argparse
+import time
+
+from app.core.config import settings
+from app.services.summarization_service import SummarizationService, EXTRACTION_PARAMS
+from benchmarks.summarization_batching import make_transcript
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--words", type=int, default=3000)
+    parser.add_argument("--repeat", type=int, default=2)
+    args = parser.parse_args()
+
+    SummarizationService._load_generator()
+    tokenizer = SummarizationService._text_generator.tokenizer
+    text = make_transcript(args.words, seed=3)
+    num_tokens = len(tokenizer(text)["input_ids"])
+    print(f"{args.words} words, {num_tokens} transcript tokens")
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        SummarizationService._extract_action_items(text)
+        SummarizationService._extract_decisions(text)
+    separate = (time.perf_counter() - start) / args.repeat
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        SummarizationService._extract_combined(text)
+    combined = (time.perf_counter() - start) / args.repeat
+
+    covered = min(num_tokens, EXTRACTION_PARAMS["max_length"])
+    print(f"separate: {separate:8.2f}s  (2 generations, at most ~{covered} transcript tokens seen)")
+    print(f"combined: {combined:8.2f}s  (max input {settings.EXTRACTION_MAX_INPUT_TOKENS} tokens per chunk, full transcript seen)")
+    print(f"saved:    {separate - combined:8.2f}s ({(1 - combined / separate) * 100:.0f}%)")
+
+if __name__ == "__main__":
+    main()
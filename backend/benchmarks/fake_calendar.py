@@ -0,0 +1,245 @@
+"""
+A local stand-in for the Google Calendar v3 API, for tests, benchmarks and
+manual testing of CalendarService without a Google account.
+
+It serves the event endpoints (insert, get, list, patch, update, delete),
+the batch endpoint, incremental sync with sync tokens (including 410 Gone
+for tokens from before reset_sync_tokens) and the OAuth token endpoint.
+start_fake_calendar() runs it on a free port and points CalendarService at
+it with a throwaway token.pickle and a scratch SQLite database for the local
+copy of events.
+"""
+import json
+import os
+import pickle
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from email.parser import BytesParser
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from google.oauth2.credentials import Credentials
+
+from app.core.config import settings
+from app.core.database import Base, SessionLocal, create_db_engine
+from app.services.calendar_service import CalendarService
+
+EVENTS_PATH = "/calendars/primary/events"
+
+class FakeCalendarState:
+    """Events plus a change log: every write bumps the sequence that sync tokens point into"""
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.events = {}
+        self.sequence = 0
+        self.oldest_token = 0
+        self.next_id = 0
+        self.connections = 0
+        self.requests = 0
+        self.token_requests = 0
+
+    def _touch(self, event):
+        self.sequence += 1
+        event["_sequence"] = self.sequence
+        event["updated"] = datetime.utcnow().isoformat() + "Z"
+        return event
+
+    def insert(self, body):
+        with self.lock:
+            self.next_id += 1
+            event_id = f"e{self.next_id}"
+            event = dict(body, id=event_id, status="confirmed", htmlLink=f"http://calendar.invalid/{event_id}")
+            self.events[event_id] = self._touch(event)
+            return event
+
+    def patch(self, event_id, body, replace=False):
+        with self.lock:
+            event = self.events.get(event_id)
+            if event is None or event["status"] == "cancelled":
+                return None
+            if replace:
+                event = dict(body, id=event_id, status="confirmed", htmlLink=event["htmlLink"])
+            else:
+                event = dict(event, **body)
+            self.events[event_id] = self._touch(event)
+            return event
+
+    def delete(self, event_id):
+        with self.lock:
+            event = self.events.get(event_id)
+            if event is None or event["status"] == "cancelled":
+                return False
+            self.events[event_id] = self._touch({"id": event_id, "status": "cancelled"})
+            return True
+
+    def reset_sync_tokens(self):
+        """Expire every sync token handed out so far, as Google does occasionally"""
+        with self.lock:
+            self.oldest_token = self.sequence
+
+    def list(self, query):
+        """(status, body) for events.list, paging and sync tokens included"""
+        with self.lock:
+            sync_token = query.get("syncToken")
+            if sync_token is not None and "timeMin" in query:
+                return 400, {"error": {"code": 400, "message": "Sync token cannot be used with timeMin."}}
+            if sync_token is not None and int(sync_token) < self.oldest_token:
+                return 410, {"error": {"code": 410, "message": "Sync token is no longer valid, a full sync is required."}}
+            since = int(sync_token) if sync_token is not None else None
+            events = sorted(self.events.values(), key=lambda event: event["_sequence"])
+            if since is None:
+                events = [event for event in events if event["status"] != "cancelled"]
+            else:
+                events = [event for event in events if event["_sequence"] > since]
+            if "timeMin" in query:
+                time_min = query["timeMin"].replace("Z", "")
+                events = [
+                    event for event in events
+                    if (event["end"].get("dateTime") or event["end"].get("date", "")).replace("Z", "") > time_min
+                ]
+            if query.get("orderBy") == "startTime":
+                events.sort(key=lambda event: event["start"].get("dateTime", ""))
+            offset = int(query.get("pageToken", 0))
+            limit = int(query.get("maxResults", 250))
+            page = [{k: v for k, v in event.items() if k != "_sequence"} for event in events[offset:offset + limit]]
+            body = {"kind": "calendar#events", "items": page}
+            if offset + limit < len(events):
+                body["nextPageToken"] = str(offset + limit)
+            elif "orderBy" not in query:
+                body["nextSyncToken"] = str(self.sequence)
+            return 200, body
+
+    def handle(self, method, url, body):
+        """(status, body) for one API request"""
+        with self.lock:
+            self.requests += 1
+        parts = urlsplit(url)
+        query = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+        path = parts.path
+        if path == EVENTS_PATH:
+            if method == "GET":
+                return self.list(query)
+            if method == "POST":
+                return 200, self.insert(body)
+        elif path.startswith(EVENTS_PATH + "/"):
+            event_id = path[len(EVENTS_PATH) + 1:]
+            if method == "GET":
+                event = self.events.get(event_id)
+                if event and event["status"] != "cancelled":
+                    return 200, {k: v for k, v in event.items() if k != "_sequence"}
+            elif method in ("PATCH", "PUT"):
+                event = self.patch(event_id, body, replace=method == "PUT")
+                if event:
+                    return 200, {k: v for k, v in event.items() if k != "_sequence"}
+            elif method == "DELETE":
+                if self.delete(event_id):
+                    return 204, None
+            return 404, {"error": {"code": 404, "message": "Not Found"}}
+        return 400, {"error": {"code": 400, "message": f"Unsupported request {method} {path}"}}
+
+class FakeCalendarHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive, like the real API
+    disable_nagle_algorithm = True
+    state: FakeCalendarState = None
+    connect_latency = 0.0
+    request_latency = 0.0
+
+    def setup(self):
+        super().setup()
+        with self.state.lock:
+            self.state.connections += 1
+        time.sleep(self.connect_latency)
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, status, payload=None, content_type="application/json"):
+        data = payload if isinstance(payload, bytes) else json.dumps(payload).encode() if payload is not None else b""
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _dispatch(self, method):
+        data = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        # One round trip per HTTP request, however many calls a batch carries
+        time.sleep(self.request_latency)
+        if self.path.startswith("/token"):
+            with self.state.lock:
+                self.state.token_requests += 1
+            return self._reply(200, {"access_token": f"token-{time.time()}", "expires_in": 3600, "token_type": "Bearer"})
+        if self.path.startswith("/batch"):
+            return self._batch(data)
+        status, body = self.state.handle(method, self.path, json.loads(data) if data else {})
+        self._reply(status, body)
+
+    def _batch(self, data):
+        """Answer a multipart/mixed batch by running each part as its own request"""
+        message = BytesParser().parsebytes(
+            b"Content-Type: " + self.headers["Content-Type"].encode() + b"\r\n\r\n" + data
+        )
+        boundary = "fake_calendar_batch"
+        parts = []
+        for part in message.get_payload():
+            request = part.get_payload()
+            head, _, body = request.partition("\r\n\r\n") if "\r\n\r\n" in request else request.partition("\n\n")
+            method, url, _ = head.splitlines()[0].split(" ", 2)
+            status, payload = self.state.handle(method, url, json.loads(body) if body.strip() else {})
+            content = json.dumps(payload) if payload is not None else ""
+            parts.append(
+                f"--{boundary}\r\nContent-Type: application/http\r\n"
+                f"Content-ID: <response-{part['Content-ID'].strip('<>')}>\r\n\r\n"
+                f"HTTP/1.1 {status} OK\r\nContent-Type: application/json\r\nContent-Length: {len(content)}\r\n\r\n{content}\r\n"
+            )
+        self._reply(200, ("".join(parts) + f"--{boundary}--\r\n").encode(), f"multipart/mixed; boundary={boundary}")
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_PUT(self):
+        self._dispatch("PUT")
+
+    def do_PATCH(self):
+        self._dispatch("PATCH")
+
+    def do_DELETE(self):
+        self._dispatch("DELETE")
+
+def start_fake_calendar(connect_latency_ms: float = 0.0, request_latency_ms: float = 0.0):
+    """Serve a fake Calendar API on a free port and point CalendarService at it; returns (server, state)"""
+    directory = tempfile.mkdtemp(prefix="calendar_")
+    engine = create_db_engine(f"sqlite:///{os.path.join(directory, 'bench.db')}")
+    Base.metadata.create_all(bind=engine)
+    SessionLocal.configure(bind=engine)
+
+    state = FakeCalendarState()
+    handler = type("Handler", (FakeCalendarHandler,), {
+        "state": state,
+        "connect_latency": connect_latency_ms / 1000,
+        "request_latency": request_latency_ms / 1000
+    })
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}/"
+
+    CalendarService.reset()
+    CalendarService.TOKEN_FILE = os.path.join(directory, "token.pickle")
+    with open(CalendarService.TOKEN_FILE, "wb") as f:
+        pickle.dump(Credentials(
+            token="initial",
+            refresh_token="refresh",
+            token_uri=base_url + "token",
+            client_id="client",
+            client_secret="secret",
+            scopes=CalendarService.SCOPES,
+            expiry=datetime.utcnow() + timedelta(hours=1)
+        ), f)
+    settings.CALENDAR_API_ENDPOINT = base_url
+    settings.CALENDAR_BATCH_ENDPOINT = base_url + "batch/calendar/v3"
+    return server, state
@@ -0,0 +1,81 @@
+"""
+Compare single-pass and segmented (VAD + parallel) transcription wall time.
+
+Usage (from the backend directory):
+    python -m benchmarks.long_audio_transcription --minutes 30 --workers 4
+    python -m benchmarks.long_audio_transcription --audio sample.wav --minutes 60
+
+With --audio, the sample is repeated with short pauses until the requested
+length is reached. Without it, the audio is synthetic: noise bursts of
+speech-like length separated by silence. Whisper output on synthetic audio
+is meaningless, but the decoding work and the timing comparison are real.
+"""
+import argparse
+import os
+import tempfile
+import time
+import wave
+
+import numpy as np
+import whisper
+
+from app.core.config import settings
+from app.services.segmentation import SAMPLE_RATE
+from app.services.transcription_service import TranscriptionService
+
+def make_long_audio(minutes: float, sample_path: str = None, seed: int = 0) -> np.ndarray:
+    """Build a long 16 kHz mono recording with pauses between utterances"""
+    rng = np.random.default_rng(seed)
+    total = int(minutes * 60 * SAMPLE_RATE)
+    sample = whisper.load_audio(sample_path) if sample_path else None
+    parts = []
+    length = 0
+    while length < total:
+        if sample is not None:
+            speech = sample
+        else:
+            speech = rng.normal(0, 0.1, int(rng.uniform(2, 12) * SAMPLE_RATE)).astype(np.float32)
+        pause = np.zeros(int(rng.uniform(0.6, 1.5) * SAMPLE_RATE), dtype=np.float32)
+        parts.extend([speech, pause])
+        length += len(speech) + len(pause)
+    return np.concatenate(parts)[:total]
+
+def write_wav(path: str, samples: np.ndarray):
+    with wave.open(path, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(SAMPLE_RATE)
+        wav.writeframes((np.clip(samples, -1, 1) * 32767).astype(np.int16).tobytes())
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--minutes", type=float, default=30)
+    parser.add_argument("--audio", help="Real speech sample to repeat")
+    parser.add_argument("--workers", type=int, default=settings.TRANSCRIPTION_WORKERS)
+    args = parser.parse_args()
+
+    settings.RESULT_CACHE_ENABLED = False
+    settings.TRANSCRIPTION_WORKERS = args.workers
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "long_audio.wav")
+        write_wav(path, make_long_audio(args.minutes, args.audio))
+        print(f"{args.minutes:.0f} minutes of audio, {args.workers} workers")
+
+        # Load models up front so neither mode is charged for it
+        TranscriptionService._load_model()
+        if args.workers > 1:
+            list(TranscriptionService._get_pool().map(int, range(args.workers)))
+
+        results = {}
+        for mode in ("single", "segmented"):
+            start = time.perf_counter()
+            result = TranscriptionService.transcribe_segments(path, mode=mode)
+            elapsed = time.perf_counter() - start
+            results[mode] = elapsed
+            print(f"{mode:10s} {elapsed:8.1f}s  real-time factor {elapsed / (args.minutes * 60):.3f}  {len(result['segments'])} segments")
+
+        print(f"speedup: {results['single'] / results['segmented']:.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Compare offset and keyset pagination, with and without the listing indexes,
+over a synthetic dataset.
+
+Usage (from the backend directory):
+    python -m benchmarks.pagination --meetings 1000000 --action-items 1000000
+
+Builds a throwaway SQLite database (or uses --database-url, which must be an
+empty scratch database) with the requested number of meetings and action
+items, then times the list queries the API runs at increasing page depths:
+first without the indexes added for listing, then with them. The
+"created_at offset" row is the listing query as it was before keyset
+pagination. Action items keep the (meeting_id, normalized_title) upsert
+index in both runs, so per-meeting lookups never fall back to a full scan.
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base, create_db_engine
+from app.models.models import Meeting, ActionItem
+from app.services.action_item_service import ActionItemService
+from app.services.meeting_service import MeetingService
+
+LISTING_INDEXES = [
+    "ix_meetings_status_id",
+    "ix_meetings_date",
+    "ix_action_items_meeting_id_id",
+]
+STATUSES = ["scheduled", "in_progress", "completed", "cancelled"]
+BATCH_SIZE = 50000
+
+def seed(engine, meetings: int, action_items: int):
+    rng = random.Random(0)
+    start = datetime(2020, 1, 1)
+    with engine.begin() as connection:
+        for offset in range(0, meetings, BATCH_SIZE):
+            connection.execute(insert(Meeting), [
+                {
+                    "title": f"Meeting {i}",
+                    "status": rng.choice(STATUSES),
+                    "date": start + timedelta(minutes=rng.randrange(60 * 24 * 365 * 4)),
+                    "created_at": start + timedelta(seconds=i),
+                }
+                for i in range(offset, min(offset + BATCH_SIZE, meetings))
+            ])
+        for offset in range(0, action_items, BATCH_SIZE):
+            connection.execute(insert(ActionItem), [
+                {
+                    "meeting_id": rng.randrange(1, meetings + 1),
+                    "title": f"Task {i}",
+                    "normalized_title": f"task {i}",
+                    "description": "Synthetic",
+                    "assignee": "team",
+                }
+                for i in range(offset, min(offset + BATCH_SIZE, action_items))
+            ])
+
+def timed(fn, repeat: int) -> float:
+    """Median wall time of fn() in milliseconds"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+def run_queries(session_factory, meetings: int, depths, limit: int, repeat: int):
+    db = session_factory()
+    results = {}
+    try:
+        for depth in depths:
+            # The ID of the row just above the page, as a cursor would carry it
+            before_id = meetings - depth + 1
+            offset_page = MeetingService.get_meetings(db, skip=depth, limit=limit)
+            keyset_page = MeetingService.get_meetings(db, limit=limit, before_id=before_id)
+            assert [m.id for m in offset_page] == [m.id for m in keyset_page]
+            # The query before keyset pagination: created_at order, no index on it
+            results[("created_at offset", depth)] = timed(
+                lambda: db.query(Meeting).order_by(Meeting.created_at.desc()).offset(depth).limit(limit).all(), repeat
+            )
+            results[("meetings offset", depth)] = timed(lambda: MeetingService.get_meetings(db, skip=depth, limit=limit), repeat)
+            results[("meetings keyset", depth)] = timed(lambda: MeetingService.get_meetings(db, limit=limit, before_id=before_id), repeat)
+            results[("status offset", depth)] = timed(lambda: MeetingService.get_meetings(db, skip=depth // len(STATUSES), limit=limit, status="completed"), repeat)
+            results[("status keyset", depth)] = timed(lambda: MeetingService.get_meetings(db, limit=limit, status="completed", before_id=before_id), repeat)
+            db.expunge_all()
+        meeting_ids = random.Random(1).sample(range(1, meetings + 1), 20)
+        results[("meeting action items", 0)] = timed(
+            lambda: [ActionItemService.get_meeting_action_items(db, meeting_id) for meeting_id in meeting_ids], repeat
+        ) / len(meeting_ids)
+    finally:
+        db.close()
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--meetings", type=int, default=1000000)
+    parser.add_argument("--action-items", type=int, default=1000000)
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--database-url")
+    args = parser.parse_args()
+
+    database_url = args.database_url or f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='pagination_'), 'bench.db')}"
+    engine = create_db_engine(database_url)
+    Base.metadata.create_all(bind=engine)
+    indexes = [index for table in Base.metadata.tables.values() for index in table.indexes if index.name in LISTING_INDEXES]
+    for index in indexes:
+        index.drop(bind=engine)
+
+    start = time.perf_counter()
+    seed(engine, args.meetings, args.action_items)
+    print(f"Seeded {args.meetings} meetings and {args.action_items} action items in {time.perf_counter() - start:.1f}s")
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    depths = [d for d in (0, 1000, 10000, 100000, args.meetings // 2, args.meetings - args.limit) if d <= args.meetings - args.limit]
+    without = run_queries(session_factory, args.meetings, depths, args.limit, args.repeat)
+    for index in indexes:
+        index.create(bind=engine)
+    with engine.connect() as connection:
+        if connection.dialect.name == "sqlite":
+            connection.exec_driver_sql("ANALYZE")
+    indexed = run_queries(session_factory, args.meetings, depths, args.limit, args.repeat)
+
+    print(f"{'query':<22}{'depth':>9}{'no index ms':>13}{'indexed ms':>12}")
+    for key in without:
+        query, depth = key
+        print(f"{query:<22}{depth:>9}{without[key]:>13.2f}{indexed[key]:>12.2f}")
+    engine.dispose()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Measure full-text search latency over a synthetic corpus.
+
+Usage (from the backend directory):
+    python -m benchmarks.search --meetings 10000 --words 800 --queries 200
+
+Builds a throwaway SQLite database (or uses --database-url, which must be an
+empty scratch database) with the requested number of meetings. Each meeting
+gets a transcript and summary drawn from a Zipf-distributed vocabulary, plus a
+few action items and decisions. The search index is then built with
+SearchService.rebuild_index, and SearchService.search is timed for several
+query shapes. "LIKE scan" is the unindexed alternative, a substring match over
+every transcript, for comparison.
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base, create_db_engine
+from app.models.models import Meeting, ActionItem, Decision
+from app.services.search_service import SearchService
+
+STATUSES = ["scheduled", "in_progress", "completed", "cancelled"]
+BATCH_SIZE = 1000
+SYLLABLES = ["ka", "lo", "mi", "ne", "ru", "sa", "ti", "vo", "ze", "pa", "qua", "dri", "fen", "gor", "hul"]
+
+def vocabulary(size: int, rng: random.Random):
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))))
+    # Shuffled, so word frequency (by position) doesn't follow spelling and
+    # prefixes of common words don't match the whole corpus
+    words = sorted(words)
+    rng.shuffle(words)
+    return words
+
+def seed(engine, args, words, rng):
+    # Zipf-like weights: a few very common words and a long tail of rare ones
+    weights = [1 / (rank + 1) for rank in range(len(words))]
+    def text(count):
+        return " ".join(rng.choices(words, weights, k=count))
+    start = datetime(2022, 1, 1)
+    with engine.begin() as connection:
+        for offset in range(0, args.meetings, BATCH_SIZE):
+            ids = range(offset + 1, min(offset + BATCH_SIZE, args.meetings) + 1)
+            connection.execute(insert(Meeting), [
+                {
+                    "id": i,
+                    "title": f"Meeting {i} {text(3)}",
+                    "status": rng.choice(STATUSES),
+                    "date": start + timedelta(hours=rng.randrange(24 * 365 * 2)),
+                    "transcript": text(args.words),
+                    "summary": text(args.words // 10),
+                }
+                for i in ids
+            ])
+            connection.execute(insert(ActionItem), [
+                {"meeting_id": i, "title": text(5), "description": text(20), "assignee": text(1)}
+                for i in ids for _ in range(3)
+            ])
+            connection.execute(insert(Decision), [
+                {"meeting_id": i, "title": text(5), "description": text(20), "decision_maker": text(1), "rationale": text(15)}
+                for i in ids for _ in range(2)
+            ])
+
+def percentiles(samples):
+    samples = sorted(samples)
+    return statistics.median(samples), samples[int(0.95 * (len(samples) - 1))]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--meetings", type=int, default=10000)
+    parser.add_argument("--words", type=int, default=800, help="Words per transcript")
+    parser.add_argument("--vocabulary", type=int, default=20000)
+    parser.add_argument("--queries", type=int, default=200, help="Queries timed per query shape")
+    parser.add_argument("--like-queries", type=int, default=10, help="Queries timed for the LIKE scan (0 to skip)")
+    parser.add_argument("--database-url")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    database_url = args.database_url or f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='search_'), 'bench.db')}"
+    engine = create_db_engine(database_url)
+    Base.metadata.create_all(bind=engine)
+    words = vocabulary(args.vocabulary, rng)
+
+    start = time.perf_counter()
+    seed(engine, args, words, rng)
+    seeded = time.perf_counter()
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    db = session_factory()
+    documents = SearchService.rebuild_index(db)
+    print(
+        f"Seeded {args.meetings} meetings in {seeded - start:.1f}s, "
+        f"indexed {documents} documents in {time.perf_counter() - seeded:.1f}s"
+    )
+
+    common, mid, rare = words[:50], words[200:2000], words[5000:]
+    shapes = {
+        "common term": lambda: rng.choice(common),
+        "rare term": lambda: rng.choice(rare),
+        "two terms": lambda: f"{rng.choice(common)} {rng.choice(mid)}",
+        "phrase": lambda: f'"{rng.choice(common)} {rng.choice(common)}"',
+        "prefix": lambda: rng.choice(mid)[:4] + "*",
+    }
+    filters = {
+        "": {},
+        " +status": {"status": "completed"},
+        " +date range": {"date_from": datetime(2022, 6, 1), "date_to": datetime(2022, 9, 1)},
+        " +kind": {"kinds": ["action_item", "decision"]},
+    }
+
+    print(f"{'query':<28}{'p50 ms':>9}{'p95 ms':>9}{'avg hits':>10}")
+    try:
+        for shape, make_query in shapes.items():
+            for suffix, options in filters.items():
+                if suffix and shape not in ("common term", "two terms"):
+                    continue
+                samples, hits = [], 0
+                for _ in range(args.queries):
+                    query = make_query()
+                    started = time.perf_counter()
+                    hits += len(SearchService.search(db, query, limit=20, **options))
+                    samples.append((time.perf_counter() - started) * 1000)
+                p50, p95 = percentiles(samples)
+                print(f"{shape + suffix:<28}{p50:>9.2f}{p95:>9.2f}{hits / args.queries:>10.1f}")
+
+        if args.like_queries:
+            samples = []
+            for _ in range(args.like_queries):
+                pattern = f"%{rng.choice(rare)}%"
+                started = time.perf_counter()
+                db.query(Meeting.id).filter(Meeting.transcript.like(pattern)).all()
+                samples.append((time.perf_counter() - started) * 1000)
+            p50, p95 = percentiles(samples)
+            print(f"{'LIKE scan (rare term)':<28}{p50:>9.2f}{p95:>9.2f}{'':>10}")
+    finally:
+        db.close()
+        engine.dispose()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+Stress SQLite with concurrent summarize-style writers and API-style readers.
+
+Usage (from the backend directory):
+    python -m benchmarks.sqlite_concurrency --writers 8 --readers 16 --duration 10
+
+Runs the same workload against a fresh database file three times:
+
+  baseline     rollback journal, every thread writes on its own session
+               (the behaviour before SQLITE_PERFORMANCE_MODE)
+  wal          WAL plus pragmas, every thread still writes on its own session
+  performance  WAL plus pragmas, writes funnelled through SQLiteWriteQueue
+
+Each writer repeatedly reads a meeting, then stores a summary and upserts a
+batch of action items, like a /summarize job finishing. Each reader lists
+meetings and loads one meeting's action items. "database is locked" errors
+are counted rather than retried.
+
+Writers that each hold a pooled connection can crowd readers out of the
+pool; the write queue needs only one connection at a time for writes, so
+compare reads/s and read latency as well as write throughput.
+"""
+import argparse
+import os
+import random
+import tempfile
+import threading
+import time
+from collections import Counter
+
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.core.database import Base, SQLiteWriteQueue, create_db_engine
+from app.models.models import Meeting, ActionItem
+from app.schemas.schemas import ActionItemCreate
+from app.services.action_item_service import ActionItemService
+from app.services.meeting_service import MeetingService
+
+def save_results(db, meeting_id: int, summary: str, items):
+    MeetingService.save_summary(db, meeting_id, summary)
+    ActionItemService.bulk_upsert_action_items(db, items)
+
+def writer(session_factory, write_queue, meeting_ids, deadline, stats, latencies, rng):
+    db = session_factory()
+    try:
+        while time.perf_counter() < deadline:
+            meeting_id = rng.choice(meeting_ids)
+            items = [
+                ActionItemCreate(meeting_id=meeting_id, title=f"Task {rng.randrange(40)}", description="Stress test", assignee="team")
+                for _ in range(20)
+            ]
+            start = time.perf_counter()
+            try:
+                # Read first, as a job does, then write
+                db.query(Meeting).filter(Meeting.id == meeting_id).first()
+                if write_queue is not None:
+                    db.rollback()
+                    write_queue.run(save_results, meeting_id, f"Summary {rng.random()}", items)
+                else:
+                    save_results(db, meeting_id, f"Summary {rng.random()}", items)
+                stats["writes"] += 1
+                latencies.append(time.perf_counter() - start)
+            except OperationalError as e:
+                db.rollback()
+                stats["locked" if "locked" in str(e) else "other_errors"] += 1
+    finally:
+        db.close()
+
+def reader(session_factory, meeting_ids, deadline, stats, latencies, rng):
+    db = session_factory()
+    try:
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                db.query(Meeting).order_by(Meeting.created_at.desc()).limit(20).all()
+                db.query(ActionItem).filter(ActionItem.meeting_id == rng.choice(meeting_ids)).all()
+                db.rollback()  # End the read transaction, as a request's session would
+                stats["reads"] += 1
+                latencies.append(time.perf_counter() - start)
+            except OperationalError as e:
+                db.rollback()
+                stats["locked" if "locked" in str(e) else "other_errors"] += 1
+    finally:
+        db.close()
+
+def p95(values) -> float:
+    values = sorted(values)
+    return values[int(0.95 * (len(values) - 1))] if values else 0.0
+
+def run(mode: str, args) -> dict:
+    settings.SQLITE_PERFORMANCE_MODE = mode != "baseline"
+    path = os.path.join(tempfile.mkdtemp(prefix="sqlite_stress_"), "stress.db")
+    engine = create_db_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    db = session_factory()
+    meetings = [Meeting(title=f"Meeting {i}") for i in range(args.meetings)]
+    db.add_all(meetings)
+    db.commit()
+    meeting_ids = [meeting.id for meeting in meetings]
+    db.close()
+
+    write_queue = SQLiteWriteQueue(session_factory) if mode == "performance" else None
+    # One counter per thread, summed afterwards
+    thread_stats = [Counter() for _ in range(args.writers + args.readers)]
+    write_latencies, read_latencies = [], []
+    deadline = time.perf_counter() + args.duration
+    threads = [
+        threading.Thread(target=writer, args=(session_factory, write_queue, meeting_ids, deadline, thread_stats[i], write_latencies, random.Random(i)))
+        for i in range(args.writers)
+    ] + [
+        threading.Thread(target=reader, args=(session_factory, meeting_ids, deadline, thread_stats[args.writers + i], read_latencies, random.Random(1000 + i)))
+        for i in range(args.readers)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if write_queue is not None:
+        write_queue.stop()
+    engine.dispose()
+    stats = sum(thread_stats, Counter())
+
+    return {
+        "mode": mode,
+        "writes_per_s": stats["writes"] / args.duration,
+        "reads_per_s": stats["reads"] / args.duration,
+        "p95_write_ms": p95(write_latencies) * 1000,
+        "p95_read_ms": p95(read_latencies) * 1000,
+        "locked": stats["locked"],
+        "other_errors": stats["other_errors"],
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--readers", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--meetings", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'mode':<13}{'writes/s':>10}{'reads/s':>10}{'p95 write ms':>14}{'p95 read ms':>13}{'locked':>8}{'other':>7}")
+    for mode in ("baseline", "wal", "performance"):
+        result = run(mode, args)
+        print(
+            f"{result['mode']:<13}{result['writes_per_s']:>10.1f}{result['reads_per_s']:>10.1f}"
+            f"{result['p95_write_ms']:>14.1f}{result['p95_read_ms']:>13.1f}{result['locked']:>8}{result['other_errors']:>7}"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Compare per-chunk summarization against batched summarization.
+
+Usage (from the backend directory):
+    python -m benchmarks.summarization_batching --words 8000 --meetings 3 --batch-size 4
+
+Reports input throughput in tokens/sec for both modes.
+"""
+import argparse
+import random
+import time
+
+from app.services.summarization_service import SummarizationService
+
+WORDS = (
+    "we need to finalize the budget for next quarter and review the vendor proposals "
+    "before friday the design team will share mockups and engineering will estimate "
+    "the migration effort marketing wants a launch date and support asked about staffing"
+).split()
+
+def make_transcript(num_words: int, seed: int) -> str:
+    """Build a synthetic transcript of roughly num_words words"""
+    rng = random.Random(seed)
+    sentences = []
+    remaining = num_words
+    while remaining > 0:
+        length = min(remaining, rng.randint(8, 25))
+        sentences.append(' '.join(rng.choice(WORDS) for _ in range(length)).capitalize())
+        remaining -= length
+    return '. '.join(sentences) + '.'
+
+def summarize_loop(texts, max_length, min_length):
+    """The original behaviour: one pipeline call per chunk"""
+    results = []
+    for text in texts:
+        summaries = []
+        for chunk in SummarizationService._chunk(text).chunks:
+            summaries.append(SummarizationService._summarizer(
+                chunk.text,
+                max_length=max_length,
+                min_length=min_length,
+                do_sample=False,
+                truncation=True
+            )[0]['summary_text'])
+        results.append(' '.join(summaries))
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--words", type=int, default=8000, help="Words per synthetic transcript")
+    parser.add_argument("--meetings", type=int, default=3, help="Number of transcripts summarized together")
+    parser.add_argument("--batch-size", type=int, default=4)
+    parser.add_argument("--max-length", type=int, default=142)
+    parser.add_argument("--min-length", type=int, default=30)
+    args = parser.parse_args()
+
+    SummarizationService._load_summarizer()
+    texts = [make_transcript(args.words, seed) for seed in range(args.meetings)]
+    total_tokens = sum(len(SummarizationService._tokenizer.encode(text)) for text in texts)
+    print(f"{args.meetings} transcripts, {total_tokens} input tokens")
+
+    start = time.perf_counter()
+    summarize_loop(texts, args.max_length, args.min_length)
+    loop_time = time.perf_counter() - start
+    print(f"loop:    {loop_time:8.2f}s  {total_tokens / loop_time:8.1f} tokens/sec")
+
+    start = time.perf_counter()
+    SummarizationService._summarize_texts(texts, args.max_length, args.min_length, args.batch_size)
+    batched_time = time.perf_counter() - start
+    print(f"batched: {batched_time:8.2f}s  {total_tokens / batched_time:8.1f} tokens/sec (batch_size={args.batch_size})")
+    print(f"speedup: {loop_time / batched_time:.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Compare summary decoding presets on local sample transcripts: latency
+against ROUGE.
+
+Usage (from the backend directory):
+    python -m benchmarks.summary_presets --samples path/to/samples
+    python -m benchmarks.summary_presets --samples path/to/samples --batch-size 8 --verbose
+
+The samples directory holds transcripts with a reference summary of the same
+name: standup.txt and standup.summary.txt, and so on. Each transcript is
+summarized without the result cache by:
+- previous: beam search with the model's own decoding settings and a length
+  budget of half the chunk, as summaries were made before presets
+- quality: the "quality" preset with per-chunk length budgets
+- fast: the "fast" preset (greedy) with per-chunk length budgets
+For each it reports seconds per transcript, summary length in words, and
+ROUGE-1, ROUGE-2 and ROUGE-L F1 against the references, after lowercasing
+and dropping punctuation. The model is loaded before timing starts.
+"""
+import argparse
+import os
+import re
+import time
+from collections import Counter
+from typing import Dict, List
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.summarization_service import MAX_CHUNK_TOKENS, SUMMARY_PRESETS, SummarizationService
+
+def normalize(text: str) -> List[str]:
+    return re.sub(r"[^\w\s']", " ", text.lower()).split()
+
+def f1(overlap: int, candidate: int, reference: int) -> float:
+    if not overlap:
+        return 0.0
+    precision, recall = overlap / candidate, overlap / reference
+    return 2 * precision * recall / (precision + recall)
+
+def rouge_n(candidate: List[str], reference: List[str], n: int) -> float:
+    candidate_ngrams = Counter(zip(*[candidate[i:] for i in range(n)]))
+    reference_ngrams = Counter(zip(*[reference[i:] for i in range(n)]))
+    overlap = sum((candidate_ngrams & reference_ngrams).values())
+    return f1(overlap, sum(candidate_ngrams.values()), sum(reference_ngrams.values()))
+
+def longest_common_subsequence(candidate: List[str], reference: List[str]) -> int:
+    """LCS length, one row of the dynamic programme at a time"""
+    if not candidate or not reference:
+        return 0
+    vocabulary = {word: i for i, word in enumerate(set(candidate) | set(reference))}
+    reference_ids = np.array([vocabulary[word] for word in reference])
+    previous = np.zeros(len(reference) + 1, dtype=np.int64)
+    for word in candidate:
+        current = np.zeros_like(previous)
+        current[1:] = np.maximum(previous[1:], np.where(reference_ids == vocabulary[word], previous[:-1] + 1, 0))
+        # Skipping a reference word carries the best length so far along the row
+        previous = np.maximum.accumulate(current)
+    return int(previous[-1])
+
+def rouge_l(candidate: List[str], reference: List[str]) -> float:
+    return f1(longest_common_subsequence(candidate, reference), len(candidate), len(reference))
+
+def load_samples(directory: str) -> List[Dict[str, str]]:
+    """Transcripts in directory that have a reference summary beside them"""
+    samples = []
+    for name in sorted(os.listdir(directory)):
+        if not name.endswith(".txt") or name.endswith(".summary.txt"):
+            continue
+        reference = os.path.join(directory, f"{name[:-len('.txt')]}.summary.txt")
+        if os.path.exists(reference):
+            with open(os.path.join(directory, name), encoding="utf-8") as f:
+                transcript = f.read()
+            with open(reference, encoding="utf-8") as f:
+                samples.append({"name": name, "transcript": transcript, "reference": f.read()})
+    return samples
+
+def summarize_previous(text: str, min_length: int, batch_size: int) -> str:
+    """Summaries as made before presets: every chunk may use half its length"""
+    chunked = SummarizationService._chunk(text)
+    max_length = max(min_length, chunked.num_tokens // 2)
+    summary = ' '.join(SummarizationService._summarize_batched(
+        [chunk.text for chunk in chunked.chunks], max_length, min_length, batch_size
+    ))
+    if len(SummarizationService._tokenizer.encode(summary)) > MAX_CHUNK_TOKENS:
+        summary = SummarizationService._summarize_batched([summary], max_length, min_length, batch_size)[0]
+    return summary
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--samples", required=True, help="Directory of transcripts with .summary.txt references")
+    parser.add_argument("--batch-size", type=int, default=settings.SUMMARIZATION_BATCH_SIZE)
+    parser.add_argument("--min-length", type=int, default=30)
+    parser.add_argument("--verbose", action="store_true", help="Also report every sample")
+    args = parser.parse_args()
+
+    samples = load_samples(args.samples)
+    if not samples:
+        raise SystemExit(f"No transcripts with reference summaries in {args.samples}")
+    SummarizationService._load_summarizer()
+    print(f"Samples: {len(samples)} transcripts")
+
+    runs = {"previous": lambda text: summarize_previous(text, args.min_length, args.batch_size)}
+    for preset in SUMMARY_PRESETS:
+        runs[preset] = lambda text, preset=preset: SummarizationService._summarize_texts(
+            [text], None, args.min_length, args.batch_size, preset=preset
+        )[0]
+
+    print(f"{'decoding':<12}{'s/text':>9}{'words':>8}{'ROUGE-1':>9}{'ROUGE-2':>9}{'ROUGE-L':>9}")
+    for name, summarize in runs.items():
+        seconds, scores = [], []
+        for sample in samples:
+            started = time.perf_counter()
+            summary = summarize(sample["transcript"])
+            seconds.append(time.perf_counter() - started)
+            candidate, reference = normalize(summary), normalize(sample["reference"])
+            scores.append((
+                len(candidate),
+                rouge_n(candidate, reference, 1),
+                rouge_n(candidate, reference, 2),
+                rouge_l(candidate, reference)
+            ))
+        words, rouge1, rouge2, rougel = np.mean(scores, axis=0)
+        print(f"{name:<12}{np.mean(seconds):>9.2f}{words:>8.0f}{rouge1:>9.3f}{rouge2:>9.3f}{rougel:>9.3f}")
+        if args.verbose:
+            for sample, elapsed, score in zip(samples, seconds, scores):
+                print(f"  {sample['name']:<30}{elapsed:>7.2f}s  R-1 {score[1]:.3f}  R-2 {score[2]:.3f}  R-L {score[3]:.3f}")
+
+if __name__ == "__main__":
+    main()
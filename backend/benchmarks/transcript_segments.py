@@ -0,0 +1,139 @@
+"""
+Measure reading part of a long transcript from the segment table against
+loading the whole transcript.
+
+Usage (from the backend directory):
+    python -m benchmarks.transcript_segments --meetings 200 --hours 2 --window-minutes 5
+
+Builds a throwaway SQLite database (or uses --database-url, which must be an
+empty scratch database) of meetings with --hours of transcript each, stored
+both as Meeting.transcript and as transcript_segments rows of 2-8 seconds.
+Then times, for random meetings:
+- loading the whole transcript (what every consumer did before)
+- a --window-minutes time range through MeetingService.get_segment_range
+- the same number of segments by segment ID
+- the character range of that window, sliced by the database
+- one speaker's segments inside the window
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from sqlalchemy import insert
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base, create_db_engine
+from app.models.models import Meeting, TranscriptSegment
+from app.services.meeting_service import MeetingService
+
+WORDS = "we should ship the budget review next week and ask finance about the vendor quote before friday".split()
+
+def seed(engine, args, rng):
+    """Meetings with transcripts of args.hours; returns (segments, characters) per meeting"""
+    counts = {}
+    with engine.begin() as connection:
+        for meeting_id in range(1, args.meetings + 1):
+            segments, position, now = [], 0, 0.0
+            while now < args.hours * 3600:
+                length = rng.uniform(2, 8)
+                segments.append({
+                    "meeting_id": meeting_id,
+                    "position": position,
+                    "start_time": round(now, 2),
+                    "end_time": round(now + length, 2),
+                    "speaker": rng.randrange(4),
+                    "text": " ".join(rng.choices(WORDS, k=int(length * 2.5)))
+                })
+                position += 1
+                now += length + rng.uniform(0, 0.5)
+            transcript = " ".join(segment["text"] for segment in segments)
+            connection.execute(insert(Meeting), [{
+                "id": meeting_id,
+                "title": f"Meeting {meeting_id}",
+                "transcript": transcript,
+                "transcribed_until": now
+            }])
+            connection.execute(insert(TranscriptSegment), segments)
+            counts[meeting_id] = (len(segments), len(transcript))
+    return counts
+
+def percentiles(samples):
+    samples = sorted(samples)
+    return statistics.median(samples), samples[int(0.95 * (len(samples) - 1))]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--meetings", type=int, default=200)
+    parser.add_argument("--hours", type=float, default=2.0, help="Transcript length per meeting")
+    parser.add_argument("--window-minutes", type=float, default=5.0)
+    parser.add_argument("--reads", type=int, default=200, help="Reads timed per access pattern")
+    parser.add_argument("--database-url")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    database_url = args.database_url or f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='segments_'), 'bench.db')}"
+    engine = create_db_engine(database_url)
+    Base.metadata.create_all(bind=engine)
+
+    started = time.perf_counter()
+    counts = seed(engine, args, rng)
+    print(
+        f"Seeded {args.meetings} meetings, {sum(count for count, _ in counts.values())} segments "
+        f"({args.hours:g} h each) in {time.perf_counter() - started:.1f}s"
+    )
+
+    db = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    window = args.window_minutes * 60
+    share = window / (args.hours * 3600)
+    per_window = max(1, int(sum(count for count, _ in counts.values()) / args.meetings * share))
+
+    def whole_transcript():
+        meeting_id = rng.randint(1, args.meetings)
+        return len(db.query(Meeting.transcript).filter(Meeting.id == meeting_id).scalar())
+
+    def time_range():
+        meeting_id, start = rng.randint(1, args.meetings), rng.uniform(0, args.hours * 3600 - window)
+        return len(MeetingService.get_segment_range(db, meeting_id, start_time=start, end_time=start + window))
+
+    def segment_range():
+        meeting_id = rng.randint(1, args.meetings)
+        first = rng.randrange(max(1, counts[meeting_id][0] - per_window))
+        return len(MeetingService.get_segment_range(db, meeting_id, first=first, last=first + per_window - 1))
+
+    def character_range():
+        meeting_id = rng.randint(1, args.meetings)
+        length = int(counts[meeting_id][1] * share)
+        offset = rng.randrange(max(1, counts[meeting_id][1] - length))
+        return len(MeetingService.get_transcript_range(db, meeting_id, offset, length))
+
+    def speaker_in_range():
+        meeting_id, start = rng.randint(1, args.meetings), rng.uniform(0, args.hours * 3600 - window)
+        return len(MeetingService.get_segment_range(
+            db, meeting_id, start_time=start, end_time=start + window, speaker=rng.randrange(4)
+        ))
+
+    patterns = {
+        "whole transcript": (whole_transcript, "chars"),
+        f"{args.window_minutes:g} min time range": (time_range, "segments"),
+        f"{per_window} segments by ID": (segment_range, "segments"),
+        f"{args.window_minutes:g} min as characters": (character_range, "chars"),
+        "one speaker in time range": (speaker_in_range, "segments"),
+    }
+    print(f"{'read':<32}{'p50 ms':>9}{'p95 ms':>9}{'avg size':>12}")
+    try:
+        for name, (read, unit) in patterns.items():
+            samples, size = [], 0
+            for _ in range(args.reads):
+                started = time.perf_counter()
+                size += read()
+                samples.append((time.perf_counter() - started) * 1000)
+            p50, p95 = percentiles(samples)
+            print(f"{name:<32}{p50:>9.2f}{p95:>9.2f}{size / args.reads:>9.0f} {unit}")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
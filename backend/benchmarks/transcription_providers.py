@@ -0,0 +1,142 @@
+"""
+Compare transcription providers on a local audio corpus: speed, memory and
+word error rate.
+
+Usage (from the backend directory):
+    python -m benchmarks.transcription_providers --corpus path/to/corpus
+    python -m benchmarks.transcription_providers --corpus path/to/corpus --providers whisper-tiny,whisper-small,vosk
+
+The corpus is a directory of recordings, each with a reference transcript
+of the same name: meeting1.wav and meeting1.txt, standup.mp3 and
+standup.txt, and so on. Every provider runs in a fresh process, one after
+the other, over the whole corpus (one pass per file, as TRANSCRIPTION_MODE
+"single" does). For each provider it reports:
+- model load time
+- real-time factor: transcription seconds per second of audio, excluding
+  decoding and model loading (below 1 is faster than real time)
+- word error rate over the corpus: word substitutions, insertions and
+  deletions against the references, after lowercasing and dropping
+  punctuation. Numbers are compared as written, so "3" and "three" differ.
+- peak resident memory of the process, decoded audio included
+"""
+import argparse
+import multiprocessing
+import os
+import re
+import resource
+import time
+from typing import Dict, List
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.audio_service import AudioService
+from app.services.segmentation import SAMPLE_RATE
+
+def normalize(text: str) -> List[str]:
+    return re.sub(r"[^\w\s']", " ", text.lower()).split()
+
+def word_errors(reference: List[str], hypothesis: List[str]) -> int:
+    """Word-level edit distance, one row of the dynamic programme at a time"""
+    if not reference or not hypothesis:
+        return max(len(reference), len(hypothesis))
+    vocabulary = {word: i for i, word in enumerate(set(reference) | set(hypothesis))}
+    hypothesis_ids = np.array([vocabulary[word] for word in hypothesis])
+    columns = np.arange(len(hypothesis) + 1)
+    previous = columns.copy()
+    for i, word in enumerate(reference, start=1):
+        substitution = previous[:-1] + (hypothesis_ids != vocabulary[word])
+        current = np.empty_like(previous)
+        current[0] = i
+        current[1:] = np.minimum(previous[1:] + 1, substitution)
+        # Insertions chain along the row: current[j] = min over k <= j of current[k] + (j - k)
+        current = np.minimum.accumulate(current - columns) + columns
+        previous = current
+    return int(previous[-1])
+
+def load_corpus(directory: str) -> List[Dict[str, str]]:
+    """Recordings in directory that have a reference transcript beside them"""
+    items = []
+    for name in sorted(os.listdir(directory)):
+        stem, extension = os.path.splitext(name)
+        reference = os.path.join(directory, f"{stem}.txt")
+        if extension.lower() != ".txt" and os.path.exists(reference):
+            with open(reference, encoding="utf-8") as f:
+                items.append({"name": name, "audio": os.path.join(directory, name), "reference": f.read()})
+    return items
+
+def run_provider(name: str, corpus: List[Dict[str, str]]) -> Dict:
+    """Load one provider and transcribe the corpus with it; runs in its own process"""
+    from app.services.transcription_service import TranscriptionService
+
+    started = time.perf_counter()
+    provider = TranscriptionService._load_model(name)
+    load_seconds = time.perf_counter() - started
+
+    audio_seconds, transcribe_seconds, errors, words, files = 0.0, 0.0, 0, 0, []
+    for item in corpus:
+        samples = np.concatenate(list(AudioService.iter_pcm(item["audio"])))
+        started = time.perf_counter()
+        text = provider.transcribe(samples)["text"]
+        elapsed = time.perf_counter() - started
+
+        reference = normalize(item["reference"])
+        file_errors = word_errors(reference, normalize(text))
+        audio_seconds += len(samples) / SAMPLE_RATE
+        transcribe_seconds += elapsed
+        errors += file_errors
+        words += len(reference)
+        files.append({
+            "name": item["name"],
+            "rtf": elapsed / max(len(samples) / SAMPLE_RATE, 1e-9),
+            "wer": file_errors / max(len(reference), 1)
+        })
+    return {
+        "provider": provider.name,
+        "load_seconds": load_seconds,
+        "audio_seconds": audio_seconds,
+        "rtf": transcribe_seconds / max(audio_seconds, 1e-9),
+        "wer": errors / max(words, 1),
+        # ru_maxrss is in kilobytes on Linux
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "files": files
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", required=True, help="Directory of recordings with .txt reference transcripts")
+    parser.add_argument(
+        "--providers",
+        default=",".join(dict.fromkeys([settings.TRANSCRIPTION_FAST_PROVIDER, settings.TRANSCRIPTION_PROVIDER, "vosk"])),
+        help="Comma-separated provider names"
+    )
+    parser.add_argument("--verbose", action="store_true", help="Also report every file")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus)
+    if not corpus:
+        raise SystemExit(f"No recordings with reference transcripts in {args.corpus}")
+    print(f"Corpus: {len(corpus)} recordings")
+
+    results = []
+    context = multiprocessing.get_context("spawn")
+    for name in [name.strip() for name in args.providers.split(",") if name.strip()]:
+        # A fresh process per provider, so peak memory is that provider's alone
+        with context.Pool(1) as pool:
+            try:
+                results.append(pool.apply(run_provider, (name, corpus)))
+            except Exception as e:
+                print(f"{name}: unavailable ({str(e)})")
+
+    print(f"{'provider':<18}{'load s':>8}{'audio min':>11}{'RTF':>8}{'WER':>8}{'peak MB':>9}")
+    for result in results:
+        print(
+            f"{result['provider']:<18}{result['load_seconds']:>8.1f}{result['audio_seconds'] / 60:>11.1f}"
+            f"{result['rtf']:>8.3f}{result['wer']:>8.1%}{result['peak_rss_mb']:>9.0f}"
+        )
+        if args.verbose:
+            for file in result["files"]:
+                print(f"  {file['name']:<30}RTF {file['rtf']:.3f}  WER {file['wer']:.1%}")
+
+if __name__ == "__main__":
+    main()
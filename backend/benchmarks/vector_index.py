@@ -0,0 +1,70 @@
+"""
+Measure VectorIndex build and query latency over random unit vectors.
+
+Usage (from the backend directory):
+    python -m benchmarks.vector_index --meetings 5000 --chunks 20 --dim 384
+
+Fills a throwaway index (or --directory, which must be empty) with the
+requested number of meetings, each with --chunks vectors plus one meeting
+vector, the layout EmbeddingService writes. Then times top-k queries one at a
+time and in batches, and related-meeting lookups, which scan only meeting
+vectors. No model is loaded: the vectors are random, so this measures the
+index alone, not embedding.
+"""
+import argparse
+import statistics
+import tempfile
+import time
+
+import numpy as np
+
+from app.services.embedding_service import EMBEDDING_KINDS
+from app.services.vector_index import VectorIndex
+
+def percentiles(samples):
+    samples = sorted(samples)
+    return statistics.median(samples), samples[int(0.95 * (len(samples) - 1))]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--meetings", type=int, default=5000)
+    parser.add_argument("--chunks", type=int, default=20, help="Vectors per meeting, besides the meeting vector")
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=100, help="Queries timed per shape")
+    parser.add_argument("--batch", type=int, default=32, help="Queries per batched search")
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--directory")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    index = VectorIndex(args.directory or tempfile.mkdtemp(prefix="vectors_"), args.dim, "benchmark")
+    rows = [{"item_id": 0, "kind": EMBEDDING_KINDS["transcript"]} for _ in range(args.chunks)]
+    rows.append({"item_id": 0, "kind": EMBEDDING_KINDS["meeting"]})
+
+    start = time.perf_counter()
+    for meeting_id in range(1, args.meetings + 1):
+        index.replace_meeting(meeting_id, rows, rng.standard_normal((len(rows), args.dim), dtype=np.float32))
+    built = time.perf_counter() - start
+    print(f"Indexed {len(index)} vectors for {args.meetings} meetings in {built:.1f}s ({1000 * built / args.meetings:.2f} ms per meeting)")
+
+    searchable = [EMBEDDING_KINDS[kind] for kind in ("transcript", "summary", "decision")]
+    shapes = {
+        "single query": lambda: index.search(rng.standard_normal((1, args.dim)), args.k, kinds=searchable),
+        f"batch of {args.batch} (per query)": lambda: index.search(rng.standard_normal((args.batch, args.dim)), args.k, kinds=searchable),
+        "related meetings": lambda: index.search(
+            rng.standard_normal((1, args.dim)), args.k, kinds=[EMBEDDING_KINDS["meeting"]], exclude_meeting_id=1
+        ),
+    }
+    print(f"{'query':<28}{'p50 ms':>9}{'p95 ms':>9}")
+    for shape, run in shapes.items():
+        per_call = args.batch if shape.startswith("batch") else 1
+        samples = []
+        for _ in range(args.queries):
+            started = time.perf_counter()
+            run()
+            samples.append((time.perf_counter() - started) * 1000 / per_call)
+        p50, p95 = percentiles(samples)
+        print(f"{shape:<28}{p50:>9.2f}{p95:>9.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,14 @@
-from app.core.database import engine
-from app.models.models import Base
+from alembic import command
+from alembic.config import Config
 import os
 
-# Create uploads directory if it doesn't exist
-os.makedirs("uploads", exist_ok=True)
+ALEMBIC_INI = os.path.join(os.path.dirname(os.path.abspath(__file__)), "alembic.ini")
 
-# Create all tables
-Base.metadata.create_all(bind=engine)
-print("Database tables created successfully!")
-print("Uploads directory created successfully!") 
\ No newline at end of file
+if __name__ == "__main__":
+    # Create uploads directory if it doesn't exist
+    os.makedirs("uploads", exist_ok=True)
+
+    # Create or migrate all tables (same as `alembic upgrade head`)
+    command.upgrade(Config(ALEMBIC_INI), "head")
+    print("Database tables created successfully!")
+    print("Uploads directory created successfully!")
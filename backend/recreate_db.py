@@ -1,7 +1,10 @@
-from app.core.database import recreate_tables
-from app.models.models import Base
- 
+from alembic import command
+from alembic.config import Config
+from create_db import ALEMBIC_INI
+
 if __name__ == "__main__":
     print("Recreating database tables...")
-    recreate_tables()
-    print("Database tables recreated successfully!") 
\ No newline at end of file
+    config = Config(ALEMBIC_INI)
+    command.downgrade(config, "base")
+    command.upgrade(config, "head")
+    print("Database tables recreated successfully!")
\ No newline at end of file
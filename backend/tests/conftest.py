@@ -0,0 +1,34 @@
+import os
+import tempfile
+
+# Point the app's default engine at a scratch database before anything imports it
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='tests_'), 'app.db')}")
+
+import pytest
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+
+@pytest.fixture
+def fake_calendar(monkeypatch):
+    """
+    A local stand-in for the Google Calendar API with CalendarService pointed
+    at it; yields the server's state. Settings, the token file and the
+    session binding are restored afterwards.
+    """
+    from app.services.calendar_service import CalendarService
+    from benchmarks.fake_calendar import start_fake_calendar
+
+    monkeypatch.setattr(settings, "CALENDAR_API_ENDPOINT", settings.CALENDAR_API_ENDPOINT)
+    monkeypatch.setattr(settings, "CALENDAR_BATCH_ENDPOINT", settings.CALENDAR_BATCH_ENDPOINT)
+    monkeypatch.setattr(CalendarService, "TOKEN_FILE", CalendarService.TOKEN_FILE)
+    bind = SessionLocal.kw.get("bind")
+    server, state = start_fake_calendar()
+    try:
+        yield state
+    finally:
+        CalendarService.reset()
+        CalendarService._local.http = None
+        server.shutdown()
+        server.server_close()
+        SessionLocal.configure(bind=bind)
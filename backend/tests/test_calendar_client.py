@@ -0,0 +1,64 @@
+from datetime import datetime, timedelta
+
+import httplib2
+
+from app.core.config import settings
+from app.services import calendar_service
+from app.services.calendar_service import CalendarService
+
+def _start():
+    return datetime.utcnow() + timedelta(days=1)
+
+def test_client_is_built_once(fake_calendar, monkeypatch):
+    builds = []
+    build = calendar_service.build
+    monkeypatch.setattr(calendar_service, "build", lambda *args, **kwargs: builds.append(1) or build(*args, **kwargs))
+
+    created = CalendarService.create_meeting_event("Standup", "", _start(), _start() + timedelta(minutes=15))
+    CalendarService.update_meeting_event(created["event_id"], summary="Renamed")
+    for _ in range(5):
+        CalendarService.get_upcoming_meetings()
+    CalendarService.delete_meeting_event(created["event_id"])
+
+    assert len(builds) == 1
+    # One keep-alive connection serves every call from this thread
+    assert fake_calendar.connections == 1
+
+def test_token_is_read_once_and_refreshed_without_unpickling(fake_calendar, monkeypatch):
+    loads = []
+    load_token = CalendarService._load_token
+    monkeypatch.setattr(CalendarService, "_load_token", staticmethod(lambda: loads.append(1) or load_token()))
+
+    for _ in range(5):
+        CalendarService.get_upcoming_meetings()
+    assert len(loads) == 1
+    assert fake_calendar.token_requests == 0
+
+    # An access token about to expire is refreshed in place, on the next call
+    CalendarService._credentials.expiry = datetime.utcnow() + timedelta(seconds=5)
+    CalendarService.get_upcoming_meetings()
+    assert fake_calendar.token_requests == 1
+    assert CalendarService._credentials.token.startswith("token-")
+
+    # And ahead of time by the background timer
+    CalendarService._background_refresh()
+    assert fake_calendar.token_requests == 2
+    for _ in range(3):
+        CalendarService.get_upcoming_meetings()
+    assert len(loads) == 1
+    assert fake_calendar.token_requests == 2
+
+def test_discovery_document_is_not_fetched(fake_calendar, monkeypatch):
+    urls = []
+    request = httplib2.Http.request
+    monkeypatch.setattr(httplib2.Http, "request", lambda self, uri, *args, **kwargs: urls.append(uri) or request(self, uri, *args, **kwargs))
+
+    for _ in range(3):
+        CalendarService.get_upcoming_meetings()
+    # Even rebuilding the client uses the document bundled with the library
+    CalendarService.reset()
+    CalendarService.get_upcoming_meetings()
+
+    assert len(urls) == 4
+    assert all(url.startswith(settings.CALENDAR_API_ENDPOINT) for url in urls)
+    assert fake_calendar.requests == 4
@@ -0,0 +1,110 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.core.database import SessionLocal
+from app.models.models import CalendarEvent, CalendarSyncState
+from app.services.calendar_service import CalendarService
+
+def event_body(title, start_in, minutes=30):
+    start = datetime.utcnow() + start_in
+    return {
+        "summary": title,
+        "start": {"dateTime": start.isoformat() + "Z"},
+        "end": {"dateTime": (start + timedelta(minutes=minutes)).isoformat() + "Z"},
+    }
+
+def local_events(db):
+    db.rollback()
+    return {row.id: row for row in db.query(CalendarEvent).all()}
+
+@pytest.fixture
+def db(fake_calendar):
+    session = SessionLocal()
+    yield session
+    session.close()
+
+def test_full_sync_skips_events_that_have_ended(fake_calendar, db):
+    past = fake_calendar.insert(event_body("Retro", -timedelta(days=30)))
+    running = fake_calendar.insert(event_body("Planning", -timedelta(minutes=10), minutes=60))
+    upcoming = fake_calendar.insert(event_body("Standup", timedelta(days=1)))
+
+    # Only events that haven't ended are downloaded at all
+    assert CalendarService.sync_events(db) == 2
+    assert set(local_events(db)) == {running["id"], upcoming["id"]}
+    assert past["id"] not in local_events(db)
+    assert db.get(CalendarSyncState, "primary").sync_token is not None
+
+def test_incremental_sync_applies_changes_and_removes_cancelled_events(fake_calendar, db):
+    kept = fake_calendar.insert(event_body("Standup", timedelta(days=1)))
+    renamed = fake_calendar.insert(event_body("Review", timedelta(days=2)))
+    cancelled = fake_calendar.insert(event_body("Offsite", timedelta(days=3)))
+    CalendarService.sync_events(db)
+
+    added = fake_calendar.insert(event_body("Kickoff", timedelta(days=4)))
+    fake_calendar.patch(renamed["id"], {"summary": "Design review"})
+    fake_calendar.delete(cancelled["id"])
+
+    # Only the three changes are fetched
+    assert CalendarService.sync_events(db) == 3
+    events = local_events(db)
+    assert set(events) == {kept["id"], renamed["id"], added["id"]}
+    assert '"Design review"' in events[renamed["id"]].data
+
+def test_expired_sync_token_falls_back_to_full_sync(fake_calendar, db):
+    kept = fake_calendar.insert(event_body("Standup", timedelta(days=1)))
+    dropped = fake_calendar.insert(event_body("Offsite", timedelta(days=2)))
+    CalendarService.sync_events(db)
+    old_token = db.get(CalendarSyncState, "primary").sync_token
+
+    fake_calendar.reset_sync_tokens()
+    fake_calendar.delete(dropped["id"])
+    added = fake_calendar.insert(event_body("Kickoff", timedelta(days=3)))
+
+    # The 410 Gone for the old token is answered with a full sync
+    assert CalendarService.sync_events(db) == 2
+    assert set(local_events(db)) == {kept["id"], added["id"]}
+    db.rollback()
+    assert db.get(CalendarSyncState, "primary").sync_token != old_token
+
+def test_batch_writes_report_failures_per_event(fake_calendar, db):
+    created = CalendarService.batch_create_events([
+        {"summary": f"Meeting {i}", "description": "", "start_time": datetime.utcnow() + timedelta(days=i + 1),
+         "end_time": datetime.utcnow() + timedelta(days=i + 1, hours=1)}
+        for i in range(3)
+    ])
+    assert all("error" not in result for result in created)
+    ids = [result["event_id"] for result in created]
+    assert set(local_events(db)) == set(ids)
+
+    updated = CalendarService.batch_update_events([
+        {"event_id": ids[0], "summary": "Renamed 0"},
+        {"event_id": "missing", "summary": "Nobody"},
+        {"event_id": ids[2], "summary": "Renamed 2"},
+    ])
+    assert "error" not in updated[0] and "error" not in updated[2]
+    assert updated[1]["event_id"] == "missing" and updated[1]["error"]
+    events = local_events(db)
+    assert '"Renamed 0"' in events[ids[0]].data
+    assert '"Meeting 1"' in events[ids[1]].data
+    assert '"Renamed 2"' in events[ids[2]].data
+
+    deleted = CalendarService.batch_delete_events([ids[0], "missing"])
+    assert deleted[0] == {"event_id": ids[0], "error": None}
+    assert deleted[1]["error"]
+    assert set(local_events(db)) == {ids[1], ids[2]}
+
+def test_app_writes_reach_the_local_copy_without_a_sync(fake_calendar, db):
+    start = datetime.utcnow() + timedelta(days=1)
+    created = CalendarService.create_meeting_event("Standup", "Daily", start, start + timedelta(minutes=15))
+    assert created["event_id"] in local_events(db)
+
+    CalendarService.update_meeting_event(created["event_id"], summary="Team standup")
+    assert '"Team standup"' in local_events(db)[created["event_id"]].data
+
+    CalendarService.delete_meeting_event(created["event_id"])
+    assert created["event_id"] not in local_events(db)
+    # All of it without listing events from the API
+    assert db.get(CalendarSyncState, "primary") is None
+    listed = CalendarService.get_synced_upcoming_meetings(db)
+    assert listed["events"] == []
@@ -0,0 +1,58 @@
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base, create_db_engine
+from app.models.models import Meeting, SearchDocument
+from app.services.meeting_service import MeetingService
+from app.services.search_service import SearchService
+
+SEGMENTS = [
+    {"start": 0.0, "end": 4.0, "speaker": 0, "text": "Welcome everyone to planning"},
+    {"start": 4.0, "end": 9.5, "speaker": 1, "text": "The budget review slipped"},
+    {"start": 9.5, "end": 12.0, "speaker": 1, "text": "to next week"},
+    {"start": 12.0, "end": 15.0, "speaker": 0, "text": "Thanks, noted"},
+]
+TRANSCRIPT = " ".join(segment["text"] for segment in SEGMENTS)
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'search.db'}")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    session.add(Meeting(title="Planning"))
+    session.commit()
+    yield session
+    session.close()
+    engine.dispose()
+
+def test_diarized_transcript_is_searched_per_turn(db):
+    MeetingService.save_transcript_progress(db, 1, TRANSCRIPT, 15.0, SEGMENTS)
+
+    hits = SearchService.search(db, "budget", kinds=["transcript"])
+    assert len(hits) == 1
+    assert hits[0]["kind"] == "transcript"
+    assert hits[0]["item_id"] == hits[0]["meeting_id"] == 1
+    assert (hits[0]["speaker"], hits[0]["start_time"], hits[0]["end_time"]) == ("Speaker 2", 4.0, 12.0)
+    assert "<mark>budget</mark>" in hits[0]["snippet"]
+    # One document per turn, none for the whole transcript
+    kinds = [kind for kind, in db.query(SearchDocument.kind).filter(SearchDocument.meeting_id == 1)]
+    assert sorted(kinds) == ["turn", "turn", "turn"]
+
+def test_relabelled_speakers_are_reindexed(db):
+    MeetingService.save_transcript_progress(db, 1, TRANSCRIPT, 15.0, SEGMENTS)
+    MeetingService.save_segments(db, 1, [dict(segment, speaker=0) for segment in SEGMENTS])
+
+    hit, = SearchService.search(db, "budget")
+    assert (hit["speaker"], hit["start_time"], hit["end_time"]) == ("Speaker 1", 0.0, 15.0)
+
+    # Without speakers the transcript is one document again
+    MeetingService.save_segments(db, 1, [dict(segment, speaker=None) for segment in SEGMENTS])
+    hit, = SearchService.search(db, "budget")
+    assert hit["kind"] == "transcript" and hit["speaker"] is None
+
+def test_rebuild_index_keeps_turns(db):
+    MeetingService.save_transcript_progress(db, 1, TRANSCRIPT, 15.0, SEGMENTS)
+    before = sorted(db.query(SearchDocument.kind, SearchDocument.item_id, SearchDocument.body).all())
+
+    assert SearchService.rebuild_index(db) == 3
+    assert sorted(db.query(SearchDocument.kind, SearchDocument.item_id, SearchDocument.body).all()) == before
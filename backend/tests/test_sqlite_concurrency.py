@@ -0,0 +1,105 @@
+import threading
+
+import pytest
+from sqlalchemy import func
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.core.database import Base, SQLiteWriteQueue, create_db_engine, run_write
+from app.models.models import ActionItem, Meeting
+from app.schemas.schemas import ActionItemCreate
+from app.services.action_item_service import ActionItemService
+from app.services.meeting_service import MeetingService
+
+WRITERS = 8
+READERS = 8
+WRITES_PER_WRITER = 15
+ITEMS_PER_WRITE = 5
+MEETINGS = 4
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'stress.db'}")
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    db = factory()
+    db.add_all([Meeting(title=f"Meeting {i}") for i in range(MEETINGS)])
+    db.commit()
+    db.close()
+    yield factory
+    engine.dispose()
+
+def save_results(db, meeting_id, summary, items):
+    """What a finished summarize job writes"""
+    MeetingService.save_summary(db, meeting_id, summary)
+    ActionItemService.bulk_upsert_action_items(db, items)
+
+@pytest.mark.parametrize("use_queue", [False, True], ids=["wal", "write-queue"])
+def test_concurrent_readers_and_writers(session_factory, monkeypatch, use_queue):
+    monkeypatch.setattr(settings, "SQLITE_WRITE_QUEUE", False)
+    write_queue = SQLiteWriteQueue(session_factory) if use_queue else None
+    errors = []
+    writers_done = threading.Event()
+    # Every thread starts together, so writes really do contend
+    start = threading.Barrier(WRITERS + READERS)
+
+    def writer(index):
+        db = session_factory()
+        try:
+            start.wait()
+            for n in range(WRITES_PER_WRITER):
+                meeting_id = 1 + (index + n) % MEETINGS
+                items = [
+                    ActionItemCreate(
+                        meeting_id=meeting_id,
+                        title=f"Task {index}-{n}-{i}",
+                        description="",
+                        assignee=""
+                    )
+                    for i in range(ITEMS_PER_WRITE)
+                ]
+                # Read first, as a job does, then write
+                db.query(Meeting).filter(Meeting.id == meeting_id).first()
+                if write_queue is not None:
+                    db.rollback()
+                    write_queue.run(save_results, meeting_id, f"Summary {index}-{n}", items)
+                else:
+                    run_write(db, save_results, meeting_id, f"Summary {index}-{n}", items)
+        except Exception as e:
+            errors.append(e)
+        finally:
+            db.close()
+
+    def reader():
+        db = session_factory()
+        try:
+            start.wait()
+            while not writers_done.is_set():
+                db.query(Meeting).order_by(Meeting.id.desc()).limit(20).all()
+                db.query(ActionItem).filter(ActionItem.meeting_id == 1).all()
+                db.rollback()
+        except Exception as e:
+            errors.append(e)
+        finally:
+            db.close()
+
+    writers = [threading.Thread(target=writer, args=(i,)) for i in range(WRITERS)]
+    readers = [threading.Thread(target=reader) for _ in range(READERS)]
+    for thread in writers + readers:
+        thread.start()
+    for thread in writers:
+        thread.join()
+    writers_done.set()
+    for thread in readers:
+        thread.join()
+    if write_queue is not None:
+        write_queue.stop()
+
+    assert not [e for e in errors if "database is locked" in str(e)]
+    assert not errors
+    db = session_factory()
+    try:
+        assert db.query(func.count(ActionItem.id)).scalar() == WRITERS * WRITES_PER_WRITER * ITEMS_PER_WRITE
+        assert all(meeting.summary for meeting in db.query(Meeting).all())
+    finally:
+        db.close()
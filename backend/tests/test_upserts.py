@@ -0,0 +1,94 @@
+import threading
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import func
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base, create_db_engine
+from app.models.models import ActionItem, Decision, Meeting, SearchDocument
+from app.schemas.schemas import ActionItemCreate, ActionItemUpdate, DecisionCreate
+from app.services.action_item_service import ActionItemService
+from app.services.decision_service import DecisionService
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'upserts.db'}")
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    db = factory()
+    db.add(Meeting(title="Planning"))
+    db.commit()
+    db.close()
+    yield factory
+    engine.dispose()
+
+def action_item(title, assignee=""):
+    return ActionItemCreate(meeting_id=1, title=title, description="", assignee=assignee)
+
+def test_upsert_updates_matching_titles(session_factory):
+    db = session_factory()
+    first = ActionItemService.bulk_upsert_action_items(db, [action_item("Ship it"), action_item("Write docs")])
+    # A repeated key in one batch is one row with the last values, at the first position
+    second = ActionItemService.bulk_upsert_action_items(db, [
+        action_item("ship it!", "ana"),
+        action_item("New task"),
+        action_item("SHIP IT", "ben")
+    ])
+
+    assert [row.id for row in second][0] == first[0].id
+    assert [(row.title, row.assignee) for row in second] == [("SHIP IT", "ben"), ("New task", "")]
+    assert db.query(func.count(ActionItem.id)).scalar() == 3
+    assert db.query(SearchDocument).filter(SearchDocument.item_id == first[0].id).one().title == "SHIP IT"
+    db.close()
+
+def test_decision_upsert_updates_matching_titles(session_factory):
+    db = session_factory()
+    decision = lambda rationale: DecisionCreate(meeting_id=1, title="Use Postgres", description="", decision_maker="", rationale=rationale)
+    first = DecisionService.bulk_upsert_decisions(db, [decision("scale")])
+    second = DecisionService.bulk_upsert_decisions(db, [decision("cost")])
+
+    assert second[0].id == first[0].id
+    assert second[0].rationale == "cost"
+    assert db.query(func.count(Decision.id)).scalar() == 1
+    db.close()
+
+def test_duplicate_titles_are_rejected(session_factory):
+    db = session_factory()
+    ActionItemService.create_action_item(db, action_item("Ship it"))
+    other = ActionItemService.create_action_item(db, action_item("Write docs"))
+
+    with pytest.raises(HTTPException) as created:
+        ActionItemService.create_action_item(db, action_item("Ship it!"))
+    with pytest.raises(HTTPException) as renamed:
+        ActionItemService.update_action_item(db, other.id, ActionItemUpdate(title="ship it", description="", assignee=""))
+
+    assert created.value.status_code == renamed.value.status_code == 409
+    assert ActionItemService.get_action_item(db, other.id).title == "Write docs"
+    db.close()
+
+def test_concurrent_upserts_insert_each_title_once(session_factory):
+    titles = [f"Task {i}" for i in range(20)]
+    errors = []
+    start = threading.Barrier(6)
+
+    def upsert():
+        db = session_factory()
+        try:
+            start.wait()
+            ActionItemService.bulk_upsert_action_items(db, [action_item(title) for title in titles])
+        except Exception as e:
+            errors.append(e)
+        finally:
+            db.close()
+
+    threads = [threading.Thread(target=upsert) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    db = session_factory()
+    assert not errors
+    assert db.query(func.count(ActionItem.id)).scalar() == len(titles)
+    db.close()
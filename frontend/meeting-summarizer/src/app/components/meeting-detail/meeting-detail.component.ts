@@ -120,7 +120,16 @@ export class MeetingDetailComponent implements OnInit {
 
   loadMeeting(id: number): void {
     this.meetingService.getMeeting(id).subscribe(
-      meeting => this.meeting = meeting,
+      meeting => {
+        this.meeting = meeting;
+        // The transcript is served separately from the meeting itself
+        if (meeting.has_transcript) {
+          this.meetingService.getTranscript(id).subscribe(
+            result => meeting.transcript = result.transcript,
+            error => console.error('Error loading transcript:', error)
+          );
+        }
+      },
       error => console.error('Error loading meeting:', error)
     );
   }
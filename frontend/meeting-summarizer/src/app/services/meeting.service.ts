@@ -7,6 +7,7 @@ export interface Meeting {
   title: string;
   description: string;
   transcript?: string;
+  has_transcript?: boolean;
   summary?: string;
   action_items?: any[];
   decisions?: any[];